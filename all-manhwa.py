@@ -5,8 +5,18 @@ import requests
 from bs4 import BeautifulSoup
 from datetime import datetime, timedelta
 import re
+import functools
+import threading
 from supabase import create_client, Client
 from dotenv import load_dotenv
+from manifest_indexes import INDEX_META_PATH, build_indexes, changed_index_paths, stale_index_paths
+from json_stream import write_json_stream, spooled_json
+from manifest_pages import HEAD_PATH, MANIFEST_PAGE_SIZE, SLOTS_PATH, build_manifest_pages, changed_page_paths
+from retry_scheduler import RetryLater, RetryPolicy, call_with_retries
+from wp_api import WpApi, WpApiUnavailable
+from slug_registry import SlugRegistry, comic_aliases
+from http_pool import PooledHttpClient
+from work_executor import SharedWorkExecutor
 
 # Muat environment variables dari file .env
 load_dotenv()
@@ -16,9 +26,19 @@ load_dotenv()
 # ============================================
 BASE_URL = "https://komikindo.ch"
 LIST_URL = "https://komikindo.ch/daftar-manga/page/{}/?status=&type=Manhwa&format=&order=&title="
+LIST_TYPE = "Manhwa"
+ENABLE_WP_API = os.environ.get("ENABLE_WP_API", "true").lower() == "true"  # Listing via wp-json dulu, fallback ke HTML
 
 MAX_COMICS = None  # Limit untuk testing, ubah ke None untuk semua
 OUTPUT_FILE = "all-manhwa-metadata.json"
+UPLOAD_FULL_MANIFEST = os.environ.get("UPLOAD_FULL_MANIFEST", "true").lower() == "true"  # File tunggal (kompatibilitas client lama)
+DETAIL_WORKERS = int(os.environ.get("DETAIL_WORKERS", "6"))  # Fetch detail paralel; retry dijadwalkan ulang tanpa memblokir komik lain
+REQUEST_RATE_LIMIT = float(os.environ.get("REQUEST_RATE_LIMIT", "2"))  # Maks request/detik per host (0 = tanpa batas)
+MAX_FETCH_ATTEMPTS = 3  # Budget attempt per URL (backoff eksponensial + jitter)
+RETRY_MAX_DELAY = 30.0
+LISTING_PAGE_DELAY = 0.5  # Jeda antar halaman daftar-manga (detik)
+STATE_DIR = os.environ.get("STATE_DIR", ".scrape_state")
+SLUG_REGISTRY_FILE = os.path.join(STATE_DIR, "slug_registry.json")  # Dipakai bersama scrape_links_only.py
 
 # Supabase config
 SUPABASE_URL = os.environ.get("SUPABASE_URL")
@@ -76,40 +96,146 @@ def upload_json(path: str, data: dict | list):
         return False
 
     try:
-        # Ubah data ke string JSON
-        json_data = json.dumps(data, ensure_ascii=False, indent=2)
-        # Ubah string ke bytes
-        json_bytes = json_data.encode('utf-8')
-
-        # Upload dengan upsert
-        supabase.storage.from_(BUCKET_NAME).upload(
-            path,
-            json_bytes,
-            {"content-type": "application/json", "upsert": "true"}
-        )
+        # Tulis JSON secara streaming ke file sementara, upload dari file
+        with spooled_json(data) as json_file:
+            # Upload dengan upsert
+            supabase.storage.from_(BUCKET_NAME).upload(
+                path,
+                json_file,
+                {"content-type": "application/json", "upsert": "true"}
+            )
         print(f" Berhasil meng-upload {path}")
         return True
     except Exception as e:
         print(f" Gagal meng-upload {path}: {e}")
         return False
 
-def get_soup(url: str, max_retries: int = 3) -> BeautifulSoup | None:
-    """Helper untuk mengambil dan parse HTML dari URL."""
-    for attempt in range(max_retries):
+def download_json(path: str):
+    """Helper untuk download file JSON dari Supabase. Returns None jika tidak ada/gagal."""
+    if not supabase:
+        return None
+    try:
+        response = supabase.storage.from_(BUCKET_NAME).download(path)
+        return json.loads(response) if response else None
+    except Exception:
+        return None
+
+def get_sort_key(item):
+    """Ambil timestamp chapter terbaru untuk sorting."""
+    chapters = item.get('latestChapters', [])
+    if chapters and chapters[0].get('waktu_rilis'):
+        return chapters[0]['waktu_rilis']
+    return item.get('lastUpdateTime', '1970-01-01T00:00:00+07:00')
+
+def upload_manifest_pages(all_metadata: list):
+    """Upload manifest per halaman: hanya halaman yang hash-nya berubah + head.json."""
+    previous_head = download_json(HEAD_PATH)
+    # Slot halaman run sebelumnya: komik yang tidak berubah tetap di halamannya
+    previous_slots = download_json(SLOTS_PATH) if previous_head else None
+    pages, head, slots = build_manifest_pages(all_metadata, get_sort_key, MANIFEST_PAGE_SIZE, previous_slots)
+    changed = changed_page_paths(head, previous_head)
+
+    print(f" Manifest: {head['total_pages']} halaman, {len(changed)} berubah")
+    failed = [path for path in changed if not upload_json(path, pages[path])]
+    if failed:
+        # Jangan publish head yang menunjuk ke hash halaman yang gagal ter-upload
+        print(f" {len(failed)} halaman gagal di-upload, head.json tidak diperbarui")
+        return False
+    if not upload_json(SLOTS_PATH, slots):
+        return False
+    return upload_json(HEAD_PATH, head)
+
+def upload_indexes(all_metadata: list):
+    """Upload index: hanya file yang hash-nya berubah, lalu meta.json, lalu hapus file usang."""
+    indexes = build_indexes(all_metadata)
+    previous_meta = download_json(INDEX_META_PATH)
+    changed = changed_index_paths(indexes, previous_meta)
+    stale = stale_index_paths(indexes, previous_meta)
+    meta_changed = previous_meta != indexes[INDEX_META_PATH]
+
+    print(f"\n Index: {len(indexes)} file, {len(changed)} berubah, {len(stale)} usang")
+    failed = [path for path in changed if not upload_json(path, indexes[path])]
+    if failed:
+        # meta.json lama tetap menunjuk ke hash lama -> file gagal di-upload ulang run berikutnya
+        print(f" {len(failed)} file index gagal di-upload, meta.json tidak diperbarui")
+        return False
+    if meta_changed and not upload_json(INDEX_META_PATH, indexes[INDEX_META_PATH]):
+        return False
+    if stale:
+        # Dihapus setelah meta.json baru ter-upload, jadi meta tidak pernah menunjuk file yang hilang
         try:
-            response = requests.get(url, headers=HEADERS, timeout=30)
-            response.raise_for_status()
-            return BeautifulSoup(response.text, 'html.parser')
+            supabase.storage.from_(BUCKET_NAME).remove(stale)
+            print(f" {len(stale)} file index usang dihapus")
         except Exception as e:
-            if attempt < max_retries - 1:
-                time.sleep(1)
-                continue
-            print(f"      Gagal mengambil {url}: {e}")
-            return None
-    return None
+            print(f" Gagal menghapus file index usang: {e}")
+    return True
+
+_http_client = None
+_http_client_lock = threading.Lock()
+
+def get_http_client() -> PooledHttpClient:
+    """Client bersama semua worker detail: koneksi keep-alive + rate limit per host."""
+    global _http_client
+    if _http_client is None:
+        with _http_client_lock:
+            if _http_client is None:
+                # http2=False: requests.Session biasa, sama dengan requests.get sebelumnya
+                _http_client = PooledHttpClient(pool_size_per_host=DETAIL_WORKERS, http2=False,
+                                                rate_limit=REQUEST_RATE_LIMIT)
+    return _http_client
+
+def fetch_soup(url: str) -> BeautifulSoup:
+    """Satu attempt fetch + parse HTML. Gagal -> RetryLater (dijadwalkan ulang oleh executor)."""
+    try:
+        response = get_http_client().get(url, headers=HEADERS, timeout=30)
+    except Exception as e:
+        raise RetryLater(e, base_delay=1.0)
+    return BeautifulSoup(response.text, 'html.parser')
+
+def get_soup(url: str, max_retries: int = MAX_FETCH_ATTEMPTS) -> BeautifulSoup | None:
+    """Helper untuk mengambil dan parse HTML dari URL (blocking, untuk pagination berurutan)."""
+    try:
+        return call_with_retries(lambda: fetch_soup(url), RetryPolicy(max_retries, RETRY_MAX_DELAY))
+    except Exception as e:
+        print(f"      Gagal mengambil {url}: {e}")
+        return None
+
+def get_comics_list_wp_api(max_comics: int = None) -> list[dict] | None:
+    """Daftar komik dari wp-json (100 komik per request). None jika API tidak bisa dipakai."""
+    # Client bersama: koneksi keep-alive + rate limit per host (REQUEST_RATE_LIMIT) seperti fetch detail
+    api = WpApi(get_http_client(), BASE_URL, headers=HEADERS, timeout=30)
+    try:
+        comics = api.list_comics(comic_type=LIST_TYPE)
+    except WpApiUnavailable as e:
+        print(f" wp-json tidak tersedia ({e}), fallback ke halaman daftar-manga")
+        return None
+
+    all_comics = []
+    seen_slugs = set()
+    for comic in comics:
+        if max_comics and len(all_comics) >= max_comics:
+            break
+        title = comic['title']
+        if title.startswith('Komik '):
+            title = title[6:]
+        if comic['link'] and comic['slug'] and comic['slug'] not in seen_slugs:
+            seen_slugs.add(comic['slug'])
+            all_comics.append({
+                'title': title,
+                'link': comic['link'],
+                'slug': comic['slug']
+            })
+
+    print(f" Ditemukan {len(all_comics)} komik via wp-json ({api.requests} request)")
+    return all_comics
 
 def get_comics_list(max_comics: int = None) -> list[dict]:
-    """Scrape daftar komik dari halaman daftar-manga."""
+    """Scrape daftar komik dari halaman daftar-manga (wp-json dicoba dulu jika aktif)."""
+    if ENABLE_WP_API:
+        comics = get_comics_list_wp_api(max_comics)
+        if comics:
+            return comics
+
     all_comics = []
     page = 1
 
@@ -206,14 +332,38 @@ def get_comics_list(max_comics: int = None) -> list[dict]:
         print(f"     +{comics_added_this_page} komik (total: {len(all_comics)})")
 
         page += 1
-        time.sleep(0.5)  # Delay antara request
+        time.sleep(LISTING_PAGE_DELAY)  # Delay antara request
 
     print(f" Ditemukan {len(all_comics)} komik")
     return all_comics
 
-def scrape_comic_detail(url: str) -> dict | None:
-    """Scrape detail komik dari halaman individual."""
-    soup = get_soup(url)
+def dedupe_comics(comics_list: list[dict]) -> list[dict]:
+    """Buang entry yang menunjuk ke komik yang sama lewat key berbeda (ID URL sama,
+    slug lama/baru setelah ganti judul) berdasarkan slug registry. Urutan dipertahankan."""
+    registry = SlugRegistry(SLUG_REGISTRY_FILE)
+    seen = set()
+    unique = []
+    for comic in comics_list:
+        registry.canonical(comic['link'], title=comic['title'])
+        # Hanya alias URL (ID/slug) yang dipakai: judul sama belum tentu komik yang sama
+        key = registry.resolve(*comic_aliases(comic['link'])) or comic['link']
+        if key in seen:
+            print(f"     Duplikat: {comic['title']} ({comic['slug']}) -> {key}")
+            continue
+        seen.add(key)
+        unique.append(comic)
+    registry.save()
+    return unique
+
+def fetch_comic_detail(url: str) -> dict | None:
+    """Task SharedWorkExecutor: satu attempt fetch (RetryLater jika gagal) lalu parse detail."""
+    # Jeda antar request diatur rate limit per host di get_http_client()
+    return scrape_comic_detail(url, soup=fetch_soup(url))
+
+def scrape_comic_detail(url: str, soup: BeautifulSoup | None = None) -> dict | None:
+    """Scrape detail komik dari halaman individual (soup bisa diberikan jika sudah di-fetch)."""
+    if soup is None:
+        soup = get_soup(url)
     if not soup:
         return None
 
@@ -354,22 +504,39 @@ def main():
     print(f" Mode: Testing dengan {MAX_COMICS} komik\n")
 
     # 1. Ambil daftar komik
-    comics_list = get_comics_list(max_comics=MAX_COMICS)
+    comics_list = dedupe_comics(get_comics_list(max_comics=MAX_COMICS))
     if not comics_list:
         print(" Tidak ada komik yang ditemukan. Berhenti.")
         return
 
-    print(f"\n Memproses detail untuk {len(comics_list)} komik...\n")
+    print(f"\n Memproses detail untuk {len(comics_list)} komik "
+          f"({DETAIL_WORKERS} worker, maks {REQUEST_RATE_LIMIT or '-'} request/detik per host)...\n")
 
     all_metadata = []
 
-    # 2. Loop setiap komik untuk mengambil detailnya
+    # 2. Ambil detail setiap komik. Fetch yang gagal masuk delay queue (backoff + jitter)
+    #    sementara worker lanjut ke komik lain; hasil disusun lagi sesuai urutan daftar.
+    executor = SharedWorkExecutor(max_workers=DETAIL_WORKERS,
+                                  policy=RetryPolicy(MAX_FETCH_ATTEMPTS, RETRY_MAX_DELAY))
+    try:
+        details = executor.run('detail', [
+            (index, functools.partial(fetch_comic_detail, comic['link']))
+            for index, comic in enumerate(comics_list)
+        ])
+    finally:
+        executor.shutdown()
+    stats = executor.stats()
+    if stats['retries']:
+        print(f" {stats['retries']} fetch dijadwalkan ulang, {stats['exhausted']} habis budget")
+
     for index, comic in enumerate(comics_list):
         print(f"  -> ({index + 1}/{len(comics_list)}) {comic['title']}")
 
         try:
-            # Scrape detail page
-            detail = scrape_comic_detail(comic['link'])
+            ok, detail = details[index]
+            if not ok:
+                print(f"      Gagal mengambil {comic['link']}: {detail}")
+                detail = None
             if not detail:
                 print(f"      Skipping: gagal mengambil detail")
                 continue
@@ -417,9 +584,6 @@ def main():
             all_metadata.append(manhwa_data)
             print(f"      Berhasil: {manhwa_data['total_chapters']} chapters")
 
-            # Delay untuk tidak overload server
-            time.sleep(0.5)
-
         except Exception as e:
             print(f"      Error: {e}")
 
@@ -427,21 +591,13 @@ def main():
 
     # 3. Pre-sort berdasarkan waktu rilis chapter terbaru (descending)
     # Ini memastikan JSON yang disimpan sudah terurut "Update Terbaru" di atas
-    def get_sort_key(item):
-        """Ambil timestamp chapter terbaru untuk sorting."""
-        chapters = item.get('latestChapters', [])
-        if chapters and chapters[0].get('waktu_rilis'):
-            return chapters[0]['waktu_rilis']
-        return item.get('lastUpdateTime', '1970-01-01T00:00:00+07:00')
-
     all_metadata.sort(key=get_sort_key, reverse=True)
     print(f" Data telah di-sort berdasarkan chapter terbaru (newest first)")
 
     # 4. Simpan ke file JSON lokal
     if all_metadata:
         print(f"\n Menyimpan ke '{OUTPUT_FILE}'...")
-        with open(OUTPUT_FILE, 'w', encoding='utf-8') as f:
-            json.dump(all_metadata, f, ensure_ascii=False, indent=2)
+        write_json_stream(OUTPUT_FILE, all_metadata)
         print(f" Berhasil menyimpan {len(all_metadata)} item ke {OUTPUT_FILE}")
 
         # Print sample
@@ -452,7 +608,14 @@ def main():
         # 5. Upload ke Supabase
         if supabase:
             print(f"\n Meng-upload ke Supabase Storage...")
-            upload_json("all-manhwa-metadata.json", all_metadata)
+            if UPLOAD_FULL_MANIFEST:
+                upload_json("all-manhwa-metadata.json", all_metadata)
+
+            # Manifest per halaman (hanya halaman yang berubah)
+            upload_manifest_pages(all_metadata)
+
+            # 6. Upload index genre/type/status, search dan slice "update terbaru" (hanya yang berubah)
+            upload_indexes(all_metadata)
         else:
             print("\n Supabase tidak dikonfigurasi, skip upload.")
     else:
@@ -0,0 +1,112 @@
+"""
+WINDOWED BACKFILL SCHEDULER
+===========================
+Menjalankan banyak komik secara bergiliran per window chapter, supaya satu
+seri raksasa (mis. 800+ chapter) tidak memonopoli worker dan komik lain
+tetap jalan.
+
+Setiap komik direpresentasikan sebagai generator yang memproses satu window
+(scrape -> merge -> upload) lalu yield. Scheduler memajukan generator satu
+langkah per giliran di thread pool, dengan antrian FIFO sehingga komik aktif
+mendapat giliran bergantian (round-robin). Return value generator
+(StopIteration.value) adalah hasil akhir komik.
+"""
+
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+
+def chapter_windows(chapters, window_size=None):
+    """Pecah daftar chapter menjadi window berurutan. window_size None/0 = satu window."""
+    if not window_size or window_size >= len(chapters):
+        return [chapters]
+    return [chapters[i:i + window_size] for i in range(0, len(chapters), window_size)]
+
+
+def _advance(gen):
+    """Jalankan generator satu window. Returns (done, value, detik)."""
+    started = time.monotonic()
+    try:
+        value = next(gen)
+        return False, value, time.monotonic() - started
+    except StopIteration as stop:
+        return True, stop.value, time.monotonic() - started
+
+
+def run_interleaved(tasks, max_workers=1, max_active=2, admit_new=None, admit_next=None,
+                    on_step=None, on_done=None, on_deferred=None, on_error=None):
+    """Jalankan task secara bergiliran per window.
+
+    tasks      : iterable (key, factory) - factory() -> generator per komik
+    max_active : maks komik yang sedang berjalan (dimulai tapi belum selesai)
+    admit_new  : callable() -> bool, boleh memulai komik baru? (deadline)
+    admit_next : callable() -> bool, boleh menjalankan window berikutnya?
+    on_step    : callable(key, detik) setiap satu window selesai
+    on_done    : callable(key, result, busy_seconds) saat komik selesai
+    on_deferred: callable(key, started) untuk komik yang tidak dimulai/dihentikan
+    on_error   : callable(key, exception)
+    """
+    admit_new = admit_new or (lambda: True)
+    admit_next = admit_next or (lambda: True)
+    pending = deque(tasks)
+    ready = deque()  # (key, gen, busy_seconds) yang menunggu giliran window berikutnya
+    running = {}  # future -> (key, gen, busy_seconds)
+    active = 0
+    stopping = False
+
+    def defer(key, started):
+        if on_deferred:
+            on_deferred(key, started)
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        while pending or ready or running:
+            # Mulai komik baru selama slot aktif masih ada
+            while pending and active < max_active and not stopping:
+                if not admit_new():
+                    stopping = True
+                    break
+                key, factory = pending.popleft()
+                ready.append((key, factory(), 0.0))
+                active += 1
+
+            # Isi worker dengan window berikutnya (FIFO = round-robin antar komik)
+            while ready and len(running) < max_workers:
+                key, gen, busy = ready.popleft()
+                if stopping and busy and not admit_next():
+                    # Window sebelumnya sudah di-commit; sisanya ditunda ke run berikutnya
+                    gen.close()
+                    active -= 1
+                    defer(key, True)
+                    continue
+                running[executor.submit(_advance, gen)] = (key, gen, busy)
+
+            if stopping:
+                for key, _ in pending:
+                    defer(key, False)
+                pending.clear()
+
+            if not running:
+                continue
+
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                key, gen, busy = running.pop(future)
+                try:
+                    done, value, seconds = future.result()
+                except Exception as e:
+                    active -= 1
+                    if on_error:
+                        on_error(key, e)
+                    continue
+                busy += seconds
+                if on_step:
+                    on_step(key, seconds)
+                if done:
+                    active -= 1
+                    if on_done:
+                        on_done(key, value, busy)
+                else:
+                    if not admit_next():
+                        stopping = True
+                    ready.append((key, gen, busy))
@@ -0,0 +1,128 @@
+"""
+CHAPTER LIST DIFF ENGINE
+========================
+Membandingkan daftar chapter di website dengan chapters.json yang tersimpan
+berdasarkan key kanonik (nomor chapter / slug URL), bukan jumlah chapter.
+
+Hasil diff:
+- added     : chapter di website yang belum ada di storage
+- changed   : chapter yang sama (nomor sama) tapi URL-nya berubah (re-upload)
+- removed   : chapter di storage yang sudah tidak ada di website
+- unchanged : jumlah chapter yang identik
+
+Hanya added + changed yang perlu di-scrape. Daftar chapter yang menyusut
+(removed) tidak pernah memicu full re-scrape.
+"""
+
+import re
+
+# "Chapter 12", "chapter-12-5", "Ch. 12.5", "magic-emperor-chapter-819"
+_CHAPTER_NUM_RE = re.compile(r'\b(?:chapter|ch)[\s.\-_]*(\d+(?:[.\-]\d+)?)', re.IGNORECASE)
+
+
+def _normalize_number(raw):
+    """'012' -> '12', '12-5' -> '12.5', '12.50' -> '12.5'"""
+    raw = raw.replace('-', '.')
+    whole, _, frac = raw.partition('.')
+    whole = str(int(whole))
+    frac = frac.rstrip('0')
+    return f"{whole}.{frac}" if frac else whole
+
+
+def _url_slug(url):
+    return url.rstrip('/').split('/')[-1] if url else ''
+
+
+def _normalize_url(url):
+    return (url or '').strip().rstrip('/').lower()
+
+
+def canonical_chapter_key(title='', url='', slug=''):
+    """Key kanonik untuk satu chapter.
+
+    Prioritas: nomor chapter dari judul -> dari slug URL -> dari slug storage,
+    lalu slug URL apa adanya, lalu judul.
+    """
+    for text in (title, _url_slug(url), slug):
+        if not text:
+            continue
+        match = _CHAPTER_NUM_RE.search(text)
+        if match:
+            return f"ch:{_normalize_number(match.group(1))}"
+
+    url_slug = _url_slug(url)
+    if url_slug:
+        return f"url:{url_slug.lower()}"
+    return f"title:{' '.join((title or slug or '').lower().split())}"
+
+
+def website_chapter_key(chapter):
+    """Key untuk chapter hasil scrape_comic_details ({'chapter', 'link', ...})."""
+    return canonical_chapter_key(chapter.get('chapter', ''), chapter.get('link', ''))
+
+
+def stored_chapter_key(chapter):
+    """Key untuk chapter di chapters.json ({'slug', 'title', 'url', ...})."""
+    return canonical_chapter_key(chapter.get('title', ''), chapter.get('url', ''), chapter.get('slug', ''))
+
+
+def diff_chapter_lists(website_chapters, stored_chapters):
+    """Bandingkan chapter website dengan chapter tersimpan.
+
+    Returns dict: {'added': [...], 'changed': [...], 'removed': [...], 'unchanged': int}
+    'added' dan 'changed' berisi dict chapter website (siap di-scrape),
+    'removed' berisi dict chapter dari storage.
+    """
+    stored_by_key = {}
+    for ch in stored_chapters or []:
+        stored_by_key[stored_chapter_key(ch)] = ch
+
+    added = []
+    changed = []
+    unchanged = 0
+    seen_keys = set()
+
+    for ch in website_chapters or []:
+        key = website_chapter_key(ch)
+        if key in seen_keys:
+            continue
+        seen_keys.add(key)
+
+        stored = stored_by_key.get(key)
+        if stored is None:
+            added.append(ch)
+        elif (_normalize_url(stored.get('url')) != _normalize_url(ch.get('link'))
+              or not stored.get('total_images')):
+            # Re-upload (URL berubah) atau chapter tersimpan tanpa gambar
+            changed.append(ch)
+        else:
+            unchanged += 1
+
+    removed = [ch for key, ch in stored_by_key.items() if key not in seen_keys]
+
+    return {
+        'added': added,
+        'changed': changed,
+        'removed': removed,
+        'unchanged': unchanged,
+    }
+
+
+def chapters_to_fetch(diff):
+    """Chapter yang perlu di-scrape dari hasil diff (added + changed)."""
+    return diff['added'] + diff['changed']
+
+
+def merge_chapter_lists(stored_chapters, new_chapters):
+    """Gabungkan chapter baru ke chapter tersimpan berdasarkan key kanonik.
+
+    Chapter lama dengan key yang sama diganti di posisinya (renumber/re-upload
+    tidak menghasilkan duplikat), chapter baru lainnya ditambahkan di akhir.
+    Chapter yang sudah hilang dari website tetap dipertahankan.
+    """
+    merged = {}
+    for ch in stored_chapters or []:
+        merged[stored_chapter_key(ch)] = ch
+    for ch in new_chapters or []:
+        merged[stored_chapter_key(ch)] = ch
+    return list(merged.values())
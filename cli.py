@@ -0,0 +1,218 @@
+"""
+UNIFIED CLI
+===========
+Satu entry point untuk semua job, dengan profil performa bernama supaya
+throughput bisa di-tuning per environment tanpa edit konstanta di kode.
+
+PERINTAH:
+    python cli.py list                      # Collect/detail_komik.py (daftar komik)
+    python cli.py discover                  # Update daftar komik dari XML sitemap (lastmod)
+    python cli.py scan                      # Auto update: cek chapter baru lalu scrape
+    python cli.py scrape                    # Scrape semua komik (mode normal)
+    python cli.py repair                    # Ulangi hanya komik/chapter di dead-letter
+    python cli.py manifest                  # all-manhwa.py (manifest + indexes)
+    python cli.py comics-list               # generate_comics_list.py
+
+CONTOH:
+    python cli.py --profile ci-fast scan --shard 1/4 --max-comics 1700
+    python cli.py --profile polite scrape --max-comics 50
+    python cli.py --profile backfill --deadline 3h scrape
+
+PROFIL (lihat PROFILES):
+    default   Nilai konstanta di masing-masing script
+    ci-fast   Concurrency tinggi, delay pendek, fingerprint skip, budget < timeout job CI
+    backfill  Scrape penuh per window 50 chapter (komik bergiliran), tanpa fingerprint skip/time budget
+    polite    Concurrency rendah, delay panjang dan rate limit per host
+"""
+
+import argparse
+import importlib
+import os
+import sys
+
+from run_budget import parse_duration
+
+# Nilai per profil = nama konstanta modul -> nilai. Konstanta yang tidak
+# disebut tetap memakai default di script masing-masing.
+PROFILES = {
+    'default': {},
+    'ci-fast': {
+        'MAX_CHAPTER_WORKERS': 8,
+        'MAX_COMIC_WORKERS': 3,
+        'DETAIL_WORKERS': 8,
+        'HTTP_POOL_SIZE_PER_HOST': 8,
+        'DELAY_BETWEEN_CHAPTERS': 0.2,
+        'DELAY_BETWEEN_COMICS': 0.5,
+        'REQUEST_RATE_LIMIT': 0,
+        'ENABLE_FINGERPRINT_SKIP': True,
+        'FINGERPRINT_MAX_AGE_DAYS': 7,
+        'ENABLE_SITEMAP_DISCOVERY': True,
+        'TIME_BUDGET_SECONDS': 5 * 3600,  # Job GitHub Actions timeout 6 jam
+    },
+    'backfill': {
+        'MAX_CHAPTER_WORKERS': 5,
+        'MAX_COMIC_WORKERS': 2,
+        'ENABLE_FINGERPRINT_SKIP': False,
+        'TIME_BUDGET_SECONDS': None,
+        'BACKFILL_MODE': True,
+        'BACKFILL_WINDOW_SIZE': 50,
+        'BACKFILL_ACTIVE_COMICS': 4,
+    },
+    'polite': {
+        'MAX_CHAPTER_WORKERS': 2,
+        'MAX_COMIC_WORKERS': 1,
+        'DETAIL_WORKERS': 2,
+        'HTTP_POOL_SIZE_PER_HOST': 2,
+        'DELAY_BETWEEN_CHAPTERS': 1.5,
+        'DELAY_BETWEEN_COMICS': 3,
+        'REQUEST_RATE_LIMIT': 2,
+        'ENABLE_FINGERPRINT_SKIP': True,
+    },
+}
+
+
+def apply_settings(module, settings):
+    """Set konstanta modul yang memang ada (profil bisa berisi key untuk script lain)."""
+    for name, value in settings.items():
+        if hasattr(module, name):
+            setattr(module, name, value)
+
+
+def build_settings(args):
+    """Gabungkan profil + override dari argumen command line."""
+    settings = dict(PROFILES[args.profile])
+    if args.chapter_workers is not None:
+        settings['MAX_CHAPTER_WORKERS'] = args.chapter_workers
+        settings['HTTP_POOL_SIZE_PER_HOST'] = max(args.chapter_workers, settings.get('HTTP_POOL_SIZE_PER_HOST', 0))
+    if args.comic_workers is not None:
+        settings['MAX_COMIC_WORKERS'] = args.comic_workers
+    if args.command == 'repair':
+        # Mode repair memakai concurrency sendiri (REPAIR_*), bukan nilai profil;
+        # override eksplisit dari CLI tetap berlaku
+        if args.chapter_workers is not None:
+            settings['REPAIR_CHAPTER_WORKERS'] = args.chapter_workers
+        if args.comic_workers is not None:
+            settings['REPAIR_COMIC_WORKERS'] = args.comic_workers
+    if args.rate_limit is not None:
+        settings['REQUEST_RATE_LIMIT'] = args.rate_limit
+    if args.time_budget is not None:
+        settings['TIME_BUDGET_SECONDS'] = args.time_budget or None
+    if args.window_size:
+        settings['BACKFILL_MODE'] = True
+        settings['BACKFILL_WINDOW_SIZE'] = args.window_size
+    if getattr(args, 'sitemap', None) is not None:
+        settings['ENABLE_SITEMAP_DISCOVERY'] = args.sitemap
+    if args.no_fingerprint_skip:
+        settings['ENABLE_FINGERPRINT_SKIP'] = False
+    if getattr(args, 'max_comics', None):
+        settings['MAX_COMICS_TO_PROCESS'] = args.max_comics
+        settings['AUTO_UPDATE_MAX_COMICS'] = args.max_comics
+        settings['MAX_COMICS'] = args.max_comics
+    return settings
+
+
+def run_list(args, settings):
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'Collect'))
+    import detail_komik
+    detail_komik.scrape_komikcast()
+
+
+def run_discover(args, settings):
+    import scrape_links_only as scraper
+    import sitemap_discovery
+    apply_settings(scraper, settings)
+    sys.argv = [sys.argv[0]]
+    sitemap_discovery.main()
+
+
+def run_scraper(args, settings, auto_update, repair=False):
+    import scrape_links_only as scraper
+    apply_settings(scraper, settings)
+    scraper.AUTO_UPDATE_MODE = auto_update
+    argv = ['--shard', args.shard] if args.shard else []
+    if repair:
+        argv.append('--repair')
+    scraper.main(scraper.parse_args(argv))
+
+
+def run_manifest(args, settings):
+    manifest = importlib.import_module('all-manhwa')
+    apply_settings(manifest, settings)
+    manifest.main()
+
+
+def run_comics_list(args, settings):
+    # Import di sini: modul raise saat import jika SUPABASE_URL/KEY belum di-set
+    import generate_comics_list
+    apply_settings(generate_comics_list, settings)
+    generate_comics_list.main()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Komik scraper - unified CLI")
+    parser.add_argument('--profile', choices=sorted(PROFILES), default='default',
+                        help="Profil performa (concurrency, rate limit, cache policy, time budget)")
+    parser.add_argument('--chapter-workers', type=int, default=None, help="Override MAX_CHAPTER_WORKERS")
+    parser.add_argument('--comic-workers', type=int, default=None, help="Override MAX_COMIC_WORKERS")
+    parser.add_argument('--rate-limit', type=float, default=None, metavar='RPS',
+                        help="Maks request/detik per host (0 = tanpa batas)")
+    parser.add_argument('--deadline', '--time-budget', dest='time_budget', type=parse_duration, default=None,
+                        metavar='DURASI',
+                        help="Budget waktu run: komik baru tidak dimulai jika perkiraan selesainya "
+                             "melewati budget (contoh: 5h, 0 = tanpa batas)")
+    parser.add_argument('--window-size', type=int, default=None, metavar='N',
+                        help="Backfill: proses & upload chapter per window N, komik dijalankan bergiliran")
+    parser.add_argument('--no-fingerprint-skip', action='store_true',
+                        help="Selalu cek halaman detail penuh (abaikan fingerprint)")
+
+    commands = parser.add_subparsers(dest='command', required=True)
+    commands.add_parser('list', help="Ambil daftar komik dari website")
+    commands.add_parser('discover', help="Update daftar komik dari XML sitemap")
+    for name, help_text in (('scan', "Cek chapter baru lalu scrape komik yang berubah"),
+                            ('scrape', "Scrape semua komik dari file listing")):
+        sub = commands.add_parser(name, help=help_text)
+        sub.add_argument('--shard', type=str, default=None, metavar='I/N',
+                         help="Proses hanya shard ke-I dari N, contoh: --shard 1/4")
+        sub.add_argument('--max-comics', type=int, default=None,
+                         help="Maks komik yang dicek/diproses (total, dibagi rata antar shard)")
+        sub.add_argument('--sitemap', action=argparse.BooleanOptionalAction, default=None,
+                         help="Discovery + deteksi perubahan dari lastmod XML sitemap (mode scan)")
+    repair = commands.add_parser('repair', help="Ulangi komik/chapter yang gagal (dead-letter)")
+    repair.add_argument('--shard', type=str, default=None, metavar='I/N',
+                        help="Repair dead-letter milik shard ke-I dari N")
+    manifest = commands.add_parser('manifest', help="Generate manifest metadata + indexes")
+    manifest.add_argument('--max-comics', type=int, default=None, help="Limit komik (untuk testing)")
+    commands.add_parser('comics-list', help="Generate comics-list.json dari bucket")
+
+    args = parser.parse_args(argv)
+    if getattr(args, 'shard', None) and args.max_comics:
+        # Limit dari workflow berlaku untuk seluruh run, bukan per shard
+        from shards import parse_shard
+        _, count = parse_shard(args.shard)
+        args.max_comics = -(-args.max_comics // count)
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    settings = build_settings(args)
+    print(f"⚙️  Profil: {args.profile} | Perintah: {args.command}")
+
+    if args.command == 'list':
+        run_list(args, settings)
+    elif args.command == 'discover':
+        run_discover(args, settings)
+    elif args.command == 'scan':
+        run_scraper(args, settings, auto_update=True)
+    elif args.command == 'scrape':
+        run_scraper(args, settings, auto_update=False)
+    elif args.command == 'repair':
+        run_scraper(args, settings, auto_update=False, repair=True)
+    elif args.command == 'manifest':
+        run_manifest(args, settings)
+    elif args.command == 'comics-list':
+        run_comics_list(args, settings)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+COMICS REGISTRY
+===============
+Registry slug komik yang ada di bucket, dipelihara secara incremental supaya
+generate_comics_list.py tidak perlu listing seluruh root bucket setiap run.
+
+- comics-registry.json                 : registry utama {'slugs': [...], 'last_reconcile': iso}
+- comics-registry-delta-{tag}.json     : slug baru yang dibuat oleh satu run/shard scraper
+
+Scraper hanya menulis file delta (aman untuk shard paralel, tidak ada
+read-modify-write ke file yang sama). Generator melipat semua delta ke
+registry utama lalu menghapus file delta tersebut.
+"""
+
+import json
+from datetime import datetime
+
+REGISTRY_PATH = 'comics-registry.json'
+DELTA_PREFIX = 'comics-registry-delta-'
+
+
+def _upload(supabase, bucket_name, path, data):
+    json_bytes = json.dumps(data, ensure_ascii=False).encode('utf-8')
+    supabase.storage.from_(bucket_name).upload(
+        path,
+        json_bytes,
+        {"content-type": "application/json", "upsert": "true"}
+    )
+
+
+def record_new_slugs(supabase, bucket_name, slugs, tag=None):
+    """Tulis file delta berisi slug komik yang baru dibuat di run ini."""
+    slugs = sorted(set(slugs))
+    if not slugs:
+        return None
+    tag = tag or datetime.now().strftime('%Y%m%dT%H%M%S')
+    path = f"{DELTA_PREFIX}{tag}.json"
+    _upload(supabase, bucket_name, path, slugs)
+    return path
+
+
+def load_registry(supabase, bucket_name):
+    """Download registry utama. Returns dict {'slugs': [...], 'last_reconcile': iso|None}."""
+    try:
+        response = supabase.storage.from_(bucket_name).download(REGISTRY_PATH)
+        data = json.loads(response) if response else {}
+    except Exception:
+        data = {}
+    if not isinstance(data, dict):
+        data = {}
+    data.setdefault('slugs', [])
+    data.setdefault('last_reconcile', None)
+    return data
+
+
+def save_registry(supabase, bucket_name, registry):
+    registry = dict(registry, slugs=sorted(set(registry.get('slugs', []))))
+    _upload(supabase, bucket_name, REGISTRY_PATH, registry)
+    return registry
+
+
+def list_deltas(supabase, bucket_name):
+    """Daftar path file delta di root bucket."""
+    items = supabase.storage.from_(bucket_name).list(
+        path="",
+        options={"limit": 1000, "offset": 0, "search": DELTA_PREFIX}
+    ) or []
+    return sorted(
+        item['name'] for item in items
+        if item.get('name', '').startswith(DELTA_PREFIX)
+    )
+
+
+def collect_deltas(supabase, bucket_name):
+    """Baca semua file delta. Returns: (set slug, list path delta yang terbaca)."""
+    slugs = set()
+    paths = []
+    for path in list_deltas(supabase, bucket_name):
+        try:
+            data = json.loads(supabase.storage.from_(bucket_name).download(path))
+            slugs.update(s for s in data if isinstance(s, str) and s)
+            paths.append(path)
+        except Exception as e:
+            print(f"⚠️  Gagal membaca delta {path}: {e}")
+    return slugs, paths
+
+
+def remove_deltas(supabase, bucket_name, paths):
+    if paths:
+        supabase.storage.from_(bucket_name).remove(paths)
+
+
+def needs_reconcile(registry, interval_days):
+    """Full listing diperlukan jika registry kosong atau reconcile terakhir sudah lewat interval."""
+    last = registry.get('last_reconcile')
+    if not registry.get('slugs') or not last:
+        return True
+    try:
+        age = datetime.now() - datetime.fromisoformat(last)
+    except ValueError:
+        return True
+    return age.days >= interval_days
@@ -0,0 +1,182 @@
+"""
+COMPACT CHAPTER RECORDS
+=======================
+Representasi ringkas untuk record chapter yang ditahan di memori selama run
+(output_data). Prefix CDN gambar (mis. https://cdn.../uploads/2024/01/) di-intern
+sekali di PrefixTable, lalu setiap gambar disimpan sebagai prefix-id (array int)
++ suffix (nama file).
+
+ChapterRecord.to_dict() menghasilkan dict yang identik dengan format JSON lama:
+{'slug', 'title', 'url', 'waktu_rilis', 'total_images', 'images'}
+
+Benchmark memori (dict vs compact):
+    python compact_records.py manga_local_image_links.json
+    python compact_records.py --synthetic 1700 80 40
+"""
+
+import json
+import sys
+import threading
+import tracemalloc
+from array import array
+from dataclasses import dataclass
+
+
+class PrefixTable:
+    """Tabel intern prefix URL -> id (thread-safe)."""
+
+    def __init__(self):
+        self._prefixes = []
+        self._index = {}
+        self._lock = threading.Lock()
+
+    def intern(self, prefix):
+        prefix_id = self._index.get(prefix)
+        if prefix_id is None:
+            with self._lock:
+                prefix_id = self._index.get(prefix)
+                if prefix_id is None:
+                    prefix_id = len(self._prefixes)
+                    self._prefixes.append(prefix)
+                    self._index[prefix] = prefix_id
+        return prefix_id
+
+    def get(self, prefix_id):
+        return self._prefixes[prefix_id]
+
+    def __len__(self):
+        return len(self._prefixes)
+
+
+# Tabel prefix default untuk satu run
+DEFAULT_PREFIXES = PrefixTable()
+
+
+@dataclass(slots=True)
+class ChapterRecord:
+    slug: str
+    title: str
+    url: str
+    waktu_rilis: str
+    prefix_ids: array
+    suffixes: tuple
+    prefixes: PrefixTable
+
+    @classmethod
+    def from_dict(cls, chapter, prefixes=DEFAULT_PREFIXES):
+        prefix_ids = array('I')
+        suffixes = []
+        for image_url in chapter.get('images', []):
+            prefix, sep, suffix = image_url.rpartition('/')
+            prefix_ids.append(prefixes.intern(prefix + sep))
+            suffixes.append(suffix)
+        return cls(
+            slug=chapter.get('slug'),
+            title=chapter.get('title'),
+            url=chapter.get('url'),
+            waktu_rilis=chapter.get('waktu_rilis'),
+            prefix_ids=prefix_ids,
+            suffixes=tuple(suffixes),
+            prefixes=prefixes,
+        )
+
+    @property
+    def total_images(self):
+        return len(self.suffixes)
+
+    @property
+    def images(self):
+        get = self.prefixes.get
+        return [get(pid) + suffix for pid, suffix in zip(self.prefix_ids, self.suffixes)]
+
+    def to_dict(self):
+        return {
+            'slug': self.slug,
+            'title': self.title,
+            'url': self.url,
+            'waktu_rilis': self.waktu_rilis,
+            'total_images': self.total_images,
+            'images': self.images,
+        }
+
+
+def compact_comic(comic, prefixes=DEFAULT_PREFIXES):
+    """Salinan dict komik dengan chapters diganti ChapterRecord."""
+    compacted = dict(comic)
+    compacted['chapters'] = [
+        ch if isinstance(ch, ChapterRecord) else ChapterRecord.from_dict(ch, prefixes)
+        for ch in comic.get('chapters', [])
+    ]
+    return compacted
+
+
+def json_default(obj):
+    """Hook `default` untuk json.dumps / json_stream: ChapterRecord -> dict lama."""
+    if isinstance(obj, ChapterRecord):
+        return obj.to_dict()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _measure(build):
+    tracemalloc.start()
+    data = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return data, current
+
+
+def _synthetic_catalog(comics, chapters, images):
+    catalog = []
+    for c in range(comics):
+        slug = f"komik-{c}"
+        catalog.append({
+            'slug': slug,
+            'title': f"Komik {c}",
+            'chapters': [
+                {
+                    'slug': f"chapter-{n}",
+                    'title': f"Chapter {n}",
+                    'url': f"https://komikindo.ch/{slug}-chapter-{n}/",
+                    'waktu_rilis': '2026-01-01T00:00:00',
+                    'total_images': images,
+                    # ''.join -> string baru per URL, seperti hasil json.load
+                    'images': [''.join(['https://cdn.komikindo.ch/wp-content/uploads/2026/01/',
+                                        f"{slug}-{n}-{i:03d}.jpg"]) for i in range(images)],
+                }
+                for n in range(chapters)
+            ],
+        })
+    return catalog
+
+
+def main():
+    """Benchmark memori: dict chapter vs ChapterRecord pada katalog penuh."""
+    if len(sys.argv) > 1 and sys.argv[1] == '--synthetic':
+        counts = [int(x) for x in sys.argv[2:5]] + [1700, 80, 40][len(sys.argv[2:5]):]
+        label = f"synthetic {counts[0]} komik x {counts[1]} chapter x {counts[2]} gambar"
+        load = lambda: _synthetic_catalog(*counts)
+    else:
+        source = sys.argv[1] if len(sys.argv) > 1 else 'manga_local_image_links.json'
+        label = source
+
+        def load():
+            with open(source, 'r', encoding='utf-8') as f:
+                return json.load(f)
+
+    dict_data, dict_bytes = _measure(load)
+    total_images = sum(len(ch['images']) for comic in dict_data for ch in comic['chapters'])
+    del dict_data
+
+    prefixes = PrefixTable()
+    compact_data, compact_bytes = _measure(lambda: [compact_comic(c, prefixes) for c in load()])
+
+    print(f"📊 Benchmark memori: {label}")
+    print(f"   - Total gambar     : {total_images}")
+    print(f"   - dict             : {dict_bytes / 1024 / 1024:.1f} MB")
+    print(f"   - ChapterRecord    : {compact_bytes / 1024 / 1024:.1f} MB ({len(prefixes)} prefix unik)")
+    if dict_bytes:
+        print(f"   - Hemat            : {100 * (1 - compact_bytes / dict_bytes):.1f}%")
+
+
+if __name__ == "__main__":
+    main()
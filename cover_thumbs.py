@@ -0,0 +1,233 @@
+"""
+COVER THUMBNAIL PIPELINE
+========================
+Download cover komik sekali, buat thumbnail WebP beberapa ukuran di
+ProcessPoolExecutor (Pillow, CPU-bound), lalu upload ke bucket sebagai
+{slug}/cover-{lebar}.webp supaya front end tidak hotlink gambar full-size.
+
+- Cover yang sudah diproses dicek ulang dengan conditional GET (If-None-Match /
+  If-Modified-Since dari ETag / Last-Modified sebelumnya): 304 = tidak berubah,
+  tanpa download body
+- Server tanpa validator: cover dengan URL sama di-download dan di-hash ulang
+  paling cepat setiap COVER_RECHECK_DAYS hari (cover yang diganti di URL yang
+  sama tetap terdeteksi)
+- Cover yang hash sumbernya (sha256) tidak berubah tidak diproses/upload ulang
+- State hash + validator disimpan di STATE_DIR/cover_hashes.json
+
+Bisa juga dijalankan langsung untuk semua komik di file listing:
+    python cover_thumbs.py
+"""
+
+import hashlib
+import io
+import json
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta
+
+try:
+    from PIL import Image
+    PIL_AVAILABLE = True
+except ImportError:
+    PIL_AVAILABLE = False
+
+from state_store import JsonStateStore
+
+COVER_THUMB_WIDTHS = (120, 240, 480)  # Lebar thumbnail (px), tinggi mengikuti rasio
+COVER_THUMB_QUALITY = 80
+COVER_RECHECK_DAYS = 7  # Cover tanpa ETag/Last-Modified di-hash ulang paling cepat setiap N hari
+_TIME_FORMAT = '%Y-%m-%dT%H:%M:%S'
+
+COVER_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Accept': 'image/avif,image/webp,image/apng,image/*,*/*;q=0.8',
+    'Referer': 'https://komikindo.ch/',
+}
+
+
+def make_thumbnails(image_bytes, widths=COVER_THUMB_WIDTHS, quality=COVER_THUMB_QUALITY):
+    """Buat thumbnail WebP dari bytes gambar (dijalankan di process pool).
+    Returns: dict {lebar: webp_bytes}"""
+    with Image.open(io.BytesIO(image_bytes)) as img:
+        img.load()
+        mode = 'RGBA' if img.mode in ('RGBA', 'LA', 'P') else 'RGB'
+        source = img.convert(mode)
+
+    thumbs = {}
+    for width in widths:
+        # Jangan upscale: pakai ukuran asli jika sudah lebih kecil
+        target_width = min(width, source.width)
+        target_height = max(1, round(source.height * target_width / source.width))
+        resized = source.resize((target_width, target_height), Image.LANCZOS)
+        buffer = io.BytesIO()
+        resized.save(buffer, format='WEBP', quality=quality, method=6)
+        thumbs[width] = buffer.getvalue()
+    return thumbs
+
+
+class CoverHashStore(JsonStateStore):
+    """State {slug: {'url', 'sha256', 'etag', 'last_modified', 'checked_at'}} untuk skip
+    cover yang tidak berubah."""
+
+    def put(self, slug, url, sha256, etag=None, last_modified=None):
+        super().put(slug, {'url': url, 'sha256': sha256, 'etag': etag, 'last_modified': last_modified,
+                           'checked_at': datetime.now().strftime(_TIME_FORMAT)})
+
+    def touch(self, slug):
+        """Cover dicek dan tidak berubah (304): perbarui checked_at saja."""
+        known = self.get(slug)
+        if known:
+            super().put(slug, dict(known, checked_at=datetime.now().strftime(_TIME_FORMAT)))
+
+
+def conditional_headers(known):
+    """Header conditional GET dari validator cover sebelumnya ({} jika tidak ada)."""
+    headers = {}
+    if known.get('etag'):
+        headers['If-None-Match'] = known['etag']
+    if known.get('last_modified'):
+        headers['If-Modified-Since'] = known['last_modified']
+    return headers
+
+
+def recently_checked(known, recheck_days, now=None):
+    """Cover tanpa validator yang sudah di-hash dalam recheck_days terakhir."""
+    try:
+        checked_at = datetime.strptime(known.get('checked_at') or '', _TIME_FORMAT)
+    except ValueError:
+        return False
+    return (now or datetime.now()) - checked_at < timedelta(days=recheck_days)
+
+
+def upload_thumbnail(supabase, bucket_name, path, webp_bytes):
+    """Upload satu thumbnail WebP ke Supabase (upsert)."""
+    supabase.storage.from_(bucket_name).upload(
+        path,
+        webp_bytes,
+        {"content-type": "image/webp", "upsert": "true"}
+    )
+
+
+def process_covers(covers, supabase, bucket_name, client, hash_store,
+                   max_processes=None, max_download_workers=4, timeout=15, recheck_days=COVER_RECHECK_DAYS):
+    """Proses daftar cover [(slug, cover_url), ...].
+
+    Conditional GET / download (thread) -> cek hash -> resize (process pool) -> upload (thread).
+    Returns: dict statistik {'processed', 'unchanged', 'failed'}
+    """
+    stats = {'processed': 0, 'unchanged': 0, 'failed': 0}
+    if not PIL_AVAILABLE:
+        print("⚠️  Pillow tidak tersedia, skip cover thumbnails")
+        return stats
+
+    pending = []  # (slug, url, header conditional)
+    for slug, url in covers:
+        if not slug or not url:
+            continue
+        known = hash_store.get(slug) or {}
+        validators = conditional_headers(known) if known.get('url') == url else {}
+        if known.get('url') == url and not validators and recently_checked(known, recheck_days):
+            # Server tidak memberi validator: hash ulang hanya setiap recheck_days
+            stats['unchanged'] += 1
+            continue
+        pending.append((slug, url, validators))
+
+    if not pending:
+        return stats
+
+    def download(slug, url, validators):
+        response = client.get(url, headers={**COVER_HEADERS, **validators}, timeout=timeout)
+        if response.status_code == 304:
+            return None, None
+        return response.content, response.headers
+
+    downloaded = []  # (slug, url, sha256, etag, last_modified, bytes)
+    with ThreadPoolExecutor(max_workers=max_download_workers) as executor:
+        future_to_cover = {
+            executor.submit(download, slug, url, validators): (slug, url) for slug, url, validators in pending
+        }
+        for future in as_completed(future_to_cover):
+            slug, url = future_to_cover[future]
+            try:
+                image_bytes, headers = future.result()
+            except Exception as e:
+                print(f"    ✗ Gagal download cover {slug}: {e}")
+                stats['failed'] += 1
+                continue
+
+            if image_bytes is None:
+                # 304 Not Modified
+                hash_store.touch(slug)
+                stats['unchanged'] += 1
+                continue
+
+            sha256 = hashlib.sha256(image_bytes).hexdigest()
+            etag, last_modified = headers.get('ETag'), headers.get('Last-Modified')
+            known = hash_store.get(slug)
+            if known and known.get('sha256') == sha256:
+                # URL/validator berubah atau re-hash berkala, tapi isi gambar sama
+                hash_store.put(slug, url, sha256, etag, last_modified)
+                stats['unchanged'] += 1
+                continue
+            downloaded.append((slug, url, sha256, etag, last_modified, image_bytes))
+
+    if not downloaded:
+        return stats
+
+    # spawn, bukan fork: proses scraper sudah punya banyak thread (pool HTTP, executor
+    # kerja) dan fork dari proses multi-thread bisa mewarisi lock yang sedang terkunci
+    with ProcessPoolExecutor(max_workers=max_processes,
+                             mp_context=multiprocessing.get_context('spawn')) as pool, \
+            ThreadPoolExecutor(max_workers=max_download_workers) as uploader:
+        future_to_cover = {
+            pool.submit(make_thumbnails, image_bytes): (slug, url, sha256, etag, last_modified)
+            for slug, url, sha256, etag, last_modified, image_bytes in downloaded
+        }
+        del downloaded  # bytes sumber sudah dikirim ke process pool
+
+        for future in as_completed(future_to_cover):
+            slug, url, sha256, etag, last_modified = future_to_cover[future]
+            try:
+                thumbs = future.result()
+                uploads = [
+                    uploader.submit(upload_thumbnail, supabase, bucket_name,
+                                    f"{slug}/cover-{width}.webp", webp_bytes)
+                    for width, webp_bytes in thumbs.items()
+                ]
+                for upload in uploads:
+                    upload.result()
+                hash_store.put(slug, url, sha256, etag, last_modified)
+                stats['processed'] += 1
+            except Exception as e:
+                print(f"    ✗ Gagal proses cover {slug}: {e}")
+                stats['failed'] += 1
+
+    return stats
+
+
+def main():
+    """Proses cover semua komik dari file listing (field 'Image')."""
+    import scrape_links_only as scraper
+
+    supabase = scraper.init_supabase()
+    if not supabase:
+        return
+
+    with open(scraper.JSON_FILE, 'r', encoding='utf-8') as f:
+        comics_data = json.load(f)
+
+    covers = [
+        (scraper.comic_folder(comic), comic.get('Image', ''))
+        for comic in comics_data
+    ]
+    hash_store = CoverHashStore(scraper.COVER_HASH_FILE)
+    print(f"🖼️  Memproses {len(covers)} cover...")
+    stats = process_covers(covers, supabase, scraper.BUCKET_NAME, scraper.get_http_client(), hash_store)
+    hash_store.save()
+    scraper.get_slug_registry().save()
+    print(f"✅ Cover: {stats['processed']} diproses, {stats['unchanged']} tidak berubah, {stats['failed']} gagal")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+"""
+CRAWL FRONTIER
+==============
+Antrian kerja persisten (SQLite di STATE_DIR) untuk mode auto update, supaya
+run yang crash / kena deadline bisa lanjut tepat dari titik berhenti tanpa
+menemukan ulang pekerjaan yang sudah dikerjakan.
+
+Setiap item = (kind, url) dengan priority, jumlah attempt, waktu eligible
+berikutnya, state dan payload JSON:
+    kind 'detail' : halaman detail komik yang perlu dicek (scan)
+    kind 'comic'  : komik yang sudah terdeteksi punya update dan perlu diproses
+
+State: pending -> leased (sedang dikerjakan) -> done / failed, atau kembali
+ke pending dengan next_eligible di masa depan (retry dengan backoff).
+Item leased milik run yang crash dikembalikan ke pending oleh recover().
+
+Cakupan: hanya mode auto update yang memakai frontier. Listing tidak punya
+kind sendiri karena katalog dibaca dari file JSON / discovery sitemap dalam
+satu langkah, dan chapter tidak karena progres chapter sudah tersimpan per
+window di chapters.json (komik yang dilanjutkan hanya men-diff chapter yang
+belum ada).
+
+Baris tabel sekaligus menjadi seen-set satu siklus crawl: add() untuk URL yang
+sudah ada (dalam state apa pun) diabaikan. new_cycle() menghapus item
+done/failed sehingga siklus berikutnya mengecek ulang semuanya, sedangkan item
+pending dari siklus lama dibawa dengan prioritas tertinggi.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+
+PRIORITY_CARRIED = 0  # Item dari siklus/run sebelumnya yang belum selesai
+PRIORITY_DEFAULT = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS frontier (
+    kind TEXT NOT NULL,
+    url TEXT NOT NULL,
+    priority INTEGER NOT NULL DEFAULT 1,
+    state TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_eligible REAL NOT NULL DEFAULT 0,
+    payload TEXT,
+    error TEXT,
+    updated_at REAL,
+    PRIMARY KEY (kind, url)
+);
+CREATE INDEX IF NOT EXISTS frontier_ready ON frontier (kind, state, priority);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+"""
+
+
+class CrawlFrontier:
+    """Frontier SQLite thread-safe; setiap perubahan langsung di-commit (tahan crash)."""
+
+    def __init__(self, path):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.executescript(_SCHEMA)
+
+    def _execute(self, sql, params=()):
+        """Jalankan satu statement tulis. Returns: jumlah baris yang berubah."""
+        with self._lock:
+            return self._db.execute(sql, params).rowcount
+
+    def _query(self, sql, params=()):
+        with self._lock:
+            return self._db.execute(sql, params).fetchall()
+
+    # ---------- siklus ----------
+
+    def recover(self):
+        """Item leased dari run yang crash -> pending lagi. Returns: jumlah item."""
+        return self._execute("UPDATE frontier SET state = 'pending' WHERE state = 'leased'")
+
+    def cycle_started(self):
+        rows = self._query("SELECT value FROM meta WHERE key = 'cycle_started'")
+        return float(rows[0][0]) if rows else None
+
+    def new_cycle(self):
+        """Mulai siklus crawl baru: lupakan item done/failed, bawa item pending
+        dengan prioritas tertinggi. Returns: jumlah item yang dibawa."""
+        with self._lock:
+            self._db.execute('BEGIN')
+            self._db.execute("DELETE FROM frontier WHERE state IN ('done', 'failed')")
+            carried = self._db.execute(
+                "UPDATE frontier SET priority = ?, attempts = 0, next_eligible = 0", (PRIORITY_CARRIED,)
+            ).rowcount
+            self._db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('cycle_started', ?)",
+                             (str(time.time()),))
+            self._db.execute('COMMIT')
+        return carried
+
+    # ---------- antrian ----------
+
+    def add(self, kind, url, priority=PRIORITY_DEFAULT, payload=None):
+        """Tambah item jika belum pernah dilihat di siklus ini.
+        Item yang masih pending/leased diperbarui payload-nya. Returns: True jika item baru."""
+        data = json.dumps(payload) if payload is not None else None
+        with self._lock:
+            exists = self._db.execute("SELECT 1 FROM frontier WHERE kind = ? AND url = ?", (kind, url)).fetchone()
+            if exists:
+                if data is not None:
+                    self._db.execute("UPDATE frontier SET payload = ? WHERE kind = ? AND url = ? "
+                                     "AND state IN ('pending', 'leased')", (data, kind, url))
+                return False
+            self._db.execute("INSERT INTO frontier (kind, url, priority, payload, updated_at) VALUES (?, ?, ?, ?, ?)",
+                             (kind, url, priority, data, time.time()))
+            return True
+
+    def add_many(self, kind, items):
+        """items: iterable (url, priority, payload). URL yang sudah dilihat diabaikan.
+        Returns: jumlah item baru."""
+        now = time.time()
+        rows = [(kind, url, priority, json.dumps(payload) if payload is not None else None, now)
+                for url, priority, payload in items]
+        with self._lock:
+            self._db.execute('BEGIN')
+            before = self._db.total_changes
+            self._db.executemany("INSERT OR IGNORE INTO frontier (kind, url, priority, payload, updated_at) "
+                                 "VALUES (?, ?, ?, ?, ?)", rows)
+            added = self._db.total_changes - before
+            self._db.execute('COMMIT')
+        return added
+
+    def take(self, kind, limit=None):
+        """Lease item pending yang sudah eligible, urut priority lalu urutan masuk.
+        Returns: list dict {'url', 'priority', 'attempts', 'payload'}"""
+        now = time.time()
+        with self._lock:
+            self._db.execute('BEGIN')
+            rows = self._db.execute(
+                "SELECT rowid, url, priority, attempts, payload FROM frontier "
+                "WHERE kind = ? AND state = 'pending' AND next_eligible <= ? "
+                "ORDER BY priority, rowid LIMIT ?",
+                (kind, now, -1 if limit is None else limit)
+            ).fetchall()
+            self._db.executemany("UPDATE frontier SET state = 'leased', updated_at = ? WHERE rowid = ?",
+                                 [(now, row[0]) for row in rows])
+            self._db.execute('COMMIT')
+        return [
+            {'url': url, 'priority': priority, 'attempts': attempts,
+             'payload': json.loads(payload) if payload else None}
+            for _, url, priority, attempts, payload in rows
+        ]
+
+    def done(self, kind, url):
+        self._execute("UPDATE frontier SET state = 'done', error = NULL, updated_at = ? WHERE kind = ? AND url = ?",
+                      (time.time(), kind, url))
+
+    def retry(self, kind, url, base_delay, max_attempts, error=None):
+        """Attempt gagal: jadwalkan ulang setelah base_delay * 2^(attempt-1) detik,
+        atau tandai failed jika budget attempt habis. Returns: True jika dijadwalkan ulang."""
+        with self._lock:
+            row = self._db.execute("SELECT attempts FROM frontier WHERE kind = ? AND url = ?", (kind, url)).fetchone()
+            if not row:
+                return False
+            attempts = row[0] + 1
+            now = time.time()
+            if attempts >= max_attempts:
+                self._db.execute("UPDATE frontier SET state = 'failed', attempts = ?, error = ?, updated_at = ? "
+                                 "WHERE kind = ? AND url = ?", (attempts, error, now, kind, url))
+                return False
+            self._db.execute("UPDATE frontier SET state = 'pending', attempts = ?, next_eligible = ?, error = ?, "
+                             "updated_at = ? WHERE kind = ? AND url = ?",
+                             (attempts, now + base_delay * 2 ** (attempts - 1), error, now, kind, url))
+            return True
+
+    def release(self, kind, url=None):
+        """Kembalikan item leased (belum dikerjakan, mis. ditunda deadline) ke pending."""
+        if url is None:
+            self._execute("UPDATE frontier SET state = 'pending' WHERE kind = ? AND state = 'leased'", (kind,))
+        else:
+            self._execute("UPDATE frontier SET state = 'pending' WHERE kind = ? AND url = ? AND state = 'leased'",
+                          (kind, url))
+
+    def counts(self):
+        """{kind: {state: jumlah}} untuk laporan run."""
+        result = {}
+        for kind, state, count in self._query("SELECT kind, state, COUNT(*) FROM frontier GROUP BY kind, state"):
+            result.setdefault(kind, {})[state] = count
+        return result
+
+    def pending_count(self):
+        return self._query("SELECT COUNT(*) FROM frontier WHERE state IN ('pending', 'leased')")[0][0]
+
+    def close(self):
+        with self._lock:
+            self._db.close()
@@ -0,0 +1,88 @@
+"""
+DEAD-LETTER STORE
+=================
+Komik dan chapter yang gagal (setelah retry habis) dicatat secara durable di
+STATE_DIR/dead_letters.json, bukan hanya di-print, supaya bisa di-retry
+tanpa full crawl lewat mode repair (`python cli.py repair`).
+
+Entry per item, key '<kind>|<url>':
+    {'kind': 'comic'/'chapter', 'url', 'comic_url', 'title', 'stage',
+     'error_class', 'status', 'message', 'failures', 'first_failed_at', 'failed_at'}
+
+Item dihapus (resolve) begitu berhasil di run mana pun. Halaman yang memang
+kosong / sudah tidak ada ditangani negative cache, bukan dead-letter.
+"""
+
+from datetime import datetime
+
+from state_store import JsonStateStore
+
+COMIC = 'comic'
+CHAPTER = 'chapter'
+
+_TIME_FORMAT = '%Y-%m-%dT%H:%M:%S'
+_MAX_MESSAGE = 300
+
+
+def _key(kind, url):
+    return f"{kind}|{url}"
+
+
+class DeadLetterStore(JsonStateStore):
+    """Item gagal per (kind, url) dengan kelas error, status HTTP dan timestamp."""
+
+    def record(self, kind, url, error=None, title=None, comic_url=None, stage=None, status=None):
+        """Catat kegagalan. error: exception (None = gagal tanpa exception, mis. hasil kosong)."""
+        now = datetime.now().strftime(_TIME_FORMAT)
+        if status is None:
+            status = getattr(getattr(error, 'response', None), 'status_code', None)
+        previous = self.get(_key(kind, url)) or {}
+        self.put(_key(kind, url), {
+            'kind': kind,
+            'url': url,
+            'comic_url': comic_url or (url if kind == COMIC else None),
+            'title': title or previous.get('title'),
+            'stage': stage,
+            'error_class': type(error).__name__ if error is not None else 'NoResult',
+            'status': status,
+            'message': str(error)[:_MAX_MESSAGE] if error is not None else '',
+            'failures': previous.get('failures', 0) + 1,
+            'first_failed_at': previous.get('first_failed_at', now),
+            'failed_at': now,
+        })
+
+    def resolve(self, kind, url):
+        """Item berhasil: hapus dari dead-letter. Returns: True jika sebelumnya ada."""
+        return self.pop(_key(kind, url)) is not None
+
+    def resolve_stored(self, comic_url, pending_urls):
+        """Hapus chapter dead-letter milik komik ini yang sudah tidak perlu di-fetch
+        (sudah tersimpan lewat run lain). Returns: jumlah item yang dihapus."""
+        pending_urls = set(pending_urls)
+        stale = [entry['url'] for _, entry in self.items()
+                 if entry.get('kind') == CHAPTER and entry.get('comic_url') == comic_url
+                 and entry['url'] not in pending_urls]
+        for url in stale:
+            self.resolve(CHAPTER, url)
+        return len(stale)
+
+    def entries(self, kind=None):
+        return [entry for _, entry in self.items() if kind is None or entry.get('kind') == kind]
+
+    def comic_urls(self):
+        """URL komik yang perlu di-repair (komik gagal + induk chapter gagal), urut kegagalan terlama."""
+        urls = {}
+        for entry in sorted(self.entries(), key=lambda e: e.get('first_failed_at', '')):
+            if entry.get('comic_url'):
+                urls.setdefault(entry['comic_url'], None)
+        return list(urls)
+
+    def summary(self):
+        """{'total', 'by_kind': {...}, 'by_error': {'HTTPError 503': n, ...}} untuk laporan run."""
+        by_kind = {}
+        by_error = {}
+        for entry in self.entries():
+            by_kind[entry['kind']] = by_kind.get(entry['kind'], 0) + 1
+            label = entry['error_class'] + (f" {entry['status']}" if entry.get('status') else '')
+            by_error[label] = by_error.get(label, 0) + 1
+        return {'total': len(self), 'by_kind': by_kind, 'by_error': by_error}
@@ -0,0 +1,74 @@
+"""
+DETAIL PAGE FINGERPRINT
+=======================
+Fingerprint ringan per komik untuk mendeteksi "tidak ada perubahan" tanpa
+download dan parse seluruh halaman detail.
+
+Halaman detail di-stream hanya sampai <li> pertama di #chapter_list
+(chapter terbaru), lalu link + judul chapter tersebut di-hash. Tanggal rilis
+relatif ("2 jam yang lalu") sengaja tidak ikut di-hash karena berubah setiap hari.
+
+State per komik (STATE_DIR/fingerprints.json):
+    {slug: {'fingerprint': sha1, 'verified_at': iso}}
+Fingerprint hanya disimpan setelah komik selesai dicek/diproses penuh, dan
+dianggap kedaluwarsa setelah max_age_days supaya tetap ada full check periodik
+(mis. untuk re-upload chapter lama).
+"""
+
+import hashlib
+import re
+from datetime import datetime
+
+from state_store import JsonStateStore
+
+# Berhenti download setelah <li> pertama di dalam #chapter_list selesai
+FIRST_CHAPTER_END_RE = re.compile(rb'id=["\']chapter_list["\'].*?</li>', re.DOTALL | re.IGNORECASE)
+_FIRST_LI_RE = re.compile(rb'id=["\']chapter_list["\'].*?<li[^>]*>(.*?)</li>', re.DOTALL | re.IGNORECASE)
+_LCHX_LINK_RE = re.compile(rb'class=["\'][^"\']*lchx[^"\']*["\'][^>]*>\s*<a[^>]*href=["\']([^"\']+)["\'][^>]*>(.*?)</a>',
+                           re.DOTALL | re.IGNORECASE)
+_TAG_RE = re.compile(rb'<[^>]+>')
+
+
+def extract_fingerprint(html_prefix):
+    """Hash link + judul chapter terbaru dari awal HTML. None jika tidak ditemukan."""
+    li = _FIRST_LI_RE.search(html_prefix)
+    if not li:
+        return None
+    link = _LCHX_LINK_RE.search(li.group(1))
+    if not link:
+        return None
+    href = link.group(1).strip().rstrip(b'/')
+    title = b' '.join(_TAG_RE.sub(b' ', link.group(2)).split())
+    return hashlib.sha1(href + b'|' + title).hexdigest()
+
+
+class FingerprintStore(JsonStateStore):
+    """State fingerprint per slug komik."""
+
+    def matches(self, slug, fingerprint, max_age_days):
+        """True jika fingerprint sama dan full check terakhir belum kedaluwarsa."""
+        if not fingerprint:
+            return False
+        known = self.get(slug)
+        if not known or known.get('fingerprint') != fingerprint:
+            return False
+        now = datetime.now()
+        try:
+            age = now - datetime.fromisoformat(known.get('verified_at', ''))
+            if known.get('valid_until') and now >= datetime.fromisoformat(known['valid_until']):
+                return False
+        except ValueError:
+            return False
+        return age.days < max_age_days
+
+    def record(self, slug, fingerprint, valid_until=None):
+        """valid_until (datetime): batas berlaku lebih awal dari max_age, mis. jadwal cek
+        ulang chapter di negative cache (chapter teratas = yang di-hash fingerprint)."""
+        if fingerprint:
+            entry = {
+                'fingerprint': fingerprint,
+                'verified_at': datetime.now().strftime('%Y-%m-%dT%H:%M:%S'),
+            }
+            if valid_until is not None:
+                entry['valid_until'] = valid_until.strftime('%Y-%m-%dT%H:%M:%S')
+            self.put(slug, entry)
@@ -4,17 +4,24 @@ GENERATE COMICS-LIST.JSON FROM SUPABASE BUCKET FOLDERS
 Script untuk menggenerate daftar komik (comics-list.json) dari
 semua folder yang ada di Supabase Storage bucket.
 
-Logika:
-1. List semua objek di bucket 'manga-data'
-2. Extract nama folder unik (folder = slug komik)
+Logika (delta mode):
+1. Load registry (comics-registry.json) + lipat file delta dari scraper
+2. Full listing bucket hanya dilakukan periodik (RECONCILE_INTERVAL_DAYS)
+   atau jika dipaksa (FORCE_RECONCILE), dengan listing paralel per prefix
 3. Generate array JSON dengan semua slug
 4. Upload ke Supabase sebagai 'comics-list.json'
 """
 
 import os
 import json
+import string
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
 from supabase import create_client, Client
 from dotenv import load_dotenv
+from comics_registry import (
+    load_registry, save_registry, collect_deltas, remove_deltas, needs_reconcile
+)
 
 # Muat environment variables dari file .env
 load_dotenv()
@@ -23,6 +30,14 @@ SUPABASE_URL = os.environ.get("SUPABASE_URL")
 SUPABASE_KEY = os.environ.get("SUPABASE_KEY")
 BUCKET_NAME = os.environ.get("BUCKET_NAME", "manga-data")
 
+# Delta mode: full listing hanya setiap N hari, sisanya dari registry + delta
+RECONCILE_INTERVAL_DAYS = int(os.environ.get("RECONCILE_INTERVAL_DAYS", "7"))
+FORCE_RECONCILE = os.environ.get("FORCE_RECONCILE", "false").lower() == "true"
+LIST_PAGE_SIZE = int(os.environ.get("LIST_PAGE_SIZE", "1000"))  # Item per request listing
+LIST_WORKERS = int(os.environ.get("LIST_WORKERS", "8"))  # Listing prefix secara paralel
+
+FILE_EXTENSIONS = ['.json', '.png', '.jpg', '.webp', '.txt']
+
 if not SUPABASE_URL or not SUPABASE_KEY:
     raise EnvironmentError("Pastikan SUPABASE_URL dan SUPABASE_KEY ada di file .env Anda")
 
@@ -155,6 +170,87 @@ def get_folders_by_listing_subfolders():
         return []
 
 
+def is_folder_item(item):
+    """Folder di Supabase Storage: id=None dan metadata=None, atau nama tanpa ekstensi file.
+    Folder berawalan '_' (mis. _indexes) adalah folder sistem, bukan komik."""
+    name = item.get('name', '')
+    if not name or name.startswith('_'):
+        return False
+    if item.get('id') is None and item.get('metadata') is None:
+        return True
+    return '/' not in name and not any(name.endswith(ext) for ext in FILE_EXTENSIONS)
+
+
+def list_folders_with_prefix(prefix, page_size=LIST_PAGE_SIZE):
+    """Listing semua folder di root yang namanya diawali `prefix` (dengan pagination)."""
+    folders = set()
+    offset = 0
+    while True:
+        items = supabase.storage.from_(BUCKET_NAME).list(
+            path="",
+            options={
+                "limit": page_size,
+                "offset": offset,
+                "search": prefix,
+                "sortBy": {"column": "name", "order": "asc"}
+            }
+        )
+        if not items:
+            break
+        for item in items:
+            name = item.get('name', '')
+            # Filter ulang di sisi client: search Supabase case-insensitive
+            if is_folder_item(item) and name.lower().startswith(prefix):
+                folders.add(name)
+        if len(items) < page_size:
+            break
+        offset += page_size
+    return folders
+
+
+def get_folders_partitioned(known_slugs=()):
+    """
+    Full listing untuk reconcile: root bucket dipartisi per karakter awal
+    (a-z, 0-9 + karakter awal slug yang sudah dikenal), setiap partisi
+    di-list paralel dengan page size besar.
+    """
+    prefixes = set(string.ascii_lowercase + string.digits)
+    prefixes.update(slug[0].lower() for slug in known_slugs if slug)
+
+    print(f"📂 Listing bucket paralel: {len(prefixes)} prefix, {LIST_WORKERS} workers, page size {LIST_PAGE_SIZE}...")
+
+    folders = set()
+    with ThreadPoolExecutor(max_workers=LIST_WORKERS) as executor:
+        future_to_prefix = {
+            executor.submit(list_folders_with_prefix, prefix): prefix
+            for prefix in sorted(prefixes)
+        }
+        for future in as_completed(future_to_prefix):
+            prefix = future_to_prefix[future]
+            try:
+                folders.update(future.result())
+            except Exception as e:
+                # Satu partisi gagal -> hasil tidak lengkap, jangan dipakai untuk reconcile
+                print(f"❌ Listing prefix '{prefix}' gagal: {e}")
+                return []
+
+    folders = sorted(folders)
+    print(f"✅ Total ditemukan {len(folders)} folder")
+    return folders
+
+
+def full_listing(known_slugs=()):
+    """Full listing dengan fallback ke metode lama."""
+    comics_list = get_folders_partitioned(known_slugs)
+
+    # Jika gagal, coba metode sekuensial lalu metode alternatif
+    if not comics_list:
+        comics_list = get_folders_by_listing_subfolders()
+    if not comics_list:
+        comics_list = get_all_folders_from_bucket()
+    return [name for name in comics_list if not name.startswith('_')]
+
+
 def upload_comics_list(comics_list):
     """Upload comics-list.json ke Supabase Storage"""
     try:
@@ -201,12 +297,21 @@ def main():
     print(f"📦 Bucket: {BUCKET_NAME}")
     print()
 
-    # Coba metode utama
-    comics_list = get_folders_by_listing_subfolders()
-
-    # Jika gagal, coba metode alternatif
-    if not comics_list:
-        comics_list = get_all_folders_from_bucket()
+    # Registry + delta dari scraper (slug baru sejak run terakhir)
+    registry = load_registry(supabase, BUCKET_NAME)
+    new_slugs, delta_paths = collect_deltas(supabase, BUCKET_NAME)
+    print(f"🗂️  Registry: {len(registry['slugs'])} slug, delta: {len(new_slugs)} slug baru dari {len(delta_paths)} file")
+
+    if FORCE_RECONCILE or needs_reconcile(registry, RECONCILE_INTERVAL_DAYS):
+        print(f"🔁 Reconcile: full listing bucket (terakhir: {registry['last_reconcile'] or '-'})")
+        comics_list = full_listing(set(registry['slugs']) | new_slugs)
+        if comics_list:
+            registry['slugs'] = comics_list
+            registry['last_reconcile'] = datetime.now().isoformat(timespec='seconds')
+    else:
+        print(f"⚡ Delta mode: skip full listing (reconcile setiap {RECONCILE_INTERVAL_DAYS} hari)")
+        comics_list = sorted(set(registry['slugs']) | new_slugs)
+        registry['slugs'] = comics_list
 
     if not comics_list:
         print("\n❌ Tidak dapat mengambil daftar folder dari bucket.")
@@ -230,6 +335,15 @@ def main():
     print("\n☁️  Mengupload ke Supabase...")
     upload_comics_list(comics_list)
 
+    # Simpan registry lalu hapus delta yang sudah dilipat
+    try:
+        save_registry(supabase, BUCKET_NAME, registry)
+        save_local(registry, filename="comics-registry.json")
+        remove_deltas(supabase, BUCKET_NAME, delta_paths)
+        print(f"✅ Registry diperbarui ({len(registry['slugs'])} slug)")
+    except Exception as e:
+        print(f"❌ Gagal update registry: {e}")
+
     print("\n" + "=" * 60)
     print("✅ SELESAI!")
     print("=" * 60)
@@ -0,0 +1,266 @@
+"""
+HTTP CONNECTION POOL
+====================
+Client HTTP bersama untuk semua worker thread, supaya request ke host yang
+sama memakai ulang koneksi (keep-alive) alih-alih handshake TCP+TLS baru
+untuk setiap halaman chapter.
+
+FITUR:
+- Pool session per host dengan ukuran yang bisa dikonfigurasi (pool_size_per_host)
+- HTTP/2 multiplexing via curl_cffi (fallback ke requests.Session + HTTPAdapter)
+- Statistik reuse koneksi per host (requests vs session/koneksi yang dibuka)
+- Rate limit opsional per host (request/detik)
+
+CATATAN:
+- Session curl_cffi tidak thread-safe, jadi setiap session di-checkout eksklusif
+  oleh satu thread lalu dikembalikan ke pool setelah request selesai.
+- Jumlah session per host dibatasi pool_size_per_host; thread lain menunggu.
+"""
+
+import queue
+import threading
+import time
+from urllib.parse import urlsplit
+
+try:
+    from curl_cffi import requests as cf_requests
+    from curl_cffi import CurlHttpVersion
+    CURL_CFFI_AVAILABLE = True
+except ImportError:
+    CURL_CFFI_AVAILABLE = False
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+class _HostPool:
+    """Pool session untuk satu host (scheme + netloc)."""
+
+    def __init__(self, host, size, factory, rate_limit=0):
+        self.host = host
+        self.size = size
+        self._factory = factory
+        self._min_interval = 1.0 / rate_limit if rate_limit else 0.0
+        self._next_slot = 0.0
+        self._rate_lock = threading.Lock()
+        self._idle = queue.LifoQueue()  # LIFO: session yang paling "hangat" dipakai duluan
+        self._slots = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.sessions_opened = 0
+        self.errors = 0
+
+    def wait_rate_limit(self):
+        """Tunggu giliran request berikutnya sesuai rate limit host (jika ada)."""
+        if not self._min_interval:
+            return
+        with self._rate_lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self._min_interval
+        if slot > now:
+            time.sleep(slot - now)
+
+    def acquire(self):
+        self.wait_rate_limit()
+        self._slots.acquire()
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        try:
+            session = self._factory()
+        except BaseException:
+            # Session gagal dibuat: kembalikan slot supaya pool tidak menyusut permanen
+            self._slots.release()
+            raise
+        with self._lock:
+            self.sessions_opened += 1
+        return session
+
+    def release(self, session, broken=False):
+        if broken:
+            try:
+                session.close()
+            except Exception:
+                pass
+        else:
+            self._idle.put(session)
+        self._slots.release()
+
+    def close(self):
+        while True:
+            try:
+                session = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                session.close()
+            except Exception:
+                pass
+
+
+class PooledHttpClient:
+    """Client HTTP dengan pool koneksi per host, dipakai bersama oleh semua thread.
+
+    Contoh:
+        client = PooledHttpClient(pool_size_per_host=4)
+        response = client.get(url, headers=headers, timeout=10)
+        print(client.stats())
+    """
+
+    def __init__(self, pool_size_per_host=4, http2=True, rate_limit=0):
+        self.pool_size_per_host = max(1, int(pool_size_per_host))
+        self.http2 = http2 and CURL_CFFI_AVAILABLE
+        self.rate_limit = rate_limit  # Maks request/detik per host (0 = tanpa batas)
+        self._pools = {}
+        self._lock = threading.Lock()
+
+    def _new_session(self):
+        if self.http2:
+            # V2TLS: HTTP/2 untuk https (multiplexing), HTTP/1.1 untuk http biasa
+            return cf_requests.Session(http_version=CurlHttpVersion.V2TLS)
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size_per_host)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        return session
+
+    def _pool_for(self, url):
+        parts = urlsplit(url)
+        host = f"{parts.scheme}://{parts.netloc}"
+        with self._lock:
+            pool = self._pools.get(host)
+            if pool is None:
+                pool = _HostPool(host, self.pool_size_per_host, self._new_session, self.rate_limit)
+                self._pools[host] = pool
+            return pool
+
+    def request(self, method, url, headers=None, timeout=None, **kwargs):
+        """Kirim request lewat session dari pool host terkait.
+
+        Status >= 400 selalu di-raise sebagai requests.exceptions.HTTPError
+        (termasuk untuk response curl_cffi) supaya caller cukup menangani
+        satu jenis exception.
+        """
+        pool = self._pool_for(url)
+        session = pool.acquire()
+        broken = False
+        try:
+            response = session.request(method, url, headers=headers, timeout=timeout, **kwargs)
+            with pool._lock:
+                pool.requests += 1
+        except Exception:
+            broken = True
+            with pool._lock:
+                pool.errors += 1
+            raise
+        finally:
+            pool.release(session, broken=broken)
+
+        if response.status_code >= 400:
+            raise requests.exceptions.HTTPError(
+                f"{response.status_code} Error for url: {url}", response=response
+            )
+        return response
+
+    def read_prefix(self, url, until, headers=None, timeout=None, max_bytes=262144):
+        """Download hanya awal body sampai regex `until` (bytes) cocok atau max_bytes tercapai.
+
+        Session tetap di-checkout selama body di-stream, lalu response ditutup
+        lebih awal (sisa halaman tidak di-download).
+        Returns: (status_code, bytes)
+        """
+        pool = self._pool_for(url)
+        session = pool.acquire()
+        broken = False
+        try:
+            headers = dict(headers or {}, Range=f"bytes=0-{max_bytes - 1}")
+            response = session.request('GET', url, headers=headers, timeout=timeout, stream=True)
+            try:
+                if response.status_code >= 400:
+                    raise requests.exceptions.HTTPError(
+                        f"{response.status_code} Error for url: {url}", response=response
+                    )
+                buffer = bytearray()
+                for chunk in response.iter_content(chunk_size=16384):
+                    buffer += chunk
+                    if until.search(buffer) or len(buffer) >= max_bytes:
+                        break
+            finally:
+                response.close()
+            with pool._lock:
+                pool.requests += 1
+            return response.status_code, bytes(buffer)
+        except requests.exceptions.HTTPError:
+            raise
+        except Exception:
+            broken = True
+            with pool._lock:
+                pool.errors += 1
+            raise
+        finally:
+            pool.release(session, broken=broken)
+
+    def iter_content(self, url, headers=None, timeout=None, chunk_size=65536):
+        """Generator: stream body per chunk (mis. untuk parse XML besar secara incremental).
+        Session tetap di-checkout sampai generator selesai/ditutup."""
+        pool = self._pool_for(url)
+        session = pool.acquire()
+        broken = False
+        try:
+            response = session.request('GET', url, headers=headers, timeout=timeout, stream=True)
+            try:
+                if response.status_code >= 400:
+                    raise requests.exceptions.HTTPError(
+                        f"{response.status_code} Error for url: {url}", response=response
+                    )
+                with pool._lock:
+                    pool.requests += 1
+                for chunk in response.iter_content(chunk_size=chunk_size):
+                    if chunk:
+                        yield chunk
+            finally:
+                response.close()
+        except (requests.exceptions.HTTPError, GeneratorExit):
+            raise
+        except Exception:
+            broken = True
+            with pool._lock:
+                pool.errors += 1
+            raise
+        finally:
+            pool.release(session, broken=broken)
+
+    def get(self, url, headers=None, timeout=None, **kwargs):
+        return self.request('GET', url, headers=headers, timeout=timeout, **kwargs)
+
+    def head(self, url, headers=None, timeout=None, **kwargs):
+        return self.request('HEAD', url, headers=headers, timeout=timeout, **kwargs)
+
+    def stats(self):
+        """Statistik reuse per host.
+
+        sessions_opened ~ jumlah koneksi yang dibuka (dengan HTTP/2 satu session
+        memultipleks semua stream ke host lewat satu koneksi), sehingga
+        reuse_ratio = requests / sessions_opened.
+        """
+        result = {}
+        with self._lock:
+            pools = list(self._pools.values())
+        for pool in pools:
+            opened = pool.sessions_opened
+            result[pool.host] = {
+                'requests': pool.requests,
+                'sessions_opened': opened,
+                'errors': pool.errors,
+                'reuse_ratio': round(pool.requests / opened, 2) if opened else 0.0,
+            }
+        return result
+
+    def close(self):
+        with self._lock:
+            pools = list(self._pools.values())
+            self._pools = {}
+        for pool in pools:
+            pool.close()
@@ -0,0 +1,169 @@
+"""
+IMAGE URL PROBE
+===============
+Stage opsional untuk memverifikasi link gambar chapter tanpa men-download
+gambarnya: HEAD request (fallback ke GET Range bytes=0-0) secara concurrent,
+lalu catat status, content-length dan content-type per gambar.
+
+- URL yang sama di banyak chapter hanya di-probe sekali (dedupe)
+- Hasil OK disimpan di cache JSON sehingga tidak pernah di-probe ulang
+- Hasil gagal tetap di-cache tapi di-probe lagi di run berikutnya
+
+Bisa juga dijalankan langsung untuk cek massal file output lokal:
+    python image_probe.py manga_local_image_links.json
+"""
+
+import json
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+
+import requests
+
+from http_pool import PooledHttpClient
+from state_store import JsonStateStore
+
+PROBE_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Accept': 'image/avif,image/webp,image/apng,image/*,*/*;q=0.8',
+    'Referer': 'https://komikindo.ch/',
+}
+
+
+def is_ok(result):
+    """Gambar dianggap OK jika status 2xx dan content-type berupa image."""
+    if not result:
+        return False
+    status = result.get('status') or 0
+    content_type = (result.get('content_type') or '').lower()
+    return 200 <= status < 300 and (not content_type or content_type.startswith('image/'))
+
+
+class ImageProbeCache(JsonStateStore):
+    """Cache hasil probe per URL gambar, disimpan sebagai file JSON."""
+
+    def is_verified(self, url):
+        return is_ok(self.get(url))
+
+
+def _content_length(response):
+    # Response Range: "Content-Range: bytes 0-0/123456" -> total size
+    content_range = response.headers.get('Content-Range', '')
+    if '/' in content_range:
+        total = content_range.rsplit('/', 1)[-1].strip()
+        if total.isdigit():
+            return int(total)
+    length = response.headers.get('Content-Length')
+    return int(length) if length and length.isdigit() else None
+
+
+def probe_image(client, url, timeout=10):
+    """Probe satu URL gambar. Returns dict {status, content_length, content_type, checked_at}."""
+    result = {
+        'status': None,
+        'content_length': None,
+        'content_type': None,
+        'checked_at': datetime.now().strftime('%Y-%m-%dT%H:%M:%S'),
+    }
+    response = None
+    try:
+        response = client.head(url, headers=PROBE_HEADERS, timeout=timeout)
+    except requests.exceptions.HTTPError as e:
+        status = getattr(e.response, 'status_code', None)
+        # Beberapa CDN menolak HEAD (403/405) - coba GET dengan range 1 byte
+        if status not in (403, 405, 501):
+            result['status'] = status
+            return result
+    except Exception as e:
+        result['error'] = str(e)[:200]
+        return result
+
+    if response is None or _content_length(response) is None:
+        try:
+            headers = dict(PROBE_HEADERS, Range='bytes=0-0')
+            response = client.get(url, headers=headers, timeout=timeout)
+        except requests.exceptions.HTTPError as e:
+            result['status'] = getattr(e.response, 'status_code', None)
+            return result
+        except Exception as e:
+            result['error'] = str(e)[:200]
+            return result
+
+    result['status'] = response.status_code
+    result['content_length'] = _content_length(response)
+    result['content_type'] = response.headers.get('Content-Type')
+    return result
+
+
+def probe_images(urls, client, cache, max_workers=8, timeout=10):
+    """Probe banyak URL secara concurrent.
+
+    URL duplikat dan URL yang sudah terverifikasi di cache tidak di-probe lagi.
+    Returns: dict {url: result} untuk semua URL (termasuk dari cache).
+    """
+    unique_urls = list(dict.fromkeys(urls))
+    to_probe = [url for url in unique_urls if not cache.is_verified(url)]
+
+    if to_probe:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            future_to_url = {
+                executor.submit(probe_image, client, url, timeout): url
+                for url in to_probe
+            }
+            for future in as_completed(future_to_url):
+                url = future_to_url[future]
+                try:
+                    cache.put(url, future.result())
+                except Exception as e:
+                    cache.put(url, {'status': None, 'error': str(e)[:200]})
+
+    return {url: cache.get(url) for url in unique_urls}
+
+
+def find_broken_chapters(chapters, results):
+    """Ringkas chapter yang punya gambar rusak.
+    Returns: list of {'slug', 'title', 'broken', 'total'}"""
+    broken = []
+    for ch in chapters:
+        bad = [url for url in ch.get('images', []) if not is_ok(results.get(url))]
+        if bad:
+            broken.append({
+                'slug': ch.get('slug'),
+                'title': ch.get('title'),
+                'broken': len(bad),
+                'total': len(ch.get('images', [])),
+                'sample': bad[:3],
+            })
+    return broken
+
+
+def main():
+    """Cek massal link gambar dari file output lokal."""
+    source = sys.argv[1] if len(sys.argv) > 1 else 'manga_local_image_links.json'
+    cache_path = os.path.join(os.getenv('STATE_DIR', '.scrape_state'), 'image_probe_cache.json')
+
+    with open(source, 'r', encoding='utf-8') as f:
+        comics = json.load(f)
+
+    cache = ImageProbeCache(cache_path)
+    client = PooledHttpClient(pool_size_per_host=8)
+    print(f"🔎 Probe gambar dari {len(comics)} komik (cache: {len(cache)} URL)")
+
+    for comic in comics:
+        chapters = comic.get('chapters', [])
+        urls = [url for ch in chapters for url in ch.get('images', [])]
+        results = probe_images(urls, client, cache)
+        broken = find_broken_chapters(chapters, results)
+        if broken:
+            print(f"  ✗ {comic.get('title')}: {len(broken)} chapter dengan gambar rusak")
+            for item in broken:
+                print(f"     - {item['title']}: {item['broken']}/{item['total']} rusak")
+        cache.save()
+
+    client.close()
+    print(f"✅ Selesai (cache: {len(cache)} URL)")
+
+
+if __name__ == "__main__":
+    main()
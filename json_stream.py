@@ -0,0 +1,90 @@
+"""
+STREAMING JSON WRITER
+=====================
+Serialisasi JSON item per item ke file / body upload, supaya memori puncak
+sebanding dengan satu item (satu komik / satu chapter), bukan seluruh katalog.
+
+Output identik byte-per-byte dengan json.dumps(data, ensure_ascii=False, indent=2):
+list/dict di dua level teratas di-stream per elemen, elemen di dalamnya
+di-encode sekaligus dengan encoder C bawaan (cepat).
+
+    write_json_stream('output.json', data)
+
+    with spooled_json(data) as tmp_path:
+        supabase.storage.from_(bucket).upload(path, tmp_path, options)
+"""
+
+import json
+import os
+import tempfile
+from contextlib import contextmanager
+
+STREAM_DEPTH = 2  # Container di level < STREAM_DEPTH di-stream per elemen
+WRITE_BUFFER_SIZE = 1 << 16
+
+
+def _dumps(value, indent, level, default=None):
+    text = json.dumps(value, ensure_ascii=False, indent=indent, default=default)
+    if indent and level and '\n' in text:
+        text = text.replace('\n', '\n' + ' ' * (indent * level))
+    return text
+
+
+def _iter_value(value, indent, level, default=None):
+    if level < STREAM_DEPTH and isinstance(value, (list, dict)) and value:
+        inner_pad = '\n' + ' ' * (indent * (level + 1))
+        outer_pad = '\n' + ' ' * (indent * level)
+        is_dict = isinstance(value, dict)
+        yield '{' if is_dict else '['
+        first = True
+        items = value.items() if is_dict else ((None, v) for v in value)
+        for key, item in items:
+            yield inner_pad if first else ',' + inner_pad
+            first = False
+            if is_dict:
+                # Key non-string mengikuti aturan json.dumps (1 -> "1", True -> "true")
+                key = key if isinstance(key, str) else json.dumps(key)
+                yield json.dumps(key, ensure_ascii=False) + ': '
+            yield from _iter_value(item, indent, level + 1, default)
+        yield outer_pad + ('}' if is_dict else ']')
+    else:
+        yield _dumps(value, indent, level, default)
+
+
+def iter_json(data, indent=2, default=None):
+    """Generator potongan string JSON untuk `data` (urutan sama dengan json.dumps).
+    `default` sama seperti di json.dumps (untuk object non-JSON, mis. ChapterRecord)."""
+    if not indent:
+        # Tanpa indent: encoder bawaan sudah iteratif
+        yield from json.JSONEncoder(ensure_ascii=False, default=default).iterencode(data)
+        return
+    yield from _iter_value(data, indent, 0, default)
+
+
+def write_json_stream(path, data, indent=2, default=None):
+    """Tulis JSON ke file secara streaming (atomic: tulis ke .tmp lalu rename)."""
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8', buffering=WRITE_BUFFER_SIZE) as f:
+        for chunk in iter_json(data, indent, default):
+            f.write(chunk)
+    os.replace(tmp_path, path)
+
+
+@contextmanager
+def spooled_json(data, indent=2, default=None):
+    """Tulis JSON ke file sementara lalu yield path-nya untuk upload.
+
+    Supabase storage membaca file dari path secara bertahap (multipart
+    streaming), jadi tidak ada salinan string/bytes penuh di memori.
+    """
+    fd, tmp_path = tempfile.mkstemp(suffix='.json')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8', buffering=WRITE_BUFFER_SIZE) as f:
+            for chunk in iter_json(data, indent, default):
+                f.write(chunk)
+        yield tmp_path
+    finally:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
@@ -0,0 +1,137 @@
+"""
+MANIFEST INDEXES
+================
+Index siap pakai yang di-publish bersama all-manhwa-metadata.json supaya
+front end tidak perlu download seluruh manifest hanya untuk filter/search.
+
+Semua file berada di folder _indexes/ (prefix '_' = folder sistem, bukan slug komik):
+- _indexes/meta.json                 : ringkasan facet (genre/type/status + jumlah) dan sha256 per file
+- _indexes/genre/{genre}.json        : inverted index genre -> [slug]
+- _indexes/type/{type}.json          : bucket type -> [slug]
+- _indexes/status/{status}.json      : bucket status -> [slug]
+- _indexes/search/{huruf}.json       : prefix index token judul -> [slug], dipecah per huruf awal
+- _indexes/latest/page-{n}.json      : slice "update terbaru" berisi data kartu ringkas
+
+Semua daftar slug mengikuti urutan manifest (update terbaru di atas).
+
+Upload incremental: meta.json menyimpan sha256 setiap file index, jadi run
+berikutnya hanya meng-upload file yang hash-nya berubah (changed_index_paths)
+dan menghapus file yang tidak ada lagi, mis. genre yang sudah tidak dipakai
+komik mana pun (stale_index_paths).
+"""
+
+import re
+
+from manifest_pages import page_hash
+
+INDEX_ROOT = '_indexes'
+INDEX_META_PATH = f'{INDEX_ROOT}/meta.json'
+LATEST_PAGE_SIZE = 30
+
+# Field ringkas untuk kartu di halaman "update terbaru"
+LATEST_FIELDS = ('slug', 'title', 'cover_url', 'type', 'status', 'rating', 'latestChapters', 'lastUpdateTime')
+
+
+def slugify(value):
+    """'Martial Arts' -> 'martial-arts' (untuk nama file index)."""
+    value = re.sub(r'[^a-z0-9]+', '-', (value or '').lower())
+    return value.strip('-') or 'unknown'
+
+
+def title_tokens(title):
+    """Token judul untuk search: lowercase alfanumerik, tanpa duplikat."""
+    return list(dict.fromkeys(re.findall(r'[a-z0-9]+', (title or '').lower())))
+
+
+def _bucket(items, key_fn):
+    """Kelompokkan slug berdasarkan key, urutan item dipertahankan."""
+    buckets = {}
+    labels = {}
+    for item in items:
+        for label in key_fn(item):
+            if not label:
+                continue
+            key = slugify(label)
+            labels.setdefault(key, label)
+            buckets.setdefault(key, []).append(item['slug'])
+    return buckets, labels
+
+
+def build_indexes(all_metadata, latest_page_size=LATEST_PAGE_SIZE):
+    """Bangun semua artefak index dari manifest (sudah di-sort).
+    Returns: dict {path_di_bucket: data}"""
+    artifacts = {}
+    facets = {}
+
+    facet_sources = {
+        'genre': lambda item: item.get('genres', []),
+        'type': lambda item: [item.get('type')],
+        'status': lambda item: [item.get('status')],
+    }
+    for facet, key_fn in facet_sources.items():
+        buckets, labels = _bucket(all_metadata, key_fn)
+        facets[facet] = [
+            {'key': key, 'label': labels[key], 'count': len(slugs)}
+            for key, slugs in sorted(buckets.items())
+        ]
+        for key, slugs in buckets.items():
+            artifacts[f"{INDEX_ROOT}/{facet}/{key}.json"] = slugs
+
+    # Prefix index judul: {token: [slug]} dipecah per karakter awal token
+    search_shards = {}
+    for item in all_metadata:
+        for token in title_tokens(item.get('title')):
+            shard = search_shards.setdefault(token[0], {})
+            slugs = shard.setdefault(token, [])
+            if item['slug'] not in slugs:
+                slugs.append(item['slug'])
+    for char, tokens in search_shards.items():
+        artifacts[f"{INDEX_ROOT}/search/{char}.json"] = dict(sorted(tokens.items()))
+
+    # Slice "update terbaru" per halaman
+    total_pages = (len(all_metadata) + latest_page_size - 1) // latest_page_size
+    for page in range(total_pages):
+        chunk = all_metadata[page * latest_page_size:(page + 1) * latest_page_size]
+        artifacts[f"{INDEX_ROOT}/latest/page-{page + 1}.json"] = {
+            'page': page + 1,
+            'total_pages': total_pages,
+            'items': [{field: item.get(field) for field in LATEST_FIELDS} for item in chunk],
+        }
+
+    artifacts[INDEX_META_PATH] = {
+        'total': len(all_metadata),
+        'facets': facets,
+        'search_shards': sorted(search_shards),
+        'latest_pages': total_pages,
+        'latest_page_size': latest_page_size,
+        'files': {path: page_hash(data) for path, data in sorted(artifacts.items())},
+    }
+    return artifacts
+
+
+def index_paths(meta):
+    """Path file index yang tercatat di meta.json (juga meta lama tanpa 'files')."""
+    if not isinstance(meta, dict):
+        return set()
+    if isinstance(meta.get('files'), dict):
+        return set(meta['files'])
+    paths = {
+        f"{INDEX_ROOT}/{facet}/{entry['key']}.json"
+        for facet, entries in (meta.get('facets') or {}).items() for entry in entries
+    }
+    paths.update(f"{INDEX_ROOT}/search/{char}.json" for char in meta.get('search_shards') or [])
+    paths.update(f"{INDEX_ROOT}/latest/page-{page}.json" for page in range(1, (meta.get('latest_pages') or 0) + 1))
+    return paths
+
+
+def changed_index_paths(indexes, previous_meta):
+    """File index (tanpa meta.json) yang hash-nya berbeda dari meta sebelumnya atau baru."""
+    previous = (previous_meta or {}).get('files') if isinstance(previous_meta, dict) else None
+    previous = previous if isinstance(previous, dict) else {}
+    files = indexes[INDEX_META_PATH]['files']
+    return [path for path, sha256 in files.items() if previous.get(path) != sha256]
+
+
+def stale_index_paths(indexes, previous_meta):
+    """File index run sebelumnya yang tidak ada lagi di build ini (perlu dihapus dari bucket)."""
+    return sorted(index_paths(previous_meta) - set(indexes))
@@ -0,0 +1,129 @@
+"""
+PAGED MANIFEST
+==============
+Memecah all-manhwa-metadata.json menjadi halaman berukuran tetap plus satu
+head file kecil, supaya client dan run berikutnya hanya memindahkan halaman
+yang berubah.
+
+- _manifest/head.json        : total, page_size, daftar halaman + sha256 per halaman
+- _manifest/page-{n}.json    : item manifest (urutan newest-first di dalam halaman)
+- _manifest/slots.json       : {slug: [halaman, sort_key]} dari run sebelumnya (untuk generator)
+
+Halaman ditetapkan secara stabil: komik tetap di halaman yang sama selama
+waktu update-nya (sort_key) tidak berubah. Komik yang di-update pindah ke
+halaman ekor (tail, komik terbaru) dan hilang dari halaman asalnya; komik baru
+juga masuk ke ekor. Satu update hanya mengubah halaman asal + halaman ekor,
+halaman lain tetap identik (hash sama) dan tidak di-upload ulang. Halaman
+penuh tidak diisi ulang, jadi batas halaman tidak pernah bergeser.
+
+Nomor halaman naik dari komik terlama ke terbaru; client yang butuh "update
+terbaru" cukup mengambil halaman dengan nomor terbesar dari head. Jika
+halaman menjadi terlalu jarang (lebih dari COMPACT_RATIO x jumlah minimum),
+semua halaman disusun ulang dari nol.
+"""
+
+import hashlib
+import json
+from datetime import datetime
+
+MANIFEST_ROOT = '_manifest'
+HEAD_PATH = f'{MANIFEST_ROOT}/head.json'
+SLOTS_PATH = f'{MANIFEST_ROOT}/slots.json'
+MANIFEST_PAGE_SIZE = 100
+COMPACT_RATIO = 2
+
+
+def page_hash(items):
+    """sha256 dari JSON kanonik (sort_keys, tanpa spasi) isi halaman."""
+    canonical = json.dumps(items, ensure_ascii=False, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+def _page_path(number):
+    return f"{MANIFEST_ROOT}/page-{number}.json"
+
+
+def assign_pages(sorted_items, sort_key, page_size=MANIFEST_PAGE_SIZE, previous_slots=None):
+    """Tentukan halaman setiap item. Returns: {slug: nomor halaman}.
+
+    Item yang slug + sort_key-nya sama dengan run sebelumnya tetap di halamannya;
+    sisanya (baru / di-update) ditambahkan ke ekor, terlama dulu.
+    """
+    previous = previous_slots if isinstance(previous_slots, dict) else {}
+    assignment = {}
+    counts = {}
+    moved = []
+    for item in reversed(sorted_items):  # oldest-first
+        slot = previous.get(item['slug'])
+        if slot and slot[1] == sort_key(item) and item['slug'] not in assignment:
+            assignment[item['slug']] = slot[0]
+            counts[slot[0]] = counts.get(slot[0], 0) + 1
+        else:
+            moved.append(item)
+
+    minimum_pages = -(-len(sorted_items) // page_size)
+    if len(counts) > max(1, minimum_pages) * COMPACT_RATIO:
+        # Terlalu banyak halaman jarang: susun ulang semua
+        assignment, counts, moved = {}, {}, list(reversed(sorted_items))
+
+    tail = max(counts) if counts else 1
+    for item in moved:
+        if item['slug'] in assignment:
+            continue
+        if counts.get(tail, 0) >= page_size:
+            tail += 1
+        assignment[item['slug']] = tail
+        counts[tail] = counts.get(tail, 0) + 1
+    return assignment
+
+
+def build_manifest_pages(sorted_items, sort_key, page_size=MANIFEST_PAGE_SIZE, previous_slots=None):
+    """Bangun halaman manifest dari item yang sudah di-sort newest-first.
+
+    previous_slots: isi slots.json run sebelumnya (None = susun dari nol).
+    Returns: (pages, head, slots) dengan pages = {path: [item, ...]}.
+    """
+    assignment = assign_pages(sorted_items, sort_key, page_size, previous_slots)
+    by_page = {}
+    placed = set()
+    for item in sorted_items:  # newest-first di dalam halaman
+        if item['slug'] in placed:
+            continue
+        placed.add(item['slug'])
+        by_page.setdefault(assignment[item['slug']], []).append(item)
+
+    pages = {}
+    head_pages = []
+    for number in sorted(by_page):
+        items = by_page[number]
+        path = _page_path(number)
+        pages[path] = items
+        head_pages.append({
+            'page': number,
+            'path': path,
+            'count': len(items),
+            'sha256': page_hash(items),
+            'newest': sort_key(items[0]),
+            'oldest': sort_key(items[-1]),
+        })
+
+    head = {
+        'total': sum(len(items) for items in pages.values()),
+        'page_size': page_size,
+        'total_pages': len(head_pages),
+        'generated_at': datetime.now().strftime('%Y-%m-%dT%H:%M:%S+07:00'),
+        'pages': head_pages,
+    }
+    slots = {
+        item['slug']: [assignment[item['slug']], sort_key(item)]
+        for items in pages.values() for item in items
+    }
+    return pages, head, slots
+
+
+def changed_page_paths(head, previous_head):
+    """Path halaman yang hash-nya berbeda dari head sebelumnya (atau baru)."""
+    previous = {}
+    if isinstance(previous_head, dict):
+        previous = {p.get('path'): p.get('sha256') for p in previous_head.get('pages', [])}
+    return [p['path'] for p in head['pages'] if previous.get(p['path']) != p['sha256']]
@@ -0,0 +1,109 @@
+"""
+NEGATIVE CACHE
+==============
+Ingat URL yang hasilnya "kosong" supaya tidak di-fetch + parse ulang setiap
+run: chapter tanpa gambar (terkunci / belum diunggah) dan komik yang halaman
+detailnya mati.
+
+State per URL (STATE_DIR/negative_cache.json):
+    {url: {'reason', 'failures', 'first_seen', 'last_checked', 'next_check', 'comic_url'}}
+
+Interval cek ulang naik eksponensial per kegagalan berturut-turut
+(base, 2x base, 4x base, ... maks max_interval). URL yang berhasil lagi
+dihapus dari cache lewat clear().
+
+Selama komik masih punya chapter di cache, fingerprint/lastmod komik itu tidak
+boleh dianggap "tidak berubah" melewati next_check terdekat (next_check_for()),
+supaya chapter tersebut benar-benar dicek ulang sesuai interval.
+"""
+
+from datetime import datetime, timedelta
+
+from state_store import JsonStateStore
+
+# Kode alasan
+NO_IMAGES = 'no_images'  # Halaman chapter ter-parse tapi tidak ada gambar
+NOT_FOUND = 'not_found'  # Halaman detail 404/410
+DETAIL_FAILED = 'detail_failed'  # Detail gagal terus sampai budget attempt frontier habis
+
+_TIME_FORMAT = '%Y-%m-%dT%H:%M:%S'
+
+
+class NegativeCache(JsonStateStore):
+    """Negative cache per URL dengan interval cek ulang eksponensial."""
+
+    def __init__(self, path, base_interval=timedelta(hours=24), max_interval=timedelta(days=30)):
+        super().__init__(path)
+        self.base_interval = base_interval
+        self.max_interval = max_interval
+        self.skipped = {}  # reason -> jumlah URL yang di-skip di run ini
+
+    def is_due(self, url, now=None):
+        """True jika URL tidak ada di cache atau sudah waktunya dicek ulang."""
+        entry = self.get(url)
+        if not entry:
+            return True
+        try:
+            return (now or datetime.now()) >= datetime.strptime(entry['next_check'], _TIME_FORMAT)
+        except (KeyError, ValueError):
+            return True
+
+    def skip(self, url):
+        """is_due() versi scan: False (dan dihitung sebagai skip) jika belum waktunya."""
+        if self.is_due(url):
+            return False
+        reason = self.get(url, {}).get('reason', 'unknown')
+        with self._lock:
+            self.skipped[reason] = self.skipped.get(reason, 0) + 1
+        return True
+
+    def record(self, url, reason, now=None, comic_url=None):
+        """Catat hasil negatif; cek ulang berikutnya setelah base * 2^(failures-1).
+        comic_url: komik induk (untuk chapter), dipakai next_check_for()."""
+        now = now or datetime.now()
+        entry = self.get(url) or {'first_seen': now.strftime(_TIME_FORMAT), 'failures': 0}
+        failures = entry.get('failures', 0) + 1
+        interval = min(self.base_interval * (2 ** (failures - 1)), self.max_interval)
+        self.put(url, {
+            'reason': reason,
+            'failures': failures,
+            'first_seen': entry.get('first_seen', now.strftime(_TIME_FORMAT)),
+            'last_checked': now.strftime(_TIME_FORMAT),
+            'next_check': (now + interval).strftime(_TIME_FORMAT),
+            'comic_url': comic_url or entry.get('comic_url'),
+        })
+        return interval
+
+    def next_check_for(self, urls=(), comic_url=None, now=None):
+        """next_check terdekat (datetime) dari entry yang belum jatuh tempo untuk URL di
+        `urls` atau milik `comic_url`. None jika tidak ada yang tertunda."""
+        now = now or datetime.now()
+        urls = set(urls)
+        earliest = None
+        for url, entry in self.items():
+            if url not in urls and not (comic_url and entry.get('comic_url') == comic_url):
+                continue
+            try:
+                next_check = datetime.strptime(entry['next_check'], _TIME_FORMAT)
+            except (KeyError, ValueError):
+                continue
+            if next_check > now and (earliest is None or next_check < earliest):
+                earliest = next_check
+        return earliest
+
+    def clear(self, url):
+        """URL berhasil lagi: hapus dari cache."""
+        return self.pop(url) is not None
+
+    def summary(self, now=None):
+        """{'total', 'due', 'by_reason': {reason: jumlah}, 'skipped': {reason: jumlah}} untuk laporan run."""
+        by_reason = {}
+        due = 0
+        for url, entry in self.items():
+            reason = entry.get('reason', 'unknown')
+            by_reason[reason] = by_reason.get(reason, 0) + 1
+            if self.is_due(url, now):
+                due += 1
+        with self._lock:
+            skipped = dict(self.skipped)
+        return {'total': len(self), 'due': due, 'by_reason': by_reason, 'skipped': skipped}
@@ -0,0 +1,218 @@
+"""
+HTML PARSERS
+============
+Fungsi parse murni (HTML -> dict) untuk halaman komikindo.ch.
+
+Fungsi di sini tidak melakukan request dan tidak print, sehingga bisa
+dijalankan di ProcessPoolExecutor (parse worker terpisah dari I/O thread,
+lepas dari GIL) dan hasilnya berupa dict biasa yang bisa di-pickle.
+"""
+
+import re
+from datetime import datetime, timedelta
+
+from bs4 import BeautifulSoup
+
+
+def _decode(html, encoding=None):
+    """Raw bytes dari I/O worker -> str. String dibiarkan apa adanya."""
+    if isinstance(html, bytes):
+        return html.decode(encoding or 'utf-8', errors='replace')
+    return html
+
+
+def convert_relative_time_to_iso(relative_time_str):
+    """
+    Konversi string waktu relatif (e.g., '7 years ago', '2 days ago')
+    menjadi ISO 8601 timestamp (e.g., '2018-11-09T10:30:00')
+    """
+    if not relative_time_str or relative_time_str == 'N/A':
+        # Jika tidak ada waktu, gunakan waktu sekarang
+        return datetime.now().strftime('%Y-%m-%dT%H:%M:%S')
+
+    # Parse string relatif
+    match = re.search(r'(\d+)\s+(year|month|week|day|hour|minute)s?\s+ago', relative_time_str, re.IGNORECASE)
+
+    if not match:
+        # Jika format tidak dikenali, gunakan waktu sekarang
+        return datetime.now().strftime('%Y-%m-%dT%H:%M:%S')
+
+    amount = int(match.group(1))
+    unit = match.group(2).lower()
+
+    now = datetime.now()
+
+    # Hitung waktu berdasarkan unit
+    if unit == 'year':
+        target_time = now - timedelta(days=amount * 365)
+    elif unit == 'month':
+        target_time = now - timedelta(days=amount * 30)
+    elif unit == 'week':
+        target_time = now - timedelta(weeks=amount)
+    elif unit == 'day':
+        target_time = now - timedelta(days=amount)
+    elif unit == 'hour':
+        target_time = now - timedelta(hours=amount)
+    elif unit == 'minute':
+        target_time = now - timedelta(minutes=amount)
+    else:
+        target_time = now
+
+    # Return dalam format ISO 8601
+    return target_time.strftime('%Y-%m-%dT%H:%M:%S')
+
+
+def parse_comic_details_html(html, encoding=None):
+    """Parse halaman detail komik (komikindo.ch structure) menjadi dict.
+    Returns: dict {title, genres, synopsis, metadata, cover_url, chapters}"""
+    soup = BeautifulSoup(_decode(html, encoding), 'html.parser')
+
+    # Ambil informasi dasar - h1.entry-title (komikindo.ch)
+    title_element = soup.find('h1', class_='entry-title')
+    title = title_element.get_text(strip=True) if title_element else 'Unknown'
+    # Remove "Komik " prefix
+    title = re.sub(r'^Komik\s*', '', title).strip()
+
+    # Ambil genre - div.genre-info a (komikindo.ch)
+    genres = []
+    genre_info = soup.find('div', class_='genre-info')
+    if genre_info:
+        genre_links = genre_info.find_all('a')
+        genres = [a.get_text(strip=True) for a in genre_links]
+
+    # Ambil synopsis - div.entry-content-sinopsis atau p di entry-content (komikindo.ch)
+    synopsis = ''
+    # Try specific synopsis div first
+    sinopsis_div = soup.select_one('.entry-content-sinopsis, .entry-content .sinopsis')
+    if sinopsis_div:
+        synopsis = sinopsis_div.get_text(strip=True)
+    else:
+        # Fallback: get all p elements and find the one with actual content
+        synopsis_element = soup.select_one('.entry-content')
+        if synopsis_element:
+            # Get all paragraphs
+            paragraphs = synopsis_element.find_all('p')
+            for p in paragraphs:
+                text = p.get_text(strip=True)
+                # Skip short text or text that starts with "Manhwa" or contains boilerplate
+                if len(text) > 50 and 'yang dibuat oleh komikus' not in text:
+                    synopsis = text
+                    break
+            # If still no good synopsis, get the first p with substantial content
+            if not synopsis and paragraphs:
+                for p in paragraphs:
+                    text = p.get_text(strip=True)
+                    if len(text) > 20:
+                        synopsis = text
+                        break
+
+    # Clean up synopsis
+    if synopsis:
+        # Remove "Manhwa/Manhua/Manga X yang dibuat oleh komikus bernama Y ini bercerita tentang" prefix
+        synopsis = re.sub(
+            r'^(Manhwa|Manhua|Manga)\s+[^.]+yang dibuat oleh[^.]+bercerita tentang\s*',
+            '', synopsis, flags=re.IGNORECASE | re.DOTALL
+        )
+        # Also try simpler pattern if above didn't work
+        synopsis = re.sub(
+            r'^.*?bercerita tentang\s*',
+            '', synopsis, flags=re.IGNORECASE | re.DOTALL
+        )
+        # Normalize whitespace (remove excessive spaces/newlines)
+        synopsis = re.sub(r'\s+', ' ', synopsis).strip()
+        # Remove leading quotes if any
+        synopsis = synopsis.strip('"').strip()
+
+    # Ambil metadata dari div.spe (komikindo.ch)
+    metadata = {}
+    spe = soup.find('div', class_='spe')
+    if spe:
+        spans = spe.find_all('span')
+        for span in spans:
+            text = span.get_text(strip=True)
+            if 'Status:' in text:
+                metadata['Status'] = text.replace('Status:', '').strip()
+            if 'Jenis Komik:' in text:
+                type_link = span.find('a')
+                if type_link:
+                    metadata['Type'] = type_link.get_text(strip=True)
+            if 'Pengarang:' in text:
+                metadata['Author'] = text.replace('Pengarang:', '').strip()
+            if 'Ilustrator:' in text:
+                metadata['Ilustrator'] = text.replace('Ilustrator:', '').strip()
+
+    # Ambil cover URL - div.thumb img (komikindo.ch)
+    cover_element = soup.select_one('.thumb img')
+    cover_url = None
+    if cover_element:
+        cover_url = cover_element.get('src') or cover_element.get('data-src')
+
+    # Ambil daftar chapter - div#chapter_list (komikindo.ch)
+    chapter_list = []
+    chapter_container = soup.find('div', id='chapter_list')
+    if chapter_container:
+        ul = chapter_container.find('ul')
+        if ul:
+            lis = ul.find_all('li')
+            for li in lis:
+                try:
+                    lchx = li.find('span', class_='lchx')
+                    if lchx:
+                        a = lchx.find('a')
+                        if a:
+                            chapter_text = a.get_text(strip=True)
+                            chapter_text = re.sub(r'\s+', ' ', chapter_text).strip()
+                            chapter_link = a.get('href', '')
+
+                            # Release date
+                            dt = li.find('span', class_='dt')
+                            waktu_rilis = dt.get_text(strip=True) if dt else 'N/A'
+                            waktu_rilis_iso = convert_relative_time_to_iso(waktu_rilis)
+
+                            chapter_list.append({
+                                'chapter': chapter_text,
+                                'link': chapter_link,
+                                'waktu_rilis': waktu_rilis_iso
+                            })
+                except:
+                    pass
+
+    return {
+        'title': title,
+        'genres': genres,
+        'synopsis': synopsis,
+        'metadata': metadata,
+        'cover_url': cover_url,
+        'chapters': chapter_list
+    }
+
+
+def parse_chapter_images_html(html, encoding=None):
+    """Parse halaman chapter, cari link gambar dengan beberapa selector.
+    Returns: dict {'images': [...], 'selector': selector yang cocok atau None}"""
+    soup = BeautifulSoup(_decode(html, encoding), 'html.parser')
+
+    image_urls = []
+    found_selector = None
+
+    # Try multiple selectors in order of priority
+    selectors = [
+        '#chimg-auh img',          # komikindo.ch structure
+        '.chapter-image img',       # Alternative komikindo structure
+        '#Baca_Komik img',          # Alternative ID
+        '.img-landmine img',        # Parent container
+        '.main-reading-area img',   # komikcast structure
+    ]
+
+    for selector in selectors:
+        images = soup.select(selector)
+        if images:
+            for img in images:
+                image_url = img.get('src')
+                if image_url and image_url.strip().startswith('http'):
+                    image_urls.append(image_url)
+            if image_urls:
+                found_selector = selector
+                break
+
+    return {'images': image_urls, 'selector': found_selector}
@@ -0,0 +1,54 @@
+"""
+RETRY POLICY
+============
+Retry tanpa sleep di worker thread. Fungsi attempt me-raise RetryLater jika
+gagal tapi boleh dicoba lagi; work_executor.SharedWorkExecutor memasukkan
+task ke delay queue (heap berdasarkan due time) dengan backoff eksponensial
++ jitter dari RetryPolicy, dan worker langsung mengambil URL lain selama
+menunggu.
+
+Budget attempt per task disimpan di executor (RetryPolicy.max_attempts),
+bukan di loop masing-masing fungsi fetch.
+
+Untuk pagination berurutan (halaman berikutnya baru diketahui setelah
+halaman ini selesai), call_with_retries memakai policy yang sama secara
+blocking di thread pemanggil.
+"""
+
+import random
+import time
+
+
+class RetryLater(Exception):
+    """Attempt gagal, coba lagi nanti. base_delay = backoff dasar (detik) untuk jenis error ini."""
+
+    def __init__(self, cause, base_delay=1.0):
+        super().__init__(str(cause))
+        self.cause = cause
+        self.base_delay = base_delay
+
+
+class RetryPolicy:
+    """Budget attempt + backoff eksponensial dengan jitter: uniform(b*2^k, 2*b*2^k), maks max_delay."""
+
+    def __init__(self, max_attempts=3, max_delay=60.0):
+        self.max_attempts = max(1, max_attempts)
+        self.max_delay = max_delay
+
+    def delay(self, attempt, base_delay):
+        """Delay sebelum attempt berikutnya, setelah `attempt` (1-based) gagal."""
+        low = base_delay * (2 ** (attempt - 1))
+        return min(self.max_delay, random.uniform(low, 2 * low))
+
+
+def call_with_retries(fn, policy):
+    """Jalankan fn() dengan retry blocking (untuk caller tunggal yang harus menunggu)."""
+    attempt = 0
+    while True:
+        attempt += 1
+        try:
+            return fn()
+        except RetryLater as e:
+            if attempt >= policy.max_attempts:
+                raise e.cause
+            time.sleep(policy.delay(attempt, e.base_delay))
@@ -0,0 +1,160 @@
+"""
+RUN DEADLINE
+============
+Budget waktu per run untuk job dengan hard timeout (GitHub Actions).
+
+Scheduler bertanya ke RunDeadline sebelum memulai pekerjaan baru (admit):
+pekerjaan hanya dimulai jika perkiraan selesainya (biaya rata-rata terukur
+per jenis pekerjaan, EWMA) + reserve untuk flush masih di dalam budget.
+Pekerjaan yang sudah berjalan tidak pernah dibatalkan (drain), sehingga
+upload, output lokal dan checkpoint tetap konsisten.
+
+Yang ditunda dicatat lewat defer() dan disimpan ke DeferredStore supaya
+run berikutnya bisa mendahulukannya.
+"""
+
+import argparse
+import signal
+import threading
+import time
+from datetime import datetime
+
+from state_store import JsonStateStore
+
+
+def parse_duration(value):
+    """'90' / '90s' / '45m' / '5h' -> detik (int)."""
+    units = {'s': 1, 'm': 60, 'h': 3600}
+    value = value.strip().lower()
+    try:
+        if value and value[-1] in units:
+            return int(float(value[:-1]) * units[value[-1]])
+        return int(float(value))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Durasi tidak valid: {value!r} (contoh: 90s, 45m, 5h)")
+
+
+class RunDeadline:
+    """Deadline run + estimasi biaya per jenis pekerjaan ('scan', 'comic', ...).
+
+    budget_seconds=None berarti tanpa batas (admit selalu True kecuali stop()).
+    priors: estimasi awal per jenis sebelum ada pengukuran.
+    """
+
+    def __init__(self, budget_seconds=None, reserve_seconds=0, priors=None, alpha=0.3):
+        self.budget_seconds = budget_seconds
+        self.reserve_seconds = reserve_seconds
+        self.alpha = alpha
+        self._estimates = dict(priors or {})
+        self._samples = {}
+        self._lock = threading.Lock()
+        self._stopped = None
+        self.deferred = []
+        self.started_at = time.monotonic()
+
+    def start(self):
+        self.started_at = time.monotonic()
+
+    def elapsed(self):
+        return time.monotonic() - self.started_at
+
+    def remaining(self):
+        if self.budget_seconds is None:
+            return None
+        return self.budget_seconds - self.elapsed()
+
+    @property
+    def stopped(self):
+        return self._stopped
+
+    def stop(self, reason):
+        """Hentikan admission pekerjaan baru (mis. karena SIGTERM)."""
+        with self._lock:
+            if self._stopped is None:
+                self._stopped = reason
+
+    def record(self, kind, seconds):
+        """Catat durasi aktual satu pekerjaan (EWMA per jenis)."""
+        with self._lock:
+            count = self._samples.get(kind, 0)
+            previous = self._estimates.get(kind)
+            if count == 0 or previous is None:
+                self._estimates[kind] = seconds
+            else:
+                self._estimates[kind] = self.alpha * seconds + (1 - self.alpha) * previous
+            self._samples[kind] = count + 1
+
+    def track(self, kind):
+        """Context manager: ukur durasi blok lalu record(kind, durasi)."""
+        return _Tracker(self, kind)
+
+    def estimate(self, kind):
+        with self._lock:
+            return self._estimates.get(kind, 0.0)
+
+    def admit(self, kind, pending_seconds=0.0):
+        """True jika satu pekerjaan `kind` lagi (+ pending_seconds yang sudah
+        dijanjikan) masih selesai sebelum budget - reserve."""
+        if self._stopped:
+            return False
+        if self.budget_seconds is None:
+            return True
+        projected = self.elapsed() + self.estimate(kind) + pending_seconds + self.reserve_seconds
+        return projected <= self.budget_seconds
+
+    def defer(self, key, title, stage, index=None):
+        with self._lock:
+            self.deferred.append({'key': key, 'title': title, 'stage': stage, 'index': index})
+
+    def install_signal_handlers(self):
+        """SIGTERM/SIGINT pertama -> drain (stop admission); SIGINT kedua -> abort.
+        Hanya bisa dipanggil dari main thread."""
+        def handle(signum, frame):
+            if self._stopped and signum == signal.SIGINT:
+                raise KeyboardInterrupt
+            self.stop(signal.Signals(signum).name)
+            print(f"\n⏱️  {signal.Signals(signum).name} diterima: menyelesaikan pekerjaan yang berjalan lalu berhenti")
+
+        for signum in (signal.SIGTERM, signal.SIGINT):
+            try:
+                signal.signal(signum, handle)
+            except (ValueError, OSError):
+                pass
+
+    def summary(self):
+        with self._lock:
+            estimates = {kind: round(value, 1) for kind, value in self._estimates.items()
+                         if self._samples.get(kind)}
+        return {
+            'elapsed_seconds': round(self.elapsed(), 1),
+            'budget_seconds': self.budget_seconds,
+            'stopped': self._stopped,
+            'estimates': estimates,
+            'deferred': len(self.deferred),
+        }
+
+
+class _Tracker:
+    def __init__(self, deadline, kind):
+        self._deadline = deadline
+        self._kind = kind
+
+    def __enter__(self):
+        self._started = time.monotonic()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._deadline.record(self._kind, time.monotonic() - self._started)
+        return False
+
+
+class DeferredStore(JsonStateStore):
+    """Komik yang ditunda run sebelumnya: {key: {'title', 'stage', 'deferred_at'}}."""
+
+    def replace(self, deferred):
+        with self._lock:
+            now = datetime.now().strftime('%Y-%m-%dT%H:%M:%S')
+            self._data = {
+                item['key']: {'title': item['title'], 'stage': item['stage'], 'deferred_at': now}
+                for item in deferred
+            }
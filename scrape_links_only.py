@@ -4,13 +4,14 @@ MANGA IMAGE LINKS SCRAPER + SUPABASE UPLOADER
 Script untuk scraping link gambar manga dari website dan upload ke Supabase Storage.
 
 FITUR PARALLEL PROCESSING:
-- Parallel chapter scraping: Scrape multiple chapters secara bersamaan (MAX_CHAPTER_WORKERS)
+- Parallel chapter scraping: Scrape multiple chapters secara bersamaan lewat satu executor
+  bersama untuk semua komik (MAX_CHAPTER_WORKERS = total chapter in-flight, bergiliran antar komik)
 - Parallel comic processing: Scrape multiple komik secara bersamaan (MAX_COMIC_WORKERS)
 - Thread-safe operations untuk menghindari race conditions
 - Dapat di-disable dengan set ENABLE_PARALLEL = False
 
 KONFIGURASI PARALLEL:
-- MAX_CHAPTER_WORKERS: Jumlah thread untuk scraping chapter (default: 5)
+- MAX_CHAPTER_WORKERS: Total thread scraping chapter untuk semua komik (default: 5)
 - MAX_COMIC_WORKERS: Jumlah thread untuk scraping komik (default: 2)
 - ENABLE_PARALLEL: Enable/disable parallel processing (default: True)
 
@@ -29,17 +30,40 @@ except ImportError:
     import cloudscraper  # fallback
 
 import requests
-from bs4 import BeautifulSoup
+import argparse
 import json
 import os
-import re
 import time
 import random
+import functools
 from datetime import datetime, timedelta
 from supabase import create_client, Client
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
 import threading
+import multiprocessing
 from dotenv import load_dotenv
+from http_pool import PooledHttpClient
+from chapter_diff import diff_chapter_lists, chapters_to_fetch, merge_chapter_lists
+from image_probe import ImageProbeCache, probe_images, find_broken_chapters
+from cover_thumbs import CoverHashStore, process_covers
+from shards import parse_shard, in_shard, shard_path
+from comics_registry import record_new_slugs
+from json_stream import write_json_stream, spooled_json
+from compact_records import ChapterRecord, compact_comic, json_default
+from fingerprints import FIRST_CHAPTER_END_RE, FingerprintStore, extract_fingerprint
+from parsers import convert_relative_time_to_iso, parse_comic_details_html, parse_chapter_images_html
+from run_budget import RunDeadline, DeferredStore, parse_duration
+from backfill import chapter_windows, run_interleaved
+from single_flight import SingleFlight
+from retry_scheduler import RetryLater, RetryPolicy
+from work_executor import SharedWorkExecutor
+from crawl_frontier import CrawlFrontier, PRIORITY_CARRIED, PRIORITY_DEFAULT
+from negative_cache import NegativeCache, NO_IMAGES, NOT_FOUND, DETAIL_FAILED
+from dead_letter import DeadLetterStore, COMIC, CHAPTER
+from sitemap_discovery import (SitemapStateStore, catalog_slug, clean_catalog_title, comic_slug_from_url,
+                               discover_comics, merge_catalog, normalize_lastmod)
+from wp_api import WpApi, WpApiUnavailable
+from slug_registry import SlugRegistry, sanitize_filename
 
 # Load environment variables from .env file
 load_dotenv()
@@ -56,25 +80,269 @@ JSON_FILE = 'komikindo_scrape_results.json'  # File JSON berisi daftar komik
 OUTPUT_FILE = 'manga_local_image_links.json'  # Output file lokal untuk link gambar
 MAX_COMICS_TO_PROCESS = 2000  # Jumlah komik yang akan diproses (testing synopsis)
 PROGRESS_FILE = 'scrape_links_progress.json'
+STATE_DIR = os.getenv('STATE_DIR', '.scrape_state')  # Folder state antar run (di-cache oleh workflow)
 
 
 # Auto Update Mode (cek semua komik yang ada chapter baru)
 AUTO_UPDATE_MODE = True  # Set True untuk auto cek semua komik (disabled for testing)
 AUTO_UPDATE_MAX_COMICS = 2000  # Max komik yang di-cek per run (untuk avoid timeout)
 
+# Fingerprint (skip komik tanpa perubahan tanpa download halaman detail penuh)
+ENABLE_FINGERPRINT_SKIP = os.getenv('ENABLE_FINGERPRINT_SKIP', 'True').lower() == 'true'
+FINGERPRINT_MAX_AGE_DAYS = int(os.getenv('FINGERPRINT_MAX_AGE_DAYS', '7'))  # Full check periodik
+FINGERPRINT_MAX_BYTES = 262144  # Batas download awal halaman detail (256KB)
+FINGERPRINT_FILE = os.path.join(STATE_DIR, 'fingerprints.json')
+
 # Speed Configuration
 DELAY_BETWEEN_CHAPTERS = 0.5  # Delay antar chapter (detik) - Turunkan untuk lebih cepat
 DELAY_BETWEEN_COMICS = 1  # Delay antar komik (detik)
 REQUEST_TIMEOUT = 10  # Timeout untuk request (detik)
+RETRY_BASE_DELAY = 1.0  # Backoff dasar retry request biasa (detik, eksponensial + jitter)
+CF_RETRY_BASE_DELAY = 3.0  # Backoff dasar retry cloudscraper (3-6s, 6-12s, ...)
+RETRY_MAX_DELAY = 60.0  # Batas backoff per retry
 
 # Parallel Processing Configuration
-MAX_CHAPTER_WORKERS = 5  # Jumlah thread untuk scraping chapter secara parallel
+MAX_CHAPTER_WORKERS = 5  # Total chapter in-flight untuk semua komik (executor bersama)
 MAX_COMIC_WORKERS = 2  # Jumlah thread untuk scraping komik secara parallel
 ENABLE_PARALLEL = True  # Set False untuk disable parallel processing
 
+# Parse Worker Configuration (BeautifulSoup di process pool, lepas dari GIL)
+PARSE_WORKERS = int(os.getenv('PARSE_WORKERS', os.cpu_count() or 1))  # 1 = parse di thread I/O
+
+# HTTP Connection Pool Configuration
+HTTP_POOL_SIZE_PER_HOST = int(os.getenv('HTTP_POOL_SIZE_PER_HOST', MAX_CHAPTER_WORKERS))  # Koneksi per host
+ENABLE_HTTP2 = True  # HTTP/2 multiplexing via curl_cffi (fallback ke requests.Session)
+REQUEST_RATE_LIMIT = float(os.getenv('REQUEST_RATE_LIMIT', '0'))  # Maks request/detik per host (0 = tanpa batas)
+REQUEST_MEMO_MAX_ENTRIES = int(os.getenv('REQUEST_MEMO_MAX_ENTRIES', '4096'))  # Halaman yang di-memo per run
+REQUEST_MEMO_MAX_MB = int(os.getenv('REQUEST_MEMO_MAX_MB', '128'))  # Batas memori memo (body terkompres)
+
+# Sitemap Discovery: katalog + deteksi perubahan dari lastmod XML sitemap (auto update mode)
+ENABLE_SITEMAP_DISCOVERY = os.getenv('ENABLE_SITEMAP_DISCOVERY', 'False').lower() == 'true'
+SITEMAP_BASE_URL = 'https://komikindo.ch/'
+SITEMAP_CATALOG_TYPES = tuple(os.getenv('SITEMAP_CATALOG_TYPES', 'Manhwa').split(','))  # Tipe komik yang masuk katalog
+SITEMAP_MAX_NEW_PER_RUN = int(os.getenv('SITEMAP_MAX_NEW_PER_RUN', '200'))  # Komik baru yang di-resolve per run
+SITEMAP_STATE_FILE = os.path.join(STATE_DIR, 'sitemap_lastmod.json')
+ENABLE_WP_API = os.getenv('ENABLE_WP_API', 'True').lower() == 'true'  # Coba wp-json dulu (fallback ke sitemap XML)
+
+# Deadline: komik baru tidak dimulai jika perkiraan selesainya melewati budget
+TIME_BUDGET_SECONDS = None  # None = tanpa batas (bisa di-set via --deadline)
+DRAIN_RESERVE_SECONDS = 300  # Waktu yang disisakan untuk drain + flush upload/output/checkpoint
+DEFAULT_COMIC_COST_SECONDS = 60  # Estimasi awal proses satu komik sebelum ada pengukuran
+DEFERRED_FILE = os.path.join(STATE_DIR, 'deferred.json')  # Komik yang ditunda ke run berikutnya
+
+# Crawl Frontier: antrian scan/proses persisten (auto update mode), run berikutnya lanjut dari titik berhenti
+FRONTIER_FILE = os.path.join(STATE_DIR, 'frontier.sqlite3')
+FRONTIER_CYCLE_HOURS = float(os.getenv('FRONTIER_CYCLE_HOURS', '20'))  # Umur siklus sebelum semua komik dicek ulang
+FRONTIER_RETRY_BASE_SECONDS = 600  # Backoff item gagal antar run (10m, 20m, ...)
+FRONTIER_MAX_ATTEMPTS = 3  # Attempt per item per siklus sebelum ditandai failed
+
+# Negative Cache: chapter tanpa gambar + komik mati tidak dicek ulang sampai jatuh tempo
+NEGATIVE_CACHE_FILE = os.path.join(STATE_DIR, 'negative_cache.json')
+NEGATIVE_RECHECK_BASE_HOURS = float(os.getenv('NEGATIVE_RECHECK_BASE_HOURS', '24'))  # Interval cek ulang pertama
+NEGATIVE_RECHECK_MAX_DAYS = float(os.getenv('NEGATIVE_RECHECK_MAX_DAYS', '30'))  # Batas interval (naik 2x per gagal)
+
+# Dead-letter: komik/chapter yang gagal dicatat untuk mode repair (hanya item dead-letter yang diproses)
+DEAD_LETTER_FILE = os.path.join(STATE_DIR, 'dead_letters.json')
+CHAPTER_MAX_ATTEMPTS = 3  # Attempt per chapter di executor (backoff + jitter)
+REPAIR_CHAPTER_WORKERS = int(os.getenv('REPAIR_CHAPTER_WORKERS', '3'))  # Lebih rendah: kegagalan umumnya CF karena burst
+REPAIR_COMIC_WORKERS = int(os.getenv('REPAIR_COMIC_WORKERS', '1'))
+REPAIR_MAX_ATTEMPTS = int(os.getenv('REPAIR_MAX_ATTEMPTS', '5'))  # Budget attempt per chapter di mode repair
+
+# Slug registry: ID/slug URL, slug listing dan slug judul -> satu folder storage (judul berubah tidak membuat folder baru)
+SLUG_REGISTRY_FILE = os.path.join(STATE_DIR, 'slug_registry.json')
+
+# Backfill Configuration: chapter diproses per window, komik dijalankan bergiliran per window
+BACKFILL_MODE = os.getenv('BACKFILL_MODE', 'False').lower() == 'true'
+BACKFILL_WINDOW_SIZE = int(os.getenv('BACKFILL_WINDOW_SIZE', '50'))  # Chapter per window (upload per window)
+BACKFILL_ACTIVE_COMICS = int(os.getenv('BACKFILL_ACTIVE_COMICS', '4'))  # Komik aktif yang bergiliran
+
+# Image Probe Configuration (verifikasi link gambar tanpa download)
+ENABLE_IMAGE_PROBE = os.getenv('ENABLE_IMAGE_PROBE', 'False').lower() == 'true'
+IMAGE_PROBE_WORKERS = int(os.getenv('IMAGE_PROBE_WORKERS', '8'))  # Jumlah HEAD request concurrent
+IMAGE_PROBE_CACHE_FILE = os.path.join(STATE_DIR, 'image_probe_cache.json')
+
+# Cover Thumbnail Configuration (WebP thumbnail di {slug}/cover-*.webp)
+ENABLE_COVER_THUMBS = os.getenv('ENABLE_COVER_THUMBS', 'True').lower() == 'true'
+COVER_THUMB_PROCESSES = int(os.getenv('COVER_THUMB_PROCESSES', '0')) or None  # 0 = semua core
+COVER_HASH_FILE = os.path.join(STATE_DIR, 'cover_hashes.json')
+COVER_RECHECK_DAYS = int(os.getenv('COVER_RECHECK_DAYS', '7'))  # Cover tanpa ETag/Last-Modified di-hash ulang setiap N hari
+
 # Thread-local storage for per-thread scraper sessions
 _thread_local = threading.local()
 
+# Client HTTP bersama untuk semua worker (keep-alive + HTTP/2)
+_http_client = None
+_http_client_lock = threading.Lock()
+
+def get_http_client():
+    """Ambil PooledHttpClient bersama (dibuat sekali, dipakai semua thread)."""
+    global _http_client
+    if _http_client is None:
+        with _http_client_lock:
+            if _http_client is None:
+                _http_client = PooledHttpClient(
+                    pool_size_per_host=HTTP_POOL_SIZE_PER_HOST,
+                    http2=ENABLE_HTTP2,
+                    rate_limit=REQUEST_RATE_LIMIT
+                )
+    return _http_client
+
+# Process pool untuk parse HTML: I/O thread fetch bytes, parse worker mengembalikan dict
+_parse_pool = None
+_parse_pool_lock = threading.Lock()
+
+def get_parse_pool():
+    """Ambil ProcessPoolExecutor bersama untuk parsing (None jika PARSE_WORKERS <= 1)."""
+    global _parse_pool
+    if PARSE_WORKERS <= 1:
+        return None
+    if _parse_pool is None:
+        with _parse_pool_lock:
+            if _parse_pool is None:
+                # spawn: aman dibuat dari dalam worker thread (fork + thread bisa deadlock)
+                _parse_pool = ProcessPoolExecutor(
+                    max_workers=PARSE_WORKERS,
+                    mp_context=multiprocessing.get_context('spawn')
+                )
+    return _parse_pool
+
+def run_parser(parser_fn, html, encoding=None):
+    """Jalankan fungsi parse di process pool (fallback ke thread ini jika pool tidak tersedia)."""
+    pool = get_parse_pool()
+    if pool is None:
+        return parser_fn(html, encoding)
+    return pool.submit(parser_fn, html, encoding).result()
+
+def shutdown_parse_pool():
+    global _parse_pool
+    if _parse_pool is not None:
+        _parse_pool.shutdown(wait=True)
+        _parse_pool = None
+
+# Executor bersama untuk task chapter dari semua komik (satu batas in-flight global)
+_work_executor = None
+_work_executor_lock = threading.Lock()
+
+def get_work_executor():
+    """Ambil SharedWorkExecutor bersama (dibuat sekali, dipakai semua koordinator komik)."""
+    global _work_executor
+    if _work_executor is None:
+        with _work_executor_lock:
+            if _work_executor is None:
+                _work_executor = SharedWorkExecutor(
+                    max_workers=MAX_CHAPTER_WORKERS if ENABLE_PARALLEL else 1,
+                    policy=RetryPolicy(max_attempts=CHAPTER_MAX_ATTEMPTS, max_delay=RETRY_MAX_DELAY)
+                )
+    return _work_executor
+
+def shutdown_work_executor():
+    global _work_executor
+    if _work_executor is not None:
+        _work_executor.shutdown(wait=True)
+        _work_executor = None
+
+# Deadline run ini (di-set ulang di main)
+_deadline = RunDeadline()
+
+# Slug komik yang folder-nya baru dibuat di run ini (untuk registry comics-list)
+_new_comic_slugs = set()
+_new_comic_slugs_lock = threading.Lock()
+
+_image_probe_cache = None
+
+def get_image_probe_cache():
+    """Cache hasil probe gambar (dimuat sekali per run)."""
+    global _image_probe_cache
+    if _image_probe_cache is None:
+        _image_probe_cache = ImageProbeCache(IMAGE_PROBE_CACHE_FILE)
+    return _image_probe_cache
+
+_slug_registry = None
+_slug_registry_lock = threading.Lock()
+
+def get_slug_registry():
+    """Registry alias slug -> folder kanonik (dimuat sekali per run)."""
+    global _slug_registry
+    if _slug_registry is None:
+        with _slug_registry_lock:
+            if _slug_registry is None:
+                _slug_registry = SlugRegistry(SLUG_REGISTRY_FILE)
+    return _slug_registry
+
+def comic_folder(comic):
+    """Folder storage (key kanonik) untuk entry listing; komik baru memakai slug judulnya."""
+    return get_slug_registry().canonical(comic.get('Link'), comic.get('Slug'), comic.get('Title', ''))
+
+_negative_cache = None
+_negative_cache_lock = threading.Lock()
+
+def get_negative_cache():
+    """Negative cache chapter kosong / komik mati (dimuat sekali per run)."""
+    global _negative_cache
+    if _negative_cache is None:
+        with _negative_cache_lock:
+            if _negative_cache is None:
+                _negative_cache = NegativeCache(
+                    NEGATIVE_CACHE_FILE,
+                    base_interval=timedelta(hours=NEGATIVE_RECHECK_BASE_HOURS),
+                    max_interval=timedelta(days=NEGATIVE_RECHECK_MAX_DAYS)
+                )
+    return _negative_cache
+
+_dead_letters = None
+_dead_letters_lock = threading.Lock()
+
+def get_dead_letters():
+    """Dead-letter store komik/chapter gagal (dimuat sekali per run)."""
+    global _dead_letters
+    if _dead_letters is None:
+        with _dead_letters_lock:
+            if _dead_letters is None:
+                _dead_letters = DeadLetterStore(DEAD_LETTER_FILE)
+    return _dead_letters
+
+def take_fetch_error():
+    """Exception fetch terakhir di thread ini (None jika fetch terakhir berhasil), lalu reset."""
+    error = getattr(_thread_local, 'fetch_error', None)
+    _thread_local.fetch_error = None
+    return error
+
+def http_status(error):
+    """Status HTTP dari exception request (None jika bukan error HTTP)."""
+    return getattr(getattr(error, 'response', None), 'status_code', None)
+
+_request_flight = None
+_request_flight_lock = threading.Lock()
+
+def get_request_flight():
+    """Single-flight + memo halaman untuk safe_get (dibuat sekali, dipakai semua thread)."""
+    global _request_flight
+    if _request_flight is None:
+        with _request_flight_lock:
+            if _request_flight is None:
+                _request_flight = SingleFlight(
+                    max_entries=REQUEST_MEMO_MAX_ENTRIES,
+                    max_bytes=REQUEST_MEMO_MAX_MB * 1024 * 1024
+                )
+    return _request_flight
+
+def print_http_pool_stats():
+    """Tampilkan statistik reuse koneksi dari pool HTTP bersama."""
+    if _http_client is not None:
+        for host, st in _http_client.stats().items():
+            print(f"🔌 {host}: {st['requests']} requests via {st['sessions_opened']} koneksi "
+                  f"(reuse {st['reuse_ratio']}x, error {st['errors']})")
+    if _work_executor is not None:
+        st = _work_executor.stats()
+        print(f"🧵 Executor chapter: {st['completed']}/{st['submitted']} task, maks {st['max_workers']} in-flight "
+              f"(puncak {st['peak_inflight']}, {st['peak_groups']} komik bersamaan), "
+              f"{st['retries']} retry dijadwalkan ulang, {st['exhausted']} habis budget")
+    if _request_flight is not None:
+        st = _request_flight.stats()
+        print(f"🧷 Fetch halaman: {st['calls']} panggilan -> {st['fetches']} request jaringan "
+              f"({st['coalesced']} digabung in-flight, {st['memo_hits']} dari memo, "
+              f"{st['memo_entries']} entry / {st['memo_bytes'] / 1024 / 1024:.1f} MB, {st['evictions']} evicted)")
+
 # Rotating user agents (sama seperti old.py untuk avoid 403)
 USER_AGENTS = [
     'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
@@ -139,78 +407,79 @@ def is_real_page(response):
     # Cek konten positif: ada elemen khas komikindo
     return 'chapter_list' in text or 'entry-title' in text or 'genre-info' in text
 
-def safe_get(url, timeout=None, max_retries=3):
-    """Hybrid request engine (seperti old.py + GitHub Actions support):
-    - Coba requests.get biasa dulu (cepat, seperti old.py)
-    - Jika kena 403 atau response bukan halaman asli, switch ke cloudscraper
+def safe_get(url, timeout=None, max_retries=3, memo=True, group=None):
+    """Fetch halaman lewat single-flight: request concurrent ke URL yang sama
+    digabung jadi satu, dan response sukses di-memo selama run (memo=False untuk
+    halaman yang memang hanya dibaca sekali, mis. halaman chapter).
+    Setiap attempt dijalankan executor bersama; attempt yang gagal masuk delay
+    queue-nya, jadi tidak ada thread yang tidur selama backoff. Thread pemanggil
+    hanya menunggu hasil akhir. group: antrian round-robin (default: url)."""
+    state = {}  # Status cloudscraper per URL, dibawa antar attempt
+
+    def attempt():
+        return get_request_flight().do(url, lambda: fetch_page_attempt(url, timeout, state), memo=memo)
+
+    return get_work_executor().call(group or url, attempt, max_attempts=max_retries)
+
+def fetch_page_attempt(url, timeout=None, state=None):
+    """Satu attempt hybrid request engine (seperti old.py + GitHub Actions support), tanpa sleep:
+    - Coba request biasa dulu lewat pool koneksi bersama (keep-alive + HTTP/2)
+    - Jika kena 403 atau response bukan halaman asli, langsung switch ke cloudscraper
     - Validasi setiap response: jika Cloudflare challenge terdeteksi, retry
-    - Cloudscraper retry dengan exponential backoff
+    - Gagal -> raise RetryLater; backoff + jitter dan budget attempt diatur scheduler
+    state: dict per URL yang dibawa antar attempt ('cloudscraper' sudah aktif?)
     """
     if timeout is None:
         timeout = REQUEST_TIMEOUT
+    if state is None:
+        state = {}
 
-    last_error = None
-    use_cloudscraper = False
-    cf_attempt = 0
-
-    attempts_left = max_retries
-
-    while attempts_left > 0:
+    while True:
+        use_cloudscraper = state.get('cloudscraper', False)
         try:
             if use_cloudscraper:
-                if cf_attempt > 0:
-                    # Backoff sebelum retry cloudscraper
-                    delay = random.uniform(3 * (2 ** (cf_attempt - 1)), 6 * (2 ** (cf_attempt - 1)))
-                    print(f"  Retry cloudscraper in {delay:.1f}s...")
-                    time.sleep(delay)
                 session = get_cf_session()
                 session.headers['Referer'] = 'https://komikindo.ch/'
                 response = session.get(url, timeout=timeout)
-                cf_attempt += 1
             else:
-                # Gunakan requests.get LANGSUNG seperti old.py (bukan Session)
-                response = requests.get(url, headers=get_plain_headers(), timeout=timeout)
+                # Pool koneksi bersama: reuse koneksi ke host yang sama antar chapter
+                response = get_http_client().get(url, headers=get_plain_headers(), timeout=timeout)
 
             response.raise_for_status()
 
             # Validasi response: apakah halaman asli atau Cloudflare challenge?
-            if not is_real_page(response):
-                print(f"  Cloudflare challenge terdeteksi (size={len(response.text)}B) - switching to cloudscraper...")
-                if not use_cloudscraper:
-                    use_cloudscraper = True
-                    # Jangan kurangi attempts, langsung retry dengan cloudscraper
-                    continue
-                else:
-                    # CF bypass juga gagal: reset session dan retry
-                    print(f"  CF bypass masih gagal - reset session...")
-                    _thread_local.cf_session = None
-                    attempts_left -= 1
-                    continue
+            if is_real_page(response):
+                return response  # sukses - halaman asli
 
-            return response  # sukses - halaman asli
+            print(f"  Cloudflare challenge terdeteksi (size={len(response.text)}B) - switching to cloudscraper...")
+            if not use_cloudscraper:
+                # Jangan hitung sebagai attempt, langsung retry dengan cloudscraper
+                state['cloudscraper'] = True
+                continue
+            # CF bypass juga gagal: reset session dan retry nanti
+            print(f"  CF bypass masih gagal - reset session...")
+            _thread_local.cf_session = None
+            raise RetryLater(Exception(f"Cloudflare challenge: {url}"), base_delay=CF_RETRY_BASE_DELAY)
 
         except requests.exceptions.HTTPError as e:
-            last_error = e
             status = getattr(e.response, 'status_code', None)
             if status == 403:
                 if not use_cloudscraper:
                     print(f"  403 Forbidden - switching to cloudscraper...")
-                    use_cloudscraper = True
-                    continue  # langsung retry, jangan kurangi attempts_left
-                else:
-                    print(f"  403 with CF bypass - resetting session...")
-                    _thread_local.cf_session = None
+                    state['cloudscraper'] = True
+                    continue  # langsung retry, bukan attempt baru
+                print(f"  403 with CF bypass - resetting session...")
+                _thread_local.cf_session = None
             elif status == 503:
                 print(f"  503 Service Unavailable")
             else:
                 print(f"  HTTP error: {e}")
+            raise RetryLater(e, base_delay=CF_RETRY_BASE_DELAY if use_cloudscraper else RETRY_BASE_DELAY)
+        except RetryLater:
+            raise
         except Exception as e:
-            last_error = e
             print(f"  Request error: {e}")
-
-        attempts_left -= 1
-
-    raise last_error or Exception(f"Failed to fetch {url} after {max_retries} attempts")
+            raise RetryLater(e, base_delay=CF_RETRY_BASE_DELAY if use_cloudscraper else RETRY_BASE_DELAY)
 
 # Legacy compatibility
 def get_headers():
@@ -228,61 +497,6 @@ def thread_safe_print(*args, **kwargs):
     with print_lock:
         print(*args, **kwargs)
 
-def convert_relative_time_to_iso(relative_time_str):
-    """
-    Konversi string waktu relatif (e.g., '7 years ago', '2 days ago')
-    menjadi ISO 8601 timestamp (e.g., '2018-11-09T10:30:00')
-    """
-    if not relative_time_str or relative_time_str == 'N/A':
-        # Jika tidak ada waktu, gunakan waktu sekarang
-        return datetime.now().strftime('%Y-%m-%dT%H:%M:%S')
-
-    # Parse string relatif
-    match = re.search(r'(\d+)\s+(year|month|week|day|hour|minute)s?\s+ago', relative_time_str, re.IGNORECASE)
-
-    if not match:
-        # Jika format tidak dikenali, gunakan waktu sekarang
-        return datetime.now().strftime('%Y-%m-%dT%H:%M:%S')
-
-    amount = int(match.group(1))
-    unit = match.group(2).lower()
-
-    now = datetime.now()
-
-    # Hitung waktu berdasarkan unit
-    if unit == 'year':
-        target_time = now - timedelta(days=amount * 365)
-    elif unit == 'month':
-        target_time = now - timedelta(days=amount * 30)
-    elif unit == 'week':
-        target_time = now - timedelta(weeks=amount)
-    elif unit == 'day':
-        target_time = now - timedelta(days=amount)
-    elif unit == 'hour':
-        target_time = now - timedelta(hours=amount)
-    elif unit == 'minute':
-        target_time = now - timedelta(minutes=amount)
-    else:
-        target_time = now
-
-    # Return dalam format ISO 8601
-    return target_time.strftime('%Y-%m-%dT%H:%M:%S')
-
-def sanitize_filename(name):
-    """Membersihkan nama file dari karakter tidak valid untuk Supabase Storage"""
-    # Hapus karakter tidak valid untuk filesystem dan Supabase
-    # Termasuk: \ / * ? : " < > | ' ` ! @ # $ % ^ & ( ) [ ] { } = + ~ ,
-    cleaned = re.sub(r'[\\/*?:"<>|\'`!@#$%^&()\[\]{}=+~,]', "", name)
-    # Hapus whitespace berlebih (spasi, tab, newline, dll)
-    cleaned = re.sub(r'\s+', ' ', cleaned)
-    # Ganti spasi dengan dash dan lowercase
-    cleaned = cleaned.strip().replace(' ', '-').lower()
-    # Hapus dash berlebih (jika ada)
-    cleaned = re.sub(r'-+', '-', cleaned)
-    # Hapus dash di awal dan akhir
-    cleaned = cleaned.strip('-')
-    return cleaned
-
 def load_progress():
     """Memuat progress scraping dari file"""
     if not os.path.exists(PROGRESS_FILE):
@@ -309,17 +523,16 @@ def save_progress(index, scraped_comics):
         }, f, indent=2, ensure_ascii=False)
 
 def save_output(data):
-    """Menyimpan hasil scraping ke file output"""
-    with open(OUTPUT_FILE, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    """Menyimpan hasil scraping ke file output (streaming per komik, ChapterRecord -> dict)"""
+    write_json_stream(OUTPUT_FILE, data, default=json_default)
 
 def load_output():
-    """Load existing output file"""
+    """Load existing output file (chapter disimpan sebagai ChapterRecord ringkas)"""
     if not os.path.exists(OUTPUT_FILE):
         return []
     try:
         with open(OUTPUT_FILE, 'r', encoding='utf-8') as f:
-            return json.load(f)
+            return [compact_comic(comic) for comic in json.load(f)]
     except:
         return []
 
@@ -335,30 +548,29 @@ def init_supabase():
         return None
 
 def upload_json_to_supabase(supabase, json_data, file_path):
-    """Upload JSON file ke Supabase Storage"""
+    """Upload JSON file ke Supabase Storage (di-spool ke file sementara, bukan string penuh)"""
     try:
-        json_bytes = json.dumps(json_data, ensure_ascii=False, indent=2).encode('utf-8')
-
-        # Try upload
-        try:
-            supabase.storage.from_(BUCKET_NAME).upload(
-                path=file_path,
-                file=json_bytes,
-                file_options={"content-type": "application/json"}
-            )
-            return True
-        except Exception as e:
-            # If exists, update
-            if 'already exists' in str(e).lower() or 'duplicate' in str(e).lower():
-                supabase.storage.from_(BUCKET_NAME).update(
+        with spooled_json(json_data) as json_file:
+            # Try upload
+            try:
+                supabase.storage.from_(BUCKET_NAME).upload(
                     path=file_path,
-                    file=json_bytes,
+                    file=json_file,
                     file_options={"content-type": "application/json"}
                 )
                 return True
-            else:
-                print(f"    ✗ Upload error: {e}")
-                return False
+            except Exception as e:
+                # If exists, update
+                if 'already exists' in str(e).lower() or 'duplicate' in str(e).lower():
+                    supabase.storage.from_(BUCKET_NAME).update(
+                        path=file_path,
+                        file=json_file,
+                        file_options={"content-type": "application/json"}
+                    )
+                    return True
+                else:
+                    print(f"    ✗ Upload error: {e}")
+                    return False
     except Exception as e:
         print(f"    ✗ Gagal upload {file_path}: {e}")
         return False
@@ -452,207 +664,181 @@ def is_comic_completed(supabase, comic_slug, total_chapters, status):
         return False
 
 def has_new_chapters(supabase, comic_url, comic_slug):
-    """Cek apakah komik memiliki chapter baru (untuk auto update mode)"""
+    """Cek apakah komik memiliki chapter baru/berubah (untuk auto update mode).
+    Returns: tuple (has_new, total_web, total_db, diff) - diff dari chapter_diff.diff_chapter_lists"""
     try:
-        # Scrape detail untuk dapat total chapters dari website
+        # Scrape detail untuk dapat daftar chapter dari website
         details = scrape_comic_details(comic_url)
         if not details:
             # Return -1, -1 untuk menandakan error (bukan 0 chapters)
-            return None, -1, -1
+            return None, -1, -1, None
 
         total_chapters_website = len(details['chapters'])
 
         # Get existing chapters dari Supabase
-        existing_chapters = get_existing_chapters(supabase, comic_slug)
-        total_chapters_supabase = len(existing_chapters)
+        existing_data = get_existing_chapters_full(supabase, comic_slug)
+        stored_chapters = existing_data.get('chapters', []) if existing_data else []
+        total_chapters_supabase = len(stored_chapters)
 
         # GUARD: Jika website mengembalikan 0 chapter tapi Supabase punya data,
         # ini kemungkinan besar adalah kegagalan scraping (Cloudflare, selector berubah, dll)
         # Jangan anggap sebagai "tidak ada chapter baru" — perlakukan sebagai error.
         if total_chapters_website == 0 and total_chapters_supabase > 0:
             print(f"\n    ⚠ Website mengembalikan 0 chapter (kemungkinan gagal scrape), skip...")
-            return None, -1, -1
+            return None, -1, -1, None
 
-        # Ada chapter baru jika total di website > total di Supabase
-        has_new = total_chapters_website > total_chapters_supabase
+        # Ada update jika ada chapter yang ditambah atau berubah (berdasarkan nomor/slug,
+        # bukan jumlah) - chapter yang dihapus dari website tidak memicu scrape
+        diff = diff_chapter_lists(details['chapters'], stored_chapters)
+        # Chapter di negative cache yang belum jatuh tempo tidak dihitung sebagai update
+        negative_cache = get_negative_cache()
+        has_new = any(negative_cache.is_due(ch['link']) for ch in chapters_to_fetch(diff))
 
-        return has_new, total_chapters_website, total_chapters_supabase
+        return has_new, total_chapters_website, total_chapters_supabase, diff
     except Exception as e:
-        return None, -1, -1
+        return None, -1, -1, None
+
+def fetch_detail_fingerprint(comic_url):
+    """Fingerprint chapter terbaru dari awal halaman detail (stream sampai <li> pertama
+    di #chapter_list, sisa halaman tidak di-download). None jika gagal/tidak ditemukan."""
+    try:
+        _, html_prefix = get_http_client().read_prefix(
+            comic_url, FIRST_CHAPTER_END_RE,
+            headers=get_plain_headers(), timeout=REQUEST_TIMEOUT, max_bytes=FINGERPRINT_MAX_BYTES
+        )
+        return extract_fingerprint(html_prefix)
+    except Exception:
+        return None
+
+def discover_comics_wp_api():
+    """Discovery via wp-json (JSON ringkas, 100 komik per request).
+    Returns: {slug: {'link', 'lastmod', 'image', 'title', 'type'}} atau None jika API tidak bisa dipakai."""
+    api = WpApi(get_http_client(), SITEMAP_BASE_URL, headers=get_plain_headers(), timeout=REQUEST_TIMEOUT)
+    try:
+        comics = api.list_comics(with_image=True)
+    except WpApiUnavailable as e:
+        print(f"  ⚠️  wp-json tidak tersedia ({e}), fallback ke sitemap XML")
+        return None
+    print(f"  ✓ wp-json: {len(comics)} komik dalam {api.requests} request")
+    discovered = {}
+    for comic in comics:
+        if comic['slug'] and comic['slug'] not in discovered:
+            discovered[comic['slug']] = {
+                'link': comic['link'],
+                'lastmod': normalize_lastmod(comic['modified']),
+                'image': comic['image'],
+                'title': comic['title'],
+                'type': comic['type'],
+            }
+    return discovered
+
+def run_sitemap_discovery(comics_data, catalog_path=None, store=None):
+    """Update katalog dari wp-json (jika aktif) atau XML sitemap (komik baru ditambahkan di akhir).
+    Returns: (comics_data, {Slug: lastmod}) atau (comics_data, None) jika keduanya tidak tersedia."""
+    print(f"\n🗺️  Discovery via {'wp-json/' if ENABLE_WP_API else ''}sitemap: {SITEMAP_BASE_URL}")
+    discovered = discover_comics_wp_api() if ENABLE_WP_API else None
+    if discovered is None:
+        discovered = discover_comics(get_http_client(), SITEMAP_BASE_URL,
+                                     headers=get_plain_headers(), timeout=REQUEST_TIMEOUT)
+    if discovered is None:
+        print(f"  ⚠️  Sitemap tidak tersedia, fallback ke scan semua komik")
+        return comics_data, None
+
+    store = store if store is not None else SitemapStateStore(SITEMAP_STATE_FILE)
+    resolved = 0
+
+    def resolve_new(slug, info):
+        nonlocal resolved
+        # Komik baru dari wp-json: judul + tipe sudah ada, tanpa request tambahan
+        if info.get('title') and info.get('type'):
+            if info['type'] not in SITEMAP_CATALOG_TYPES:
+                store.commit(slug, info['lastmod'], excluded=True)
+                return None
+            return {
+                'Title': clean_catalog_title(info['title']),
+                'Link': info['link'],
+                'Slug': slug,
+                'Image': info['image'],
+                'Type': info['type'],
+            }
+        # Komik baru dari sitemap: ambil judul + tipe dari halaman detail (ter-memo untuk scan berikutnya)
+        if store.is_excluded(slug, info['lastmod']) or resolved >= SITEMAP_MAX_NEW_PER_RUN:
+            return None
+        resolved += 1
+        details = scrape_comic_details(info['link'])
+        if not details:
+            return None
+        comic_type = details['metadata'].get('Type', 'Manhwa')
+        if comic_type not in SITEMAP_CATALOG_TYPES:
+            store.commit(slug, info['lastmod'], excluded=True)
+            return None
+        return {
+            'Title': clean_catalog_title(details['title']),
+            'Link': info['link'],
+            'Slug': slug,
+            'Image': details['cover_url'] or info['image'],
+            'Type': comic_type,
+        }
+
+    comics_data, added = merge_catalog(comics_data, discovered, resolve_new)
+    store.save()
+    if added and catalog_path:
+        with open(catalog_path, 'w', encoding='utf-8') as f:
+            json.dump(comics_data, f, ensure_ascii=False, indent=4)
+
+    lastmods = {slug: info['lastmod'] for slug, info in discovered.items()}
+    changed = sum(1 for slug, lastmod in lastmods.items() if store.is_changed(slug, lastmod))
+    print(f"  ✓ {len(discovered)} komik ditemukan, {len(added)} baru di katalog, {changed} lastmod berubah")
+    return comics_data, lastmods
 
 # ==================== SCRAPING FUNCTIONS ====================
 
 def scrape_comic_details(comic_url, max_retries=3):
-    """Scrape detail komik dari halaman detail - komikindo.ch structure"""
+    """Scrape detail komik dari halaman detail - komikindo.ch structure.
+    Fetch di thread ini, parse HTML di parse worker (process pool).
+    Jika gagal, exception-nya bisa diambil lewat take_fetch_error()."""
+    _thread_local.fetch_error = None
     try:
         print(f"  → Mengambil detail dari: {comic_url}")
         response = safe_get(comic_url, max_retries=max_retries)
-        soup = BeautifulSoup(response.text, 'html.parser')
-
-        # Ambil informasi dasar - h1.entry-title (komikindo.ch)
-        title_element = soup.find('h1', class_='entry-title')
-        title = title_element.get_text(strip=True) if title_element else 'Unknown'
-        # Remove "Komik " prefix
-        title = re.sub(r'^Komik\s*', '', title).strip()
-
-        # Ambil genre - div.genre-info a (komikindo.ch)
-        genres = []
-        genre_info = soup.find('div', class_='genre-info')
-        if genre_info:
-            genre_links = genre_info.find_all('a')
-            genres = [a.get_text(strip=True) for a in genre_links]
-
-        # Ambil synopsis - div.entry-content-sinopsis atau p di entry-content (komikindo.ch)
-        synopsis = ''
-        # Try specific synopsis div first
-        sinopsis_div = soup.select_one('.entry-content-sinopsis, .entry-content .sinopsis')
-        if sinopsis_div:
-            synopsis = sinopsis_div.get_text(strip=True)
-        else:
-            # Fallback: get all p elements and find the one with actual content
-            synopsis_element = soup.select_one('.entry-content')
-            if synopsis_element:
-                # Get all paragraphs
-                paragraphs = synopsis_element.find_all('p')
-                for p in paragraphs:
-                    text = p.get_text(strip=True)
-                    # Skip short text or text that starts with "Manhwa" or contains boilerplate
-                    if len(text) > 50 and 'yang dibuat oleh komikus' not in text:
-                        synopsis = text
-                        break
-                # If still no good synopsis, get the first p with substantial content
-                if not synopsis and paragraphs:
-                    for p in paragraphs:
-                        text = p.get_text(strip=True)
-                        if len(text) > 20:
-                            synopsis = text
-                            break
-
-        # Clean up synopsis
-        if synopsis:
-            # Remove "Manhwa/Manhua/Manga X yang dibuat oleh komikus bernama Y ini bercerita tentang" prefix
-            synopsis = re.sub(
-                r'^(Manhwa|Manhua|Manga)\s+[^.]+yang dibuat oleh[^.]+bercerita tentang\s*',
-                '', synopsis, flags=re.IGNORECASE | re.DOTALL
-            )
-            # Also try simpler pattern if above didn't work
-            synopsis = re.sub(
-                r'^.*?bercerita tentang\s*',
-                '', synopsis, flags=re.IGNORECASE | re.DOTALL
-            )
-            # Normalize whitespace (remove excessive spaces/newlines)
-            synopsis = re.sub(r'\s+', ' ', synopsis).strip()
-            # Remove leading quotes if any
-            synopsis = synopsis.strip('"').strip()
-
-        # Ambil metadata dari div.spe (komikindo.ch)
-        metadata = {}
-        spe = soup.find('div', class_='spe')
-        if spe:
-            spans = spe.find_all('span')
-            for span in spans:
-                text = span.get_text(strip=True)
-                if 'Status:' in text:
-                    metadata['Status'] = text.replace('Status:', '').strip()
-                if 'Jenis Komik:' in text:
-                    type_link = span.find('a')
-                    if type_link:
-                        metadata['Type'] = type_link.get_text(strip=True)
-                if 'Pengarang:' in text:
-                    metadata['Author'] = text.replace('Pengarang:', '').strip()
-                if 'Ilustrator:' in text:
-                    metadata['Ilustrator'] = text.replace('Ilustrator:', '').strip()
-
-        # Ambil cover URL - div.thumb img (komikindo.ch)
-        cover_element = soup.select_one('.thumb img')
-        cover_url = None
-        if cover_element:
-            cover_url = cover_element.get('src') or cover_element.get('data-src')
-
-        # Ambil daftar chapter - div#chapter_list (komikindo.ch)
-        chapter_list = []
-        chapter_container = soup.find('div', id='chapter_list')
-        if chapter_container:
-            ul = chapter_container.find('ul')
-            if ul:
-                lis = ul.find_all('li')
-                for li in lis:
-                    try:
-                        lchx = li.find('span', class_='lchx')
-                        if lchx:
-                            a = lchx.find('a')
-                            if a:
-                                chapter_text = a.get_text(strip=True)
-                                chapter_text = re.sub(r'\s+', ' ', chapter_text).strip()
-                                chapter_link = a.get('href', '')
-
-                                # Release date
-                                dt = li.find('span', class_='dt')
-                                waktu_rilis = dt.get_text(strip=True) if dt else 'N/A'
-                                waktu_rilis_iso = convert_relative_time_to_iso(waktu_rilis)
-
-                                chapter_list.append({
-                                    'chapter': chapter_text,
-                                    'link': chapter_link,
-                                    'waktu_rilis': waktu_rilis_iso
-                                })
-                    except:
-                        pass
-
-        return {
-            'title': title,
-            'genres': genres,
-            'synopsis': synopsis,
-            'metadata': metadata,
-            'cover_url': cover_url,
-            'chapters': chapter_list
-        }
+        return run_parser(parse_comic_details_html, response.content, response.encoding)
 
     except Exception as e:
         print(f"  ✗ Error scraping detail: {e}")
+        _thread_local.fetch_error = e
         return None
 
-def scrape_chapter_images(chapter_url):
-    """Scrape link gambar dari chapter - support multiple selectors"""
+def scrape_chapter_images(chapter_url, state=None):
+    """Scrape link gambar dari chapter - support multiple selectors.
+    Satu attempt: RetryLater diteruskan ke executor untuk dijadwalkan ulang.
+    [] karena error (bukan halaman tanpa gambar) -> take_fetch_error() berisi exception."""
+    _thread_local.fetch_error = None
     try:
-        response = safe_get(chapter_url, max_retries=3)
-        soup = BeautifulSoup(response.text, 'html.parser')
-
-        image_urls = []
-
-        # Try multiple selectors in order of priority
-        selectors = [
-            '#chimg-auh img',          # komikindo.ch structure
-            '.chapter-image img',       # Alternative komikindo structure
-            '#Baca_Komik img',          # Alternative ID
-            '.img-landmine img',        # Parent container
-            '.main-reading-area img',   # komikcast structure
-        ]
-
-        for selector in selectors:
-            images = soup.select(selector)
-            if images:
-                for img in images:
-                    image_url = img.get('src')
-                    if image_url and image_url.strip().startswith('http'):
-                        image_urls.append(image_url)
-                if image_urls:
-                    print(f"    ✓ Found {len(image_urls)} images using '{selector}'")
-                    break
-
-        if not image_urls:
+        response = get_request_flight().do(
+            chapter_url, lambda: fetch_page_attempt(chapter_url, REQUEST_TIMEOUT, state), memo=False
+        )
+        parsed = run_parser(parse_chapter_images_html, response.content, response.encoding)
+        image_urls = parsed['images']
+
+        if image_urls:
+            print(f"    ✓ Found {len(image_urls)} images using '{parsed['selector']}'")
+        else:
             print(f"    ⚠️  Tidak menemukan gambar dengan selector apapun")
 
         return image_urls
 
+    except RetryLater:
+        raise
     except Exception as e:
         print(f"    ✗ Error scraping chapter: {e}")
+        _thread_local.fetch_error = e
         return []
 
-def scrape_single_chapter(chapter_data, idx, total, existing_chapters):
+def scrape_single_chapter(chapter_data, idx, total, state=None, comic_url=None):
     """
-    Scrape satu chapter (untuk parallel processing)
-    Returns: tuple (success, chapter_result_dict or None)
+    Scrape satu chapter (task executor bersama).
+    Chapter yang sudah ada difilter lebih dulu lewat chapter_diff di process_comic.
+    Returns: tuple (True, chapter_result_dict) atau (False, exception fetch / None jika tanpa gambar)
     """
     chapter_title = chapter_data['chapter']
     chapter_url = chapter_data['link']
@@ -660,17 +846,18 @@ def scrape_single_chapter(chapter_data, idx, total, existing_chapters):
 
     thread_safe_print(f"\n  Chapter [{idx + 1}/{total}]: {chapter_title}")
 
-    # Cek apakah chapter sudah ada
-    if chapter_slug in existing_chapters:
-        thread_safe_print(f"✅ Chapter sudah ada, skip...")
-        return (False, None)
-
     # Scrape images dari chapter
-    image_urls = scrape_chapter_images(chapter_url)
+    image_urls = scrape_chapter_images(chapter_url, state)
 
     if not image_urls:
         thread_safe_print(f"✗ Tidak ada gambar ditemukan")
-        return (False, None)
+        error = take_fetch_error()
+        if error is None:
+            # Halaman ter-parse tapi kosong (terkunci / belum diunggah): cek ulang nanti
+            interval = get_negative_cache().record(chapter_url, NO_IMAGES, comic_url=comic_url)
+            thread_safe_print(f"  🚫 Negative cache: cek ulang {chapter_title} dalam {interval}")
+        return (False, error)
+    get_negative_cache().clear(chapter_url)
 
     thread_safe_print(f"✅ Ditemukan {len(image_urls)} gambar")
 
@@ -689,8 +876,55 @@ def scrape_single_chapter(chapter_data, idx, total, existing_chapters):
 
 # ==================== MAIN PROCESSING ====================
 
+def scrape_chapter_window(chapters, offset, total, group=None, comic_url=None):
+    """Scrape link gambar untuk satu window chapter lewat executor bersama.
+    Task chapter antri di group komik ini (bergiliran dengan komik lain); fetch
+    yang gagal tidak di-sleep di worker: executor menjadwalkan ulang chapter
+    tersebut (backoff + jitter) sementara worker lanjut ke chapter lain.
+    offset/total hanya untuk penomoran log, comic_url untuk entry negative cache.
+    Returns: (list chapter dict, list (chapter, exception atau None jika tanpa gambar) yang gagal)"""
+    results = []
+    failures = []
+
+    def task(idx, chapter):
+        state = {}  # Status cloudscraper per URL, dibawa antar attempt
+        return lambda: scrape_single_chapter(chapter, offset + idx, total, state, comic_url)
+
+    def on_result(idx, ok, value):
+        if not ok:
+            # Budget attempt habis / error tak terduga
+            thread_safe_print(f"    ✗ Error scraping chapter: {value}")
+            failures.append((chapters[idx], value))
+            return
+        success, chapter_result = value
+        if success and chapter_result:
+            results.append(chapter_result)
+        else:
+            # Chapter tanpa gambar (None) atau fetch gagal (exception)
+            failures.append((chapters[idx], chapter_result))
+
+    get_work_executor().run(group, [(idx, task(idx, chapter)) for idx, chapter in enumerate(chapters)],
+                            on_result=on_result)
+    return results, failures
+
 def process_comic(supabase, comic_data, comic_index):
     """Proses satu komik: scrape detail dan link gambar"""
+    windows = process_comic_windows(supabase, comic_data, comic_index)
+    while True:
+        try:
+            next(windows)
+        except StopIteration as stop:
+            return stop.value
+
+def process_comic_windows(supabase, comic_data, comic_index, window_size=None):
+    """Generator: proses satu komik per window chapter (backfill).
+
+    Setiap window di-scrape, di-merge dengan chapter tersimpan dan di-upload
+    sebelum yield, sehingga progress tetap tersimpan walau run berhenti di
+    tengah seri dan hanya satu window yang ada di memori sebagai dict penuh.
+    window_size None = semua chapter dalam satu window (perilaku lama).
+    Return value (StopIteration.value) = comic_result atau None.
+    """
 
     comic_url = comic_data.get('Link')
     comic_title_raw = comic_data.get('Title', f'Komik-{comic_index}')
@@ -709,8 +943,8 @@ def process_comic(supabase, comic_data, comic_index):
         print(f"✗ Gagal mendapatkan detail komik")
         return None
 
-    # Sanitize nama folder
-    comic_slug = sanitize_filename(comic_title_raw)
+    # Folder kanonik dari slug registry (judul yang berubah tetap ke folder lama)
+    comic_slug = comic_folder(comic_data)
 
     # Cek status komik
     status = details['metadata'].get('Status', 'Unknown')
@@ -725,14 +959,19 @@ def process_comic(supabase, comic_data, comic_index):
             print(f"⏭️  Skip komik ini...")
             return None
 
-    # Dapatkan daftar chapter yang sudah ada (untuk skip)
-    existing_chapters = set()
+    # Dapatkan chapter yang sudah ada lalu diff berdasarkan nomor/slug chapter
+    stored_chapters = []
     if ENABLE_SUPABASE_UPLOAD and supabase:
-        existing_chapters = get_existing_chapters(supabase, comic_slug)
-        if existing_chapters:
-            print(f"  📁 Chapter yang sudah ada: {len(existing_chapters)}")
-            # Uncomment untuk melihat daftar chapter yang sudah ada:
-            # print(f"  📋 List: {sorted(existing_chapters)[:10]}...")  # Show first 10
+        existing_data = get_existing_chapters_full(supabase, comic_slug)
+        if existing_data and 'chapters' in existing_data:
+            stored_chapters = existing_data['chapters']
+            print(f"  📁 Chapter yang sudah ada: {len(stored_chapters)}")
+    is_new_comic = not stored_chapters
+
+    diff = diff_chapter_lists(details['chapters'], stored_chapters)
+    if stored_chapters:
+        print(f"  🔍 Diff: +{len(diff['added'])} baru, ~{len(diff['changed'])} berubah, "
+              f"-{len(diff['removed'])} hilang, ={diff['unchanged']} sama")
 
     # Struktur data untuk komik ini
     comic_result = {
@@ -747,92 +986,109 @@ def process_comic(supabase, comic_data, comic_index):
         'chapters': []
     }
 
-    # Reverse agar chapter 1 diproses duluan
-    chapters = details['chapters'][::-1]
+    # Reverse agar chapter 1 diproses duluan, hanya chapter baru/berubah
+    chapters = chapters_to_fetch(diff)[::-1]
+    chapters_skipped = diff['unchanged']
 
-    print(f"\n📸 Scraping image links dari {len(chapters)} chapters...")
+    # Chapter tanpa gambar di run sebelumnya: tunggu jatuh tempo cek ulang
+    negative_cache = get_negative_cache()
+    not_due = {ch['link'] for ch in chapters if negative_cache.skip(ch['link'])}
+    if not_due:
+        chapters = [ch for ch in chapters if ch['link'] not in not_due]
+        chapters_skipped += len(not_due)
+        print(f"  🚫 {len(not_due)} chapter di-skip (negative cache, belum jatuh tempo cek ulang)")
 
-    chapters_scraped = 0
-    chapters_skipped = 0
+    # Chapter dead-letter yang ternyata sudah tersimpan (lewat run lain) tidak perlu di-repair lagi.
+    # Disimpan ke disk sekali per komik oleh koordinator (mark_comic), bukan dari thread komik
+    dead_letters = get_dead_letters()
+    dead_letters.resolve_stored(comic_url, [ch['link'] for ch in chapters])
+    windows = chapter_windows(chapters, window_size)
 
-    # Parallel processing untuk chapters
+    print(f"\n📸 Scraping image links dari {len(chapters)} chapters...")
+    if len(windows) > 1:
+        print(f"🪟 Backfill: {len(windows)} window x {window_size} chapter")
     if ENABLE_PARALLEL and MAX_CHAPTER_WORKERS > 1:
-        print(f"⚡ Menggunakan {MAX_CHAPTER_WORKERS} workers untuk parallel scraping")
-
-        with ThreadPoolExecutor(max_workers=MAX_CHAPTER_WORKERS) as executor:
-            # Submit semua chapter untuk diproses parallel
-            future_to_chapter = {
-                executor.submit(scrape_single_chapter, chapter, idx, len(chapters), existing_chapters): idx
-                for idx, chapter in enumerate(chapters)
-            }
-
-            # Collect hasil
-            for future in as_completed(future_to_chapter):
-                try:
-                    success, chapter_result = future.result()
-                    if success and chapter_result:
-                        comic_result['chapters'].append(chapter_result)
-                        chapters_scraped += 1
-                    elif not success and chapter_result is None:
-                        # Chapter di-skip atau error
-                        chapters_skipped += 1
-                except Exception as e:
-                    thread_safe_print(f"✗ Error processing chapter: {e}")
+        print(f"⚡ Executor bersama: maks {MAX_CHAPTER_WORKERS} chapter in-flight (semua komik)")
     else:
-        # Sequential processing (original method)
         print(f"→ Sequential processing (parallel disabled)")
-        for idx, chapter in enumerate(chapters):
-            chapter_title = chapter['chapter']
-            chapter_url = chapter['link']
-            chapter_slug = sanitize_filename(chapter_title)
-
-            print(f"\n  Chapter [{idx + 1}/{len(chapters)}]: {chapter_title}")
-
-            # Cek apakah chapter sudah ada
-            if chapter_slug in existing_chapters:
-                print(f"✅ Chapter sudah ada, skip...")
-                chapters_skipped += 1
-                continue
-
-            # Scrape images dari chapter
-            image_urls = scrape_chapter_images(chapter_url)
-
-            if not image_urls:
-                print(f"✗ Tidak ada gambar ditemukan")
-                continue
 
-            print(f"✅ Ditemukan {len(image_urls)} gambar")
+    chapters_scraped = 0
+    total_images = 0
+    offset = 0
+    folder_created = False
+
+    for window_no, window in enumerate(windows):
+        new_chapters, failures = scrape_chapter_window(window, offset, len(chapters), group=comic_slug,
+                                                        comic_url=comic_url)
+        offset += len(window)
+        chapters_scraped += len(new_chapters)
+        chapters_skipped += len(failures)
+
+        # Chapter gagal (bukan halaman kosong) -> dead-letter untuk mode repair; yang berhasil dihapus
+        for chapter, error in failures:
+            if error is not None:
+                dead_letters.record(CHAPTER, chapter['link'], error, title=chapter['chapter'],
+                                    comic_url=comic_url, stage='chapter')
+        for chapter in new_chapters:
+            dead_letters.resolve(CHAPTER, chapter['url'])
+        total_images += sum(ch['total_images'] for ch in new_chapters)
+        if len(windows) > 1:
+            print(f"\n🪟 Window {window_no + 1}/{len(windows)}: {len(new_chapters)} chapter di-scrape")
+
+        # Verifikasi link gambar (opsional) - HEAD request, tanpa download gambar
+        if ENABLE_IMAGE_PROBE and new_chapters:
+            urls = [url for ch in new_chapters for url in ch['images']]
+            results = probe_images(urls, get_http_client(), get_image_probe_cache(),
+                                   max_workers=IMAGE_PROBE_WORKERS, timeout=REQUEST_TIMEOUT)
+            broken = find_broken_chapters(new_chapters, results)
+            comic_result.setdefault('broken_chapters', []).extend(broken)
+            get_image_probe_cache().save()
+            if broken:
+                print(f"  ⚠️  {len(broken)} chapter punya gambar rusak:")
+                for item in broken:
+                    print(f"     - {item['title']}: {item['broken']}/{item['total']} gambar rusak")
+            else:
+                print(f"  🔎 Semua {len(set(urls))} link gambar OK")
 
-            # Simpan data chapter
-            comic_result['chapters'].append({
-                'slug': chapter_slug,
-                'title': chapter_title,
-                'url': chapter_url,
-                'waktu_rilis': chapter['waktu_rilis'],
-                'total_images': len(image_urls),
-                'images': image_urls
-            })
+        # Upload ke Supabase jika enabled (per window)
+        if ENABLE_SUPABASE_UPLOAD and supabase:
+            stored_chapters, uploaded = upload_comic_window(supabase, comic_result, stored_chapters, new_chapters,
+                                                            upload_metadata=window_no == 0)
+            folder_created = folder_created or uploaded
 
-            chapters_scraped += 1
+        # Window selesai di-commit -> simpan dalam bentuk ringkas
+        comic_result['chapters'].extend(ChapterRecord.from_dict(ch) for ch in new_chapters)
+        del new_chapters
 
-            # Delay antar chapter
-            time.sleep(DELAY_BETWEEN_CHAPTERS)
+        if window_no < len(windows) - 1:
+            yield offset, len(chapters)
 
     print(f"\n{'='*60}")
     print(f"✓ Komik '{comic_title_raw}' selesai di-scrape!")
     print(f"  📊 Statistik:")
     print(f"     - Chapter baru di-scrape: {chapters_scraped}")
     print(f"     - Chapter di-skip: {chapters_skipped}")
-    print(f"     - Total chapters: {len(chapters)}")
-    total_images = sum(ch['total_images'] for ch in comic_result['chapters'])
+    print(f"     - Total chapters: {total_chapters}")
     print(f"  📸 Total image links (baru): {total_images}")
     print(f"{'='*60}")
 
-    # Upload ke Supabase jika enabled
     if ENABLE_SUPABASE_UPLOAD and supabase:
-        print(f"\n📤 Uploading ke Supabase...")
+        print(f"✅ Upload ke Supabase selesai!")
+        if is_new_comic and folder_created:
+            # Folder komik baru -> catat untuk registry generate_comics_list.py
+            with _new_comic_slugs_lock:
+                _new_comic_slugs.add(comic_slug)
+
+    return comic_result
+
+def upload_comic_window(supabase, comic_result, stored_chapters, new_chapters, upload_metadata=True):
+    """Merge chapter satu window ke chapter tersimpan lalu upload chapters.json.
+    Returns: (daftar chapter gabungan untuk merge window berikutnya, upload berhasil)"""
+    comic_slug = comic_result['slug']
+    print(f"\n📤 Uploading ke Supabase...")
 
-        # 1. Upload metadata komik (info dasar tanpa chapters)
+    # 1. Upload metadata komik (info dasar tanpa chapters)
+    if upload_metadata:
         metadata_only = {
             'slug': comic_result['slug'],
             'title': comic_result['title'],
@@ -848,67 +1104,122 @@ def process_comic(supabase, comic_data, comic_index):
         if upload_json_to_supabase(supabase, metadata_only, metadata_path):
             print(f"  ✓ Metadata uploaded: {metadata_path}")
 
-        # 2. Gabungkan chapter baru dengan chapter yang sudah ada
-        existing_chapters_data = get_existing_chapters_full(supabase, comic_slug)
-
-        if existing_chapters_data and 'chapters' in existing_chapters_data:
-            # Ada data lama, gabungkan dengan yang baru
-            existing_chapters_list = existing_chapters_data['chapters']
-            new_chapters_list = comic_result['chapters']
-
-            # Buat dictionary untuk merge berdasarkan slug
-            chapters_dict = {}
-
-            # Masukkan chapter lama
-            for ch in existing_chapters_list:
-                chapters_dict[ch['slug']] = ch
-
-            # Update/tambah dengan chapter baru
-            for ch in new_chapters_list:
-                chapters_dict[ch['slug']] = ch
-
-            # Convert kembali ke list
-            merged_chapters = list(chapters_dict.values())
-
-            print(f"  📊 Merge: {len(existing_chapters_list)} existing + {len(new_chapters_list)} new = {len(merged_chapters)} total")
-        else:
-            # Tidak ada data lama, gunakan yang baru saja
-            merged_chapters = comic_result['chapters']
-            print(f"  📊 New comic: {len(merged_chapters)} chapters")
-
-        # 3. Upload semua chapters (gabungan) dalam 1 file JSON
-        chapters_data = {
-            'slug': comic_result['slug'],
-            'title': comic_result['title'],
-            'total_chapters': len(merged_chapters),
-            'chapters': merged_chapters
-        }
-
-        chapters_path = f"{comic_slug}/chapters.json"
-        if upload_json_to_supabase(supabase, chapters_data, chapters_path):
-            print(f"  ✓ All chapters uploaded: {chapters_path} ({len(merged_chapters)} chapters)")
-
-        print(f"✅ Upload ke Supabase selesai!")
+    # 2. Gabungkan chapter baru dengan chapter yang sudah ada
+    if stored_chapters:
+        # Ada data lama, gabungkan berdasarkan key kanonik (nomor/slug chapter)
+        merged_chapters = merge_chapter_lists(stored_chapters, new_chapters)
+        print(f"  📊 Merge: {len(stored_chapters)} existing + {len(new_chapters)} new = {len(merged_chapters)} total")
+    else:
+        # Tidak ada data lama, gunakan yang baru saja
+        merged_chapters = list(new_chapters)
+        print(f"  📊 New comic: {len(merged_chapters)} chapters")
+
+    # 3. Upload semua chapters (gabungan) dalam 1 file JSON
+    chapters_data = {
+        'slug': comic_result['slug'],
+        'title': comic_result['title'],
+        'total_chapters': len(merged_chapters),
+        'chapters': merged_chapters
+    }
 
-    return comic_result
+    chapters_path = f"{comic_slug}/chapters.json"
+    if upload_json_to_supabase(supabase, chapters_data, chapters_path):
+        print(f"  ✓ All chapters uploaded: {chapters_path} ({len(merged_chapters)} chapters)")
+        return merged_chapters, True
+    return stored_chapters, False
 
 def process_comic_wrapper(args):
     """
     Wrapper untuk process_comic agar bisa digunakan di parallel processing
-    Returns: tuple (current_index, result)
+    Returns: tuple (current_index, result, deferred)
     """
     supabase, comic, current_index = args
-    result = process_comic(supabase, comic, current_index)
-    return (current_index, result)
+    if not _deadline.admit('comic'):
+        # Perkiraan selesai melewati deadline: tunda ke run berikutnya
+        _deadline.defer(comic_folder(comic), comic.get('Title', 'Unknown'), 'process', current_index)
+        return (current_index, None, True)
+    with _deadline.track('comic'):
+        result = process_comic(supabase, comic, current_index)
+    if not result:
+        # Error dari thread worker ini (fetch detail) untuk dead-letter
+        return (current_index, take_fetch_error(), False)
+    return (current_index, result, False)
 
 # ==================== MAIN FUNCTION ====================
 
-def main():
-    """Fungsi utama"""
+def parse_args(argv=None):
+    """Argumen command line"""
+    parser = argparse.ArgumentParser(description="Manga image links scraper + Supabase uploader")
+    parser.add_argument(
+        '--shard', type=str, default=None, metavar='I/N',
+        help="Proses hanya shard ke-I dari N (hash stabil dari slug), contoh: --shard 1/4"
+    )
+    parser.add_argument(
+        '--deadline', type=parse_duration, default=None, metavar='DURASI',
+        help="Budget waktu run (contoh: 5h, 45m). Komik baru tidak dimulai jika perkiraan "
+             "selesainya melewati budget; yang berjalan diselesaikan dulu"
+    )
+    parser.add_argument(
+        '--repair', action='store_true',
+        help="Mode repair: hanya proses komik/chapter di dead-letter (concurrency lebih rendah, attempt lebih banyak)"
+    )
+    return parser.parse_args(argv)
+
+def configure_shard(index, count):
+    """Arahkan file progress/output ke file khusus shard."""
+    global OUTPUT_FILE, PROGRESS_FILE, FRONTIER_FILE, DEAD_LETTER_FILE
+    OUTPUT_FILE = shard_path(OUTPUT_FILE, index, count)
+    PROGRESS_FILE = shard_path(PROGRESS_FILE, index, count)
+    FRONTIER_FILE = shard_path(FRONTIER_FILE, index, count)
+    DEAD_LETTER_FILE = shard_path(DEAD_LETTER_FILE, index, count)
+
+def configure_repair():
+    """Concurrency + budget attempt untuk mode repair (kegagalan umumnya CF/503 karena burst)."""
+    global MAX_CHAPTER_WORKERS, MAX_COMIC_WORKERS, CHAPTER_MAX_ATTEMPTS
+    MAX_CHAPTER_WORKERS = REPAIR_CHAPTER_WORKERS
+    MAX_COMIC_WORKERS = REPAIR_COMIC_WORKERS
+    CHAPTER_MAX_ATTEMPTS = REPAIR_MAX_ATTEMPTS
+
+def main(args=None):
+    """Fungsi utama. Executor chapter dan parse pool selalu di-shutdown, termasuk
+    saat run berhenti lebih awal (file katalog tidak ada, tidak ada komik, error)."""
+    if args is None:
+        args = parse_args([])
+    try:
+        run(args)
+    finally:
+        shutdown_work_executor()
+        shutdown_parse_pool()
+
+def run(args):
+    """Isi run scraper (dipanggil lewat main)"""
+    global _deadline
+    repair = getattr(args, 'repair', False)
+    if repair:
+        configure_repair()
+    budget = args.deadline if args.deadline is not None else TIME_BUDGET_SECONDS
+    _deadline = RunDeadline(budget or None, reserve_seconds=DRAIN_RESERVE_SECONDS,
+                            priors={'comic': DEFAULT_COMIC_COST_SECONDS})
+    _deadline.install_signal_handlers()
+
     print("="*60)
     print("MANGA IMAGE LINKS SCRAPER + SUPABASE UPLOADER")
     print("="*60)
 
+    # Shard mode: hanya komik dengan hash slug yang jatuh ke shard ini
+    shard_index, shard_count = parse_shard(args.shard) if args.shard else (1, 1)
+    if shard_count > 1:
+        configure_shard(shard_index, shard_count)
+        print(f"🧩 Shard {shard_index}/{shard_count} (output: {OUTPUT_FILE})")
+
+    def comic_in_shard(comic):
+        # Key dari URL (bukan judul) supaya komik yang ganti judul tetap di shard yang sama
+        key = comic_slug_from_url(comic.get('Link')) or sanitize_filename(comic.get('Title', ''))
+        return in_shard(key, shard_index, shard_count)
+
+    if _deadline.budget_seconds:
+        print(f"⏱️  Deadline: {_deadline.budget_seconds}s (reserve {DRAIN_RESERVE_SECONDS}s untuk flush)")
+
     # Init Supabase
     supabase = None
     if ENABLE_SUPABASE_UPLOAD:
@@ -934,8 +1245,126 @@ def main():
     # Load existing output
     output_data = load_output()
 
+    # Sitemap: katalog + lastmod per komik (auto update mode)
+    sitemap_lastmods = None
+    sitemap_store = SitemapStateStore(SITEMAP_STATE_FILE)
+    if AUTO_UPDATE_MODE and ENABLE_SITEMAP_DISCOVERY:
+        comics_data, sitemap_lastmods = run_sitemap_discovery(comics_data, JSON_FILE, sitemap_store)
+
+    # Fingerprint halaman detail per komik (auto update mode)
+    fingerprint_store = FingerprintStore(FINGERPRINT_FILE)
+    pending_fingerprints = {}
+    pending_lastmods = {}
+
+    def commit_change_state(index):
+        # Fingerprint/lastmod baru hanya disimpan setelah komik berhasil diproses.
+        # Chapter yang masih di negative cache: fingerprint hanya berlaku sampai jadwal
+        # cek ulangnya dan lastmod tidak di-commit, supaya chapter itu tetap dicek ulang
+        recheck_at = get_negative_cache().next_check_for(comic_url=comics_data[index].get('Link'))
+        if index in pending_fingerprints:
+            slug, fingerprint = pending_fingerprints.pop(index)
+            fingerprint_store.record(slug, fingerprint, valid_until=recheck_at)
+            fingerprint_store.save()
+        if index in pending_lastmods:
+            lastmod = pending_lastmods.pop(index)
+            if recheck_at is None:
+                sitemap_store.commit(*lastmod)
+                sitemap_store.save()
+
+    # Komik yang ditunda run sebelumnya didahulukan
+    deferred_store = DeferredStore(DEFERRED_FILE)
+
+    def defer_comic(idx, stage):
+        comic = comics_data[idx]
+        _deadline.defer(comic_folder(comic), comic.get('Title', 'Unknown'), stage, idx)
+
+    def report_deferred():
+        deferred = _deadline.deferred
+        if not repair:
+            # Mode repair tidak menimpa daftar tunda milik run scan/scrape
+            deferred_store.replace(deferred)
+            deferred_store.save()
+        if not deferred:
+            return
+        by_stage = {}
+        for item in deferred:
+            by_stage.setdefault(item['stage'], []).append(item)
+        print(f"\n⏱️  Ditunda ke run berikutnya ({_deadline.stopped or 'deadline'}):")
+        for stage, items in by_stage.items():
+            sample = ', '.join(item['title'] for item in items[:5])
+            more = f" (+{len(items) - 5} lagi)" if len(items) > 5 else ""
+            print(f"   - {stage}: {len(items)} komik: {sample}{more}")
+
+    def report_slug_registry():
+        registry = get_slug_registry()
+        registry.save()
+        summary = registry.summary()
+        if summary['renamed']:
+            print(f"🔗 Slug registry: {summary['renamed']} komik ganti judul dipetakan ke folder lama "
+                  f"({summary['comics']} komik, {summary['aliases']} alias)")
+
+    def report_negative_cache():
+        negative_cache = get_negative_cache()
+        negative_cache.save()
+        summary = negative_cache.summary()
+        if not summary['total'] and not summary['skipped']:
+            return
+        by_reason = ', '.join(f"{reason} {count}" for reason, count in sorted(summary['by_reason'].items()))
+        skipped = ', '.join(f"{reason} {count}" for reason, count in sorted(summary['skipped'].items())) or '0'
+        print(f"🚫 Negative cache: {summary['total']} URL ({by_reason}), {summary['due']} jatuh tempo, "
+              f"di-skip run ini: {skipped}")
+
+    def report_dead_letters():
+        dead_letters = get_dead_letters()
+        dead_letters.save()
+        summary = dead_letters.summary()
+        if not summary['total']:
+            return
+        by_kind = ', '.join(f"{kind} {count}" for kind, count in sorted(summary['by_kind'].items()))
+        by_error = ', '.join(f"{label} {count}" for label, count in sorted(summary['by_error'].items()))
+        print(f"📮 Dead-letter: {summary['total']} item ({by_kind}; {by_error}) -> python cli.py repair")
+
+    # Frontier persisten (auto update mode): scan + proses ditarik dari antrian SQLite
+    frontier = None
+
+    def mark_comic(idx, ok, error=None):
+        # Komik selesai -> done + hapus dari dead-letter; gagal -> dead-letter dan
+        # dijadwalkan ulang di frontier (backoff antar run) atau failed
+        comic = comics_data[idx]
+        link = comic.get('Link', '')
+        if ok:
+            get_dead_letters().resolve(COMIC, link)
+        else:
+            get_dead_letters().record(COMIC, link, error, title=comic.get('Title'), stage='process')
+        get_dead_letters().save()
+        if frontier is None:
+            return
+        if ok:
+            frontier.done('comic', link)
+        else:
+            frontier.retry('comic', link, FRONTIER_RETRY_BASE_SECONDS, FRONTIER_MAX_ATTEMPTS, 'process gagal')
+
     # Tentukan range komik yang akan diproses
-    if AUTO_UPDATE_MODE:
+    if repair:
+        # Mode repair: hanya komik di dead-letter (komik gagal + induk chapter gagal)
+        dead_letters = get_dead_letters()
+        index_by_link = {}
+        for idx, comic in enumerate(comics_data):
+            if comic.get('Link') and comic_in_shard(comic):
+                index_by_link.setdefault(comic['Link'], idx)
+        repair_urls = dead_letters.comic_urls()
+        indices_to_process = [index_by_link[url] for url in repair_urls if url in index_by_link]
+        summary = dead_letters.summary()
+        print(f"\n🛠️  REPAIR MODE: {summary['total']} item dead-letter {summary['by_kind']}")
+        print(f"→ {len(indices_to_process)} komik akan diproses ulang "
+              f"({len(repair_urls) - len(indices_to_process)} di luar katalog/shard ini)")
+        print(f"→ {MAX_CHAPTER_WORKERS} chapter in-flight, {MAX_COMIC_WORKERS} komik bersamaan, "
+              f"maks {CHAPTER_MAX_ATTEMPTS} attempt per chapter")
+        if not indices_to_process:
+            print(f"\n✅ Tidak ada item dead-letter untuk di-repair!")
+            return
+
+    elif AUTO_UPDATE_MODE:
         # Mode auto update: cek semua komik yang ada chapter baru
         print(f"\n🔄 AUTO UPDATE MODE AKTIF")
         print(f"→ Mengecek komik yang ada chapter baru...")
@@ -945,36 +1374,131 @@ def main():
         indices_to_process = []
         checked_count = 0
         skipped_completed = 0
+        skipped_fingerprint = 0
+        skipped_sitemap = 0
+        skipped_negative = 0
+        negative_cache = get_negative_cache()
+
+        frontier = CrawlFrontier(FRONTIER_FILE)
+        recovered = frontier.recover()
+        cycle_started = frontier.cycle_started()
+        if (cycle_started is None or not frontier.pending_count()
+                or time.time() - cycle_started >= FRONTIER_CYCLE_HOURS * 3600):
+            carried = frontier.new_cycle()
+            print(f"→ Frontier: siklus crawl baru ({carried} item belum selesai dibawa dari siklus sebelumnya)")
+        else:
+            print(f"→ Frontier: melanjutkan siklus crawl ({frontier.pending_count()} item tersisa, "
+                  f"{recovered} dari run yang terputus)")
 
-        # Cek setiap komik (max AUTO_UPDATE_MAX_COMICS)
+        # Seed scan: komik yang sudah dicek di siklus ini diabaikan (seen-set),
+        # komik yang ditunda run sebelumnya didahulukan
+        index_by_link = {}
         for idx, comic in enumerate(comics_data):
+            if comic.get('Link') and comic_in_shard(comic):
+                index_by_link.setdefault(comic['Link'], idx)
+        frontier.add_many('detail', (
+            (link, PRIORITY_CARRIED if comic_folder(comics_data[idx]) in deferred_store
+             else PRIORITY_DEFAULT, None)
+            for link, idx in index_by_link.items()
+        ))
+        scan_items = frontier.take('detail')
+
+        # Cek setiap komik (max AUTO_UPDATE_MAX_COMICS)
+        for position, item in enumerate(scan_items):
+            comic_url = item['url']
+            idx = index_by_link.get(comic_url)
+            if idx is None:
+                # Sudah tidak ada di katalog / shard ini
+                frontier.done('detail', comic_url)
+                continue
+            comic = comics_data[idx]
             if checked_count >= AUTO_UPDATE_MAX_COMICS:
                 break
+            # Sisakan waktu untuk memproses komik yang sudah ketemu update
+            pending = len(indices_to_process) * _deadline.estimate('comic')
+            if not _deadline.admit('scan', pending_seconds=pending):
+                print(f"\n⏱️  Deadline: scan dihentikan, sisa waktu untuk memproses {len(indices_to_process)} komik")
+                for rest in scan_items[position:]:
+                    if rest['url'] in index_by_link:
+                        defer_comic(index_by_link[rest['url']], 'scan')
+                break
+            # lastmod sitemap sama dengan run sebelumnya -> tidak ada perubahan, tanpa request
+            sitemap_slug = catalog_slug(comic)
+            lastmod = sitemap_lastmods.get(sitemap_slug) if sitemap_lastmods is not None else None
+            if lastmod and not sitemap_store.is_changed(sitemap_slug, lastmod):
+                skipped_sitemap += 1
+                frontier.done('detail', comic_url)
+                continue
+            # Komik mati (detail 404 / gagal terus) belum jatuh tempo cek ulang
+            if negative_cache.skip(comic_url):
+                skipped_negative += 1
+                frontier.done('detail', comic_url)
+                continue
+            scan_started = time.monotonic()
 
             comic_title = comic.get('Title', 'Unknown')
-            comic_url = comic.get('Link', '')
-            comic_slug = sanitize_filename(comic_title)
+            comic_slug = comic_folder(comic)
 
             print(f"\n  [{checked_count + 1}/{AUTO_UPDATE_MAX_COMICS}] Checking: {comic_title}", end=" ")
 
             # Tambah delay random untuk menghindari rate limiting
             time.sleep(random.uniform(0.2, 0.5))
 
+            # Fingerprint sama dengan run sebelumnya -> tidak ada perubahan, skip tanpa fetch detail
+            fingerprint = fetch_detail_fingerprint(comic_url) if ENABLE_FINGERPRINT_SKIP else None
+            if fingerprint_store.matches(comic_slug, fingerprint, FINGERPRINT_MAX_AGE_DAYS):
+                print(f"[SKIP] Fingerprint sama (tidak ada perubahan)")
+                sitemap_store.commit(sitemap_slug, lastmod)
+                frontier.done('detail', comic_url)
+                skipped_fingerprint += 1
+                checked_count += 1
+                _deadline.record('scan', time.monotonic() - scan_started)
+                continue
+
             # Cek apakah ada chapter baru (SELALU cek, termasuk komik 'Completed')
-            has_new, total_web, total_db = has_new_chapters(supabase, comic_url, comic_slug)
+            has_new, total_web, total_db, diff = has_new_chapters(supabase, comic_url, comic_slug)
 
             # Handle error case (has_new is None, total_web is -1)
             if has_new is None or total_web == -1:
                 print(f"Error scraping (skip)")
+                error = take_fetch_error()
+                status = http_status(error)
+                if status not in (404, 410):
+                    get_dead_letters().record(COMIC, comic_url, error, title=comic_title, stage='scan')
+                if status in (404, 410):
+                    # Halaman komik sudah tidak ada: jangan di-retry, cek ulang dengan interval naik
+                    interval = negative_cache.record(comic_url, NOT_FOUND)
+                    frontier.done('detail', comic_url)
+                    print(f"  🚫 HTTP {status}: negative cache, cek ulang dalam {interval}")
+                elif not frontier.retry('detail', comic_url, FRONTIER_RETRY_BASE_SECONDS,
+                                        FRONTIER_MAX_ATTEMPTS, 'scan gagal'):
+                    # Budget attempt siklus ini habis
+                    interval = negative_cache.record(comic_url, DETAIL_FAILED)
+                    print(f"  🚫 Gagal {FRONTIER_MAX_ATTEMPTS}x: negative cache, cek ulang dalam {interval}")
                 checked_count += 1
                 time.sleep(0.5)
+                _deadline.record('scan', time.monotonic() - scan_started)
                 continue
 
+            negative_cache.clear(comic_url)
+            if not has_new and get_dead_letters().resolve(COMIC, comic_url):
+                # Detail berhasil diambil lagi dan tidak ada yang perlu diproses
+                get_dead_letters().save()
             if has_new:
-                new_chapters = total_web - total_db
-                print(f"[NEW] {new_chapters} chapter baru! ({total_db} -> {total_web})")
+                print(f"[NEW] {len(diff['added'])} chapter baru, {len(diff['changed'])} berubah! ({total_db} -> {total_web})")
                 indices_to_process.append(idx)
+                # Masuk antrian proses; fingerprint/lastmod baru disimpan setelah komik berhasil diproses
+                frontier.add('comic', comic_url, payload={
+                    'fingerprint': [comic_slug, fingerprint],
+                    'lastmod': [sitemap_slug, lastmod],
+                })
             else:
+                # Semua chapter yang belum tersimpan ada di negative cache (belum jatuh tempo)?
+                recheck_at = negative_cache.next_check_for(
+                    [ch['link'] for ch in chapters_to_fetch(diff)], comic_url)
+                fingerprint_store.record(comic_slug, fingerprint, valid_until=recheck_at)
+                if recheck_at is None:
+                    sitemap_store.commit(sitemap_slug, lastmod)
                 # Tidak ada chapter baru -- sekarang cek apakah komik sudah completed
                 # Jika completed DAN tidak ada chapter baru, tandai agar bisa di-skip lebih cepat
                 if is_comic_completed_in_supabase(supabase, comic_slug):
@@ -983,16 +1507,50 @@ def main():
                 else:
                     print(f"[OK] No update ({total_db} chapters)")
 
+            frontier.done('detail', comic_url)
             checked_count += 1
             time.sleep(0.5)  # Delay antar check
+            _deadline.record('scan', time.monotonic() - scan_started)
+
+        # Komik yang belum dicek tetap pending di frontier untuk run berikutnya
+        frontier.release('detail')
+
+        # Antrian proses: komik dengan update dari scan ini + yang belum selesai di run sebelumnya
+        found_this_run = len(indices_to_process)
+        indices_to_process = []
+        for item in frontier.take('comic'):
+            idx = index_by_link.get(item['url'])
+            if idx is None:
+                frontier.done('comic', item['url'])
+                continue
+            indices_to_process.append(idx)
+            payload = item['payload'] or {}
+            if payload.get('fingerprint'):
+                pending_fingerprints[idx] = tuple(payload['fingerprint'])
+            if payload.get('lastmod'):
+                pending_lastmods[idx] = tuple(payload['lastmod'])
 
         print(f"\n📊 Hasil scan:")
         print(f"   - Komik di-cek: {checked_count}")
         print(f"   - Komik completed (skip): {skipped_completed}")
-        print(f"   - Komik dengan update: {len(indices_to_process)}")
+        print(f"   - Komik tanpa perubahan (fingerprint): {skipped_fingerprint}")
+        if sitemap_lastmods is not None:
+            print(f"   - Komik tanpa perubahan (sitemap lastmod): {skipped_sitemap}")
+        print(f"   - Komik mati (negative cache, belum jatuh tempo): {skipped_negative}")
+        print(f"   - Komik dengan update: {found_this_run}")
+        if len(indices_to_process) > found_this_run:
+            print(f"   - Komik dari run sebelumnya (frontier): {len(indices_to_process) - found_this_run}")
+        fingerprint_store.save()
+        sitemap_store.save()
+        negative_cache.save()
 
         if not indices_to_process:
             print(f"\n✅ Tidak ada komik dengan chapter baru!")
+            report_deferred()
+            report_negative_cache()
+            report_dead_letters()
+            report_slug_registry()
+            frontier.close()
             return
 
         print(f"\n→ Akan scrape {len(indices_to_process)} komik dengan chapter baru")
@@ -1001,16 +1559,73 @@ def main():
     else:
         # Mode normal: lanjut dari progress
         start_index = last_index + 1
-        end_index = min(start_index + MAX_COMICS_TO_PROCESS, len(comics_data))
+        if shard_count > 1:
+            indices_to_process = [
+                idx for idx in range(start_index, len(comics_data))
+                if comic_in_shard(comics_data[idx])
+            ][:MAX_COMICS_TO_PROCESS]
+            end_index = indices_to_process[-1] + 1 if indices_to_process else start_index
+        else:
+            end_index = min(start_index + MAX_COMICS_TO_PROCESS, len(comics_data))
+            indices_to_process = range(start_index, end_index)
 
-        print(f"\n→ Akan memproses {end_index - start_index} komik")
+        print(f"\n→ Akan memproses {len(indices_to_process)} komik")
         print(f"→ Index: {start_index} hingga {end_index - 1}")
         print(f"→ Total komik di database: {len(comics_data)}")
 
-        indices_to_process = range(start_index, end_index)
+    def handle_result(current_index, result):
+        # Tambahkan ke output (chapter dalam bentuk ringkas)
+        output_data.append(compact_comic(result))
+        scraped_comics.append(result['title'])
+
+        # Save output setiap kali berhasil
+        save_output(output_data)
+
+        # Save progress (mode repair tidak menggeser progress mode normal)
+        if not repair:
+            save_progress(current_index, scraped_comics)
+
+        commit_change_state(current_index)
+        mark_comic(current_index, True)
+        get_negative_cache().save()
+        thread_safe_print(f"\n💾 Progress saved: {current_index + 1}/{len(comics_data)}")
+
+        # Delay antar komik
+        time.sleep(DELAY_BETWEEN_COMICS)
 
     # Proses setiap komik
-    if ENABLE_PARALLEL and MAX_COMIC_WORKERS > 1 and not AUTO_UPDATE_MODE:
+    if BACKFILL_MODE:
+        # Backfill: setiap komik diproses per window chapter (upload per window),
+        # komik aktif bergiliran sehingga seri raksasa tidak memonopoli worker
+        comic_workers = MAX_COMIC_WORKERS if ENABLE_PARALLEL else 1
+        active_comics = max(BACKFILL_ACTIVE_COMICS, comic_workers)
+        print(f"\n🪟 Backfill mode: window {BACKFILL_WINDOW_SIZE} chapter, "
+              f"{active_comics} komik bergiliran, {comic_workers} workers")
+
+        def on_done(current_index, result, busy_seconds):
+            _deadline.record('comic', busy_seconds)
+            if result:
+                handle_result(current_index, result)
+            else:
+                mark_comic(current_index, False)
+
+        def on_error(current_index, error):
+            thread_safe_print(f"✗ Error processing comic [{current_index + 1}]: {error}")
+            mark_comic(current_index, False)
+
+        run_interleaved(
+            ((idx, functools.partial(process_comic_windows, supabase, comics_data[idx], idx, BACKFILL_WINDOW_SIZE))
+             for idx in indices_to_process),
+            max_workers=comic_workers,
+            max_active=active_comics,
+            admit_new=lambda: _deadline.admit('comic'),
+            admit_next=lambda: _deadline.admit('window'),
+            on_step=lambda idx, seconds: _deadline.record('window', seconds),
+            on_done=on_done,
+            on_deferred=lambda idx, started: defer_comic(idx, 'process'),
+            on_error=on_error,
+        )
+    elif ENABLE_PARALLEL and MAX_COMIC_WORKERS > 1 and (repair or not AUTO_UPDATE_MODE):
         # Parallel processing untuk komik (hanya untuk mode normal, bukan auto update)
         print(f"\n⚡ Menggunakan {MAX_COMIC_WORKERS} workers untuk parallel comic processing")
 
@@ -1030,53 +1645,72 @@ def main():
             # Collect hasil
             for future in as_completed(future_to_index):
                 try:
-                    current_index, result = future.result()
-
-                    if result:
-                        # Tambahkan ke output
-                        output_data.append(result)
-                        scraped_comics.append(result['title'])
-
-                        # Save output setiap kali berhasil
-                        save_output(output_data)
-
-                        # Save progress
-                        save_progress(current_index, scraped_comics)
+                    current_index, result, deferred = future.result()
 
-                        thread_safe_print(f"\n💾 Progress saved: {current_index + 1}/{len(comics_data)}")
-
-                        # Delay antar komik
-                        time.sleep(DELAY_BETWEEN_COMICS)
+                    if isinstance(result, dict):
+                        handle_result(current_index, result)
+                    elif not deferred:
+                        mark_comic(current_index, False, result)
                 except Exception as e:
                     thread_safe_print(f"✗ Error processing comic: {e}")
+                    mark_comic(future_to_index[future], False, e)
     else:
         # Sequential processing (original method atau auto update mode)
-        if AUTO_UPDATE_MODE:
+        if repair:
+            print(f"\n→ Sequential processing (repair mode)")
+        elif AUTO_UPDATE_MODE:
             print(f"\n→ Sequential processing (auto update mode)")
         else:
             print(f"\n→ Sequential processing (parallel disabled)")
 
-        for current_index in indices_to_process:
+        for position, current_index in enumerate(indices_to_process):
+            if not _deadline.admit('comic'):
+                print(f"\n⏱️  Deadline: sisa komik tidak diproses di run ini")
+                for rest in indices_to_process[position:]:
+                    defer_comic(rest, 'process')
+                break
             comic = comics_data[current_index]
 
             # Proses komik
-            result = process_comic(supabase, comic, current_index)
+            with _deadline.track('comic'):
+                result = process_comic(supabase, comic, current_index)
 
             if result:
-                # Tambahkan ke output
-                output_data.append(result)
-                scraped_comics.append(result['title'])
-
-                # Save output setiap kali berhasil
-                save_output(output_data)
-
-                # Save progress
-                save_progress(current_index, scraped_comics)
-
-                print(f"\n💾 Progress saved: {current_index + 1}/{len(comics_data)}")
-
-                # Delay antar komik
-                time.sleep(DELAY_BETWEEN_COMICS)
+                handle_result(current_index, result)
+            else:
+                mark_comic(current_index, False, take_fetch_error())
+
+    # Mode normal: run berikutnya lanjut dari komik pertama yang ditunda
+    deferred_indices = [item['index'] for item in _deadline.deferred if item['stage'] == 'process']
+    if not AUTO_UPDATE_MODE and not repair and deferred_indices:
+        resume_from = min(deferred_indices) - 1
+        if resume_from < load_progress()['last_processed_index']:
+            save_progress(resume_from, scraped_comics)
+
+    # Catat folder komik baru ke registry (delta) untuk generate_comics_list.py
+    if ENABLE_SUPABASE_UPLOAD and supabase and _new_comic_slugs:
+        tag = datetime.now().strftime('%Y%m%dT%H%M%S')
+        if shard_count > 1:
+            tag += f"-shard-{shard_index}-of-{shard_count}"
+        try:
+            delta_path = record_new_slugs(supabase, BUCKET_NAME, _new_comic_slugs, tag)
+            print(f"\n🗂️  {len(_new_comic_slugs)} komik baru dicatat ke registry: {delta_path}")
+        except Exception as e:
+            print(f"\n⚠️  Gagal mencatat komik baru ke registry: {e}")
+
+    # Cover thumbnails untuk komik yang diproses di run ini
+    deadline_passed = _deadline.stopped or (_deadline.remaining() is not None and _deadline.remaining() <= 0)
+    if deadline_passed and ENABLE_COVER_THUMBS:
+        print(f"\n⏱️  Deadline: cover thumbnails ditunda ke run berikutnya")
+    elif ENABLE_COVER_THUMBS and ENABLE_SUPABASE_UPLOAD and supabase and output_data:
+        print(f"\n🖼️  Memproses cover thumbnails...")
+        covers = [(comic['slug'], comic.get('cover_url')) for comic in output_data]
+        hash_store = CoverHashStore(COVER_HASH_FILE)
+        cover_stats = process_covers(covers, supabase, BUCKET_NAME, get_http_client(), hash_store,
+                                     max_processes=COVER_THUMB_PROCESSES, recheck_days=COVER_RECHECK_DAYS)
+        hash_store.save()
+        print(f"  ✓ Cover: {cover_stats['processed']} diproses, {cover_stats['unchanged']} tidak berubah, "
+              f"{cover_stats['failed']} gagal")
 
     print(f"\n{'='*60}")
     print(f"✅ SCRAPING SELESAI!")
@@ -1086,11 +1720,25 @@ def main():
     total_chapters = sum(len(comic['chapters']) for comic in output_data)
     print(f"📚 Total chapters: {total_chapters}")
     total_images = sum(
-        sum(ch['total_images'] for ch in comic['chapters'])
+        sum(ch.total_images for ch in comic['chapters'])
         for comic in output_data
     )
     print(f"📸 Total image links: {total_images}")
+    timing = _deadline.summary()
+    print(f"⏱️  Waktu run: {timing['elapsed_seconds']}s, estimasi per jenis: {timing['estimates']}")
+    report_deferred()
+    report_negative_cache()
+    report_dead_letters()
+    report_slug_registry()
+    if frontier is not None:
+        # Komik yang ditunda deadline tetap pending untuk run berikutnya
+        frontier.release('comic')
+        for kind, states in frontier.counts().items():
+            summary = ', '.join(f"{state} {count}" for state, count in sorted(states.items()))
+            print(f"🧭 Frontier {kind}: {summary}")
+        frontier.close()
+    print_http_pool_stats()
     print(f"{'='*60}")
 
 if __name__ == "__main__":
-    main()
+    main(parse_args())
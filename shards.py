@@ -0,0 +1,112 @@
+"""
+SHARDED EXECUTION HELPERS
+=========================
+Membagi katalog komik ke beberapa shard (runner/process paralel) berdasarkan
+hash stabil dari slug, sehingga komik yang sama selalu jatuh ke shard yang sama
+di setiap run.
+
+Pemakaian:
+    python scrape_links_only.py --shard 1/4     # shard pertama dari 4
+    python shards.py merge manga_local_image_links.json
+
+Setiap shard menulis file progress/output sendiri, misalnya
+manga_local_image_links.shard-1-of-4.json, lalu step merge menggabungkannya.
+"""
+
+import glob
+import hashlib
+import json
+import os
+import re
+import sys
+
+from chapter_diff import merge_chapter_lists
+from json_stream import write_json_stream
+
+
+def parse_shard(spec):
+    """Parse '1/4' -> (1, 4). Index shard dimulai dari 1."""
+    match = re.fullmatch(r'\s*(\d+)\s*/\s*(\d+)\s*', spec or '')
+    if not match:
+        raise ValueError(f"Format shard tidak valid: '{spec}' (contoh: 1/4)")
+    index, count = int(match.group(1)), int(match.group(2))
+    if count < 1 or not 1 <= index <= count:
+        raise ValueError(f"Shard {index}/{count} di luar range (1..{count})")
+    return index, count
+
+
+def shard_of(key, count):
+    """Shard (1..count) untuk sebuah key, stabil antar run dan antar mesin."""
+    digest = hashlib.sha1(key.encode('utf-8')).digest()
+    return int.from_bytes(digest[:8], 'big') % count + 1
+
+
+def in_shard(key, index, count):
+    return count <= 1 or shard_of(key, count) == index
+
+
+def shard_path(path, index, count):
+    """'output.json' -> 'output.shard-1-of-4.json'"""
+    root, ext = os.path.splitext(path)
+    return f"{root}.shard-{index}-of-{count}{ext}"
+
+
+def find_shard_files(path):
+    root, ext = os.path.splitext(path)
+    return sorted(glob.glob(f"{glob.escape(root)}.shard-*-of-*{ext}"))
+
+
+def merge_comic_entries(previous, item):
+    """Gabungkan dua entry output untuk komik yang sama.
+
+    Output shard hanya berisi chapter baru run itu, jadi daftar chapter
+    digabung per key kanonik (merge_chapter_lists): chapter lama tetap ada,
+    chapter dengan key sama diganti versi terbaru. Field lain dari entry terbaru.
+    """
+    chapters = merge_chapter_lists(previous.get('chapters'), item.get('chapters'))
+    return {**previous, **item, 'chapters': chapters}
+
+
+def merge_shard_outputs(path, remove_parts=False):
+    """Gabungkan semua file output shard ke `path`.
+
+    Hasil per komik di-dedupe berdasarkan slug (file output lama di `path`
+    ikut digabung); entry komik yang sama digabung lewat merge_comic_entries.
+    Returns: jumlah komik hasil merge.
+    """
+    merged = {}
+    sources = ([path] if os.path.exists(path) else []) + find_shard_files(path)
+
+    for source in sources:
+        try:
+            with open(source, 'r', encoding='utf-8') as f:
+                items = json.load(f)
+        except (json.JSONDecodeError, OSError) as e:
+            print(f"⚠️  Skip {source}: {e}")
+            continue
+        for item in items if isinstance(items, list) else []:
+            key = item.get('slug') or item.get('title')
+            merged[key] = merge_comic_entries(merged[key], item) if key in merged else item
+        print(f"  + {source}: {len(items)} komik")
+
+    write_json_stream(path, list(merged.values()))
+
+    if remove_parts:
+        for source in find_shard_files(path):
+            os.remove(source)
+
+    return len(merged)
+
+
+def main():
+    if len(sys.argv) < 3 or sys.argv[1] != 'merge':
+        print("Usage: python shards.py merge <output_file> [--remove-parts]")
+        sys.exit(1)
+
+    path = sys.argv[2]
+    total = merge_shard_outputs(path, remove_parts='--remove-parts' in sys.argv)
+    print(f"✅ Merge selesai: {total} komik -> {path}")
+
+
+if __name__ == "__main__":
+    main()
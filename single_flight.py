@@ -0,0 +1,151 @@
+"""
+SINGLE-FLIGHT + RESPONSE MEMO
+=============================
+Lapisan di depan fetch halaman supaya URL yang sama tidak di-download dua
+kali dalam satu run:
+
+- Single-flight: caller concurrent untuk URL yang sama menunggu satu request
+  yang sedang berjalan (leader) dan memakai hasil yang sama.
+- Memo: response yang sukses disimpan (body dikompres zlib) di LRU dengan
+  batas jumlah entry dan total byte, lalu dipakai ulang oleh caller berikutnya
+  (mis. halaman detail: has_new_chapters lalu process_comic).
+
+Error tidak di-memo: hanya dibagikan ke caller yang sedang menunggu, caller
+berikutnya mencoba lagi.
+"""
+
+import threading
+import zlib
+from collections import OrderedDict
+
+
+class MemoResponse:
+    """Snapshot response (read-only) dari memo: content, encoding, status_code, url, headers."""
+
+    __slots__ = ('url', 'status_code', 'encoding', 'headers', '_compressed')
+
+    def __init__(self, url, status_code, encoding, headers, content):
+        self.url = url
+        self.status_code = status_code
+        self.encoding = encoding
+        self.headers = dict(headers or {})
+        self._compressed = zlib.compress(content, 1)
+
+    @classmethod
+    def from_response(cls, response):
+        return cls(str(response.url), response.status_code, response.encoding,
+                   response.headers, response.content)
+
+    @property
+    def content(self):
+        return zlib.decompress(self._compressed)
+
+    @property
+    def text(self):
+        return self.content.decode(self.encoding or 'utf-8', errors='replace')
+
+    @property
+    def size(self):
+        return len(self._compressed)
+
+    def raise_for_status(self):
+        pass
+
+
+class _Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Coalescing request per key + memo LRU terbatas.
+
+    Contoh:
+        flight = SingleFlight(max_entries=512, max_bytes=64 * 1024 * 1024)
+        response = flight.do(url, lambda: fetch(url))
+    """
+
+    def __init__(self, max_entries=512, max_bytes=64 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._inflight = {}
+        self._memo = OrderedDict()
+        self._memo_bytes = 0
+        self.calls = 0
+        self.fetches = 0
+        self.coalesced = 0
+        self.memo_hits = 0
+        self.evictions = 0
+
+    def do(self, key, fetch, memo=True):
+        """Jalankan fetch() sekali untuk key; caller lain ikut menunggu/memakai memo."""
+        with self._lock:
+            self.calls += 1
+            cached = self._memo.get(key)
+            if cached is not None:
+                self._memo.move_to_end(key)
+                self.memo_hits += 1
+                return cached
+            flight = self._inflight.get(key)
+            leader = flight is None
+            if leader:
+                flight = _Flight()
+                self._inflight[key] = flight
+                self.fetches += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            response = fetch()
+            flight.result = response
+            if memo:
+                self._remember(key, MemoResponse.from_response(response))
+            return response
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            flight.done.set()
+
+    def _remember(self, key, snapshot):
+        if snapshot.size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._memo.pop(key, None)
+            if old is not None:
+                self._memo_bytes -= old.size
+            self._memo[key] = snapshot
+            self._memo_bytes += snapshot.size
+            while self._memo and (len(self._memo) > self.max_entries or self._memo_bytes > self.max_bytes):
+                _, evicted = self._memo.popitem(last=False)
+                self._memo_bytes -= evicted.size
+                self.evictions += 1
+
+    def forget(self, key):
+        with self._lock:
+            old = self._memo.pop(key, None)
+            if old is not None:
+                self._memo_bytes -= old.size
+
+    def stats(self):
+        with self._lock:
+            return {
+                'calls': self.calls,
+                'fetches': self.fetches,
+                'coalesced': self.coalesced,
+                'memo_hits': self.memo_hits,
+                'memo_entries': len(self._memo),
+                'memo_bytes': self._memo_bytes,
+                'evictions': self.evictions,
+            }
@@ -0,0 +1,206 @@
+"""
+SITEMAP DISCOVERY
+=================
+Bangun katalog komik (format komikindo_scrape_results.json) dari XML sitemap
+WordPress, bukan dengan menelusuri halaman daftar-manga.
+
+- Sitemap index dicoba dari beberapa lokasi umum (Yoast / WP core)
+- Sitemap per tipe yang berisi komik (nama mengandung 'komik') di-stream dan
+  di-parse incremental (XMLPullParser), termasuk .xml.gz
+- lastmod per halaman komik dibandingkan dengan state (STATE_DIR/sitemap_lastmod.json):
+  hanya komik dengan lastmod berubah/baru yang perlu dicek
+- lastmod baru di-commit setelah komik selesai dicek/diproses (seperti fingerprint)
+- lastmod dinormalisasi ke UTC ('2026-01-15T05:00:00Z') sebelum disimpan/dibandingkan,
+  jadi `modified_gmt` wp-json dan `<lastmod>` sitemap untuk waktu yang sama dianggap sama
+
+Bisa dijalankan langsung untuk update katalog lokal:
+    python sitemap_discovery.py
+"""
+
+import json
+import re
+import sys
+import zlib
+from datetime import datetime, timezone
+from urllib.parse import urljoin, urlsplit
+from xml.etree.ElementTree import XMLPullParser
+
+from state_store import JsonStateStore
+
+SITEMAP_INDEX_CANDIDATES = ('/sitemap_index.xml', '/wp-sitemap.xml', '/sitemap.xml')
+COMIC_SITEMAP_RE = re.compile(r'komik', re.IGNORECASE)  # Nama file sitemap per tipe yang berisi halaman komik
+COMIC_URL_RE = re.compile(r'/komik/([^/]+)/?$')
+
+_SITEMAP_NS = '{http://www.sitemaps.org/schemas/sitemap/0.9}'
+_IMAGE_NS = '{http://www.google.com/schemas/sitemap-image/1.1}'
+
+
+def comic_slug_from_url(url):
+    """'https://komikindo.ch/komik/179384-solo-leveling/' -> 'solo-leveling' (sama dengan listing)."""
+    match = COMIC_URL_RE.search(url or '')
+    if not match:
+        return ''
+    return re.sub(r'^\d+-', '', match.group(1))
+
+
+def catalog_slug(comic):
+    """Key sitemap untuk entry katalog: slug dari Link (field 'Slug' listing bisa berbeda,
+    mis. 'Unbeatable-Dungeons-Lazy-Boss-Monster' vs URL '...the-unbeatable-dungeons-...')."""
+    return comic_slug_from_url(comic.get('Link')) or (comic.get('Slug') or '').lower()
+
+
+def normalize_lastmod(value):
+    """Timestamp ISO 8601 apa pun -> UTC 'YYYY-MM-DDTHH:MM:SSZ'.
+    Tanpa zona waktu dianggap UTC (modified_gmt wp-json); tidak bisa di-parse -> apa adanya."""
+    value = (value or '').strip()
+    if not value:
+        return ''
+    try:
+        parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        return value
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+def clean_catalog_title(title):
+    """Bersihkan judul seperti Collect/detail_komik.py (prefix 'Komik ', apostrof, non-ASCII)."""
+    if title.startswith('Komik '):
+        title = title[6:]
+    title = title.replace('\ufffd', ' ').replace('\u2019', ' ').replace('\u2018', ' ')
+    title = title.replace("'", ' ')
+    title = title.replace('\u00e2\u0080\u0099', ' ')
+    title = ''.join(c if ord(c) < 128 else ' ' for c in title)
+    return ' '.join(title.split())
+
+
+def iter_sitemap(client, url, headers=None, timeout=30):
+    """Stream + parse satu sitemap. Yield dict per entry:
+    <sitemap> -> {'kind': 'sitemap', 'loc', 'lastmod'}
+    <url>     -> {'kind': 'url', 'loc', 'lastmod', 'image'}"""
+    parser = XMLPullParser(events=('end',))
+    gunzip = zlib.decompressobj(16 + zlib.MAX_WBITS) if url.endswith('.gz') else None
+
+    def drain():
+        for _, elem in parser.read_events():
+            tag = elem.tag
+            if tag in (_SITEMAP_NS + 'sitemap', _SITEMAP_NS + 'url'):
+                image = elem.find(f'{_IMAGE_NS}image/{_IMAGE_NS}loc')
+                yield {
+                    'kind': 'sitemap' if tag.endswith('sitemap') else 'url',
+                    'loc': (elem.findtext(_SITEMAP_NS + 'loc') or '').strip(),
+                    'lastmod': (elem.findtext(_SITEMAP_NS + 'lastmod') or '').strip(),
+                    'image': (image.text or '').strip() if image is not None else '',
+                }
+                elem.clear()
+
+    for chunk in client.iter_content(url, headers=headers, timeout=timeout):
+        parser.feed(gunzip.decompress(chunk) if gunzip else chunk)
+        yield from drain()
+    parser.close()
+    yield from drain()
+
+
+def find_sitemap_index(client, base_url, headers=None, timeout=30):
+    """Cari sitemap index yang tersedia. Returns: (url, list entry sitemap) atau (None, [])."""
+    for path in SITEMAP_INDEX_CANDIDATES:
+        url = urljoin(base_url, path)
+        try:
+            entries = [e for e in iter_sitemap(client, url, headers, timeout) if e['kind'] == 'sitemap']
+        except Exception:
+            continue
+        if entries:
+            return url, entries
+    return None, []
+
+
+def discover_comics(client, base_url, headers=None, timeout=30):
+    """Semua halaman komik dari sitemap.
+    Returns: dict {slug: {'link', 'lastmod', 'image'}} atau None jika sitemap tidak tersedia."""
+    index_url, sitemaps = find_sitemap_index(client, base_url, headers, timeout)
+    if not index_url:
+        return None
+
+    comics = {}
+    for sitemap in sitemaps:
+        filename = urlsplit(sitemap['loc']).path.rsplit('/', 1)[-1]
+        if not COMIC_SITEMAP_RE.search(filename):
+            continue
+        try:
+            for entry in iter_sitemap(client, sitemap['loc'], headers, timeout):
+                slug = comic_slug_from_url(entry['loc']) if entry['kind'] == 'url' else ''
+                if slug and slug not in comics:
+                    comics[slug] = {'link': entry['loc'], 'lastmod': normalize_lastmod(entry['lastmod']),
+                                    'image': entry['image']}
+        except Exception:
+            # Komik dari sitemap yang gagal tidak punya lastmod -> tetap dicek seperti biasa
+            continue
+    return comics
+
+
+class SitemapStateStore(JsonStateStore):
+    """State {slug: {'lastmod', 'excluded'}} dari sitemap run sebelumnya."""
+
+    def is_changed(self, slug, lastmod):
+        known = self.get(slug)
+        return (not lastmod or not known
+                or normalize_lastmod(known.get('lastmod')) != normalize_lastmod(lastmod))
+
+    def is_excluded(self, slug, lastmod):
+        """Komik di luar tipe katalog yang lastmod-nya belum berubah (tidak perlu dicek ulang)."""
+        known = self.get(slug)
+        return bool(known and known.get('excluded')
+                    and normalize_lastmod(known.get('lastmod')) == normalize_lastmod(lastmod))
+
+    def commit(self, slug, lastmod, excluded=False):
+        if lastmod:
+            self.put(slug, {'lastmod': normalize_lastmod(lastmod), 'excluded': excluded})
+
+
+def merge_catalog(catalog, discovered, resolve_new):
+    """Gabungkan hasil sitemap ke katalog (list dict Title/Link/Slug/Image/Type).
+
+    Entry lama dicocokkan lewat slug URL-nya (catalog_slug) dan dipertahankan di
+    posisinya (Link diperbarui jika berubah), komik baru di-resolve lewat
+    resolve_new(slug, info) -> entry katalog atau None (di-skip), lalu ditambahkan
+    di akhir. Returns: (katalog, list entry baru)
+    """
+    by_slug = {}
+    for comic in catalog:
+        by_slug.setdefault(catalog_slug(comic), comic)
+    added = []
+    for slug, info in discovered.items():
+        comic = by_slug.get(slug)
+        if comic is not None:
+            if info['link'] and comic.get('Link') != info['link']:
+                comic['Link'] = info['link']
+            continue
+        entry = resolve_new(slug, info)
+        if entry:
+            by_slug[slug] = entry
+            added.append(entry)
+    return catalog + added, added
+
+
+def main():
+    """Update katalog lokal dari sitemap (tanpa commit lastmod)."""
+    import scrape_links_only as scraper
+
+    source = sys.argv[1] if len(sys.argv) > 1 else scraper.JSON_FILE
+    comics_data = []
+    try:
+        with open(source, 'r', encoding='utf-8') as f:
+            comics_data = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        pass
+
+    comics_data, changed = scraper.run_sitemap_discovery(comics_data, source)
+    if changed is None:
+        print("✗ Sitemap tidak tersedia")
+        return
+    print(f"✅ Katalog: {len(comics_data)} komik, {len(changed)} berubah sejak run terakhir")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""
+SLUG REGISTRY
+=============
+Satu key kanonik (nama folder di storage) untuk setiap komik, apa pun key
+yang dipakai sumbernya:
+
+    id:124162                                         ID numerik di URL
+    url:124162-the-unbeatable-dungeons-lazy-boss-monster
+    slug:the-unbeatable-dungeons-lazy-boss-monster    slug URL tanpa ID (all-manhwa, sitemap, wp-json)
+    listing:unbeatable-dungeons-lazy-boss-monster     field 'Slug' listing
+    title:unbeatable-dungeons-lazy-boss-monster       sanitize_filename(Title)
+
+Komik yang pertama kali dilihat memakai folder dari judulnya (perilaku lama).
+Setelah itu alias yang lebih stabil (ID/slug URL) tetap menunjuk ke folder
+yang sama walaupun judul di listing berubah, jadi tidak ada folder baru dan
+chapter tidak di-scrape ulang dari nol.
+
+State (STATE_DIR/slug_registry.json):
+    {canonical: {'aliases': [...], 'title', 'link', 'updated_at'}}
+Index alias -> canonical dibangun di memori saat load (lookup O(1)).
+"""
+
+import re
+from datetime import datetime
+
+from state_store import JsonStateStore
+
+_URL_SLUG_RE = re.compile(r'/komik/([^/]+)/?$')
+_URL_ID_RE = re.compile(r'^(\d+)-')
+_TIME_FORMAT = '%Y-%m-%dT%H:%M:%S'
+_WEAK_ALIASES = ('listing:', 'title:')  # Bisa sama untuk dua komik berbeda
+
+
+def _conflicting(aliases, entry, matched, link):
+    """Alias cocok tapi entry milik komik lain: cocok hanya lewat judul/slug listing
+    sementara entry punya URL lain, atau ID URL kedua komik berbeda (mis. '111-hero'
+    dan '222-hero' sama-sama punya alias 'slug:hero')."""
+    entry_aliases = entry.get('aliases', [])
+    if matched.startswith(_WEAK_ALIASES) and link and any(alias.startswith('url:') for alias in entry_aliases):
+        return True
+    ids = {alias for alias in aliases if alias.startswith('id:')}
+    entry_ids = {alias for alias in entry_aliases if alias.startswith('id:')}
+    return bool(ids and entry_ids and ids.isdisjoint(entry_ids))
+
+
+def sanitize_filename(name):
+    """Membersihkan nama file dari karakter tidak valid untuk Supabase Storage"""
+    # Hapus karakter tidak valid untuk filesystem dan Supabase
+    # Termasuk: \ / * ? : " < > | ' ` ! @ # $ % ^ & ( ) [ ] { } = + ~ ,
+    cleaned = re.sub(r'[\\/*?:"<>|\'`!@#$%^&()\[\]{}=+~,]', "", name)
+    # Hapus whitespace berlebih (spasi, tab, newline, dll)
+    cleaned = re.sub(r'\s+', ' ', cleaned)
+    # Ganti spasi dengan dash dan lowercase
+    cleaned = cleaned.strip().replace(' ', '-').lower()
+    # Hapus dash berlebih (jika ada)
+    cleaned = re.sub(r'-+', '-', cleaned)
+    # Hapus dash di awal dan akhir
+    cleaned = cleaned.strip('-')
+    return cleaned
+
+
+def comic_aliases(link=None, slug=None, title=None):
+    """Alias sebuah komik, urut dari yang paling stabil (ID URL) ke yang paling lemah (judul)."""
+    aliases = []
+    match = _URL_SLUG_RE.search(link or '')
+    if match:
+        url_slug = match.group(1).lower()
+        id_match = _URL_ID_RE.match(url_slug)
+        if id_match:
+            aliases.append(f"id:{id_match.group(1)}")
+        aliases.append(f"url:{url_slug}")
+        aliases.append(f"slug:{_URL_ID_RE.sub('', url_slug)}")
+    if slug:
+        aliases.append(f"listing:{slug.lower()}")
+    if title:
+        aliases.append(f"title:{sanitize_filename(title)}")
+    return list(dict.fromkeys(alias for alias in aliases if not alias.endswith(':')))
+
+
+class SlugRegistry(JsonStateStore):
+    """canonical -> entry yang dipersist, plus index alias -> canonical di memori."""
+
+    def __init__(self, path):
+        super().__init__(path)
+        self._aliases = {}
+        for canonical, entry in self._data.items():
+            for alias in entry.get('aliases', []):
+                self._aliases.setdefault(alias, canonical)
+        self.renamed = 0  # Komik yang judulnya berubah tapi dipetakan ke folder lama (run ini)
+
+    def resolve(self, *aliases):
+        """Key kanonik untuk alias pertama yang dikenal (None jika belum terdaftar).
+        Alias yang cocok dengan komik ber-ID URL lain diabaikan."""
+        with self._lock:
+            for alias in aliases:
+                canonical = self._aliases.get(alias)
+                if canonical is not None and not _conflicting(aliases, self._data.get(canonical, {}), alias, None):
+                    return canonical
+        return None
+
+    def canonical(self, link=None, slug=None, title=None):
+        """Key kanonik (folder storage) sebuah komik; komik baru didaftarkan dengan
+        folder dari judulnya. Alias baru (mis. judul baru) ditambahkan ke entry."""
+        aliases = comic_aliases(link, slug, title)
+        title_folder = sanitize_filename(title or '')
+        with self._lock:
+            matched = next((alias for alias in aliases if alias in self._aliases), None)
+            if matched is None:
+                canonical = title_folder or next((alias.split(':', 1)[1] for alias in aliases), '')
+                if not canonical:
+                    return canonical
+            else:
+                canonical = self._aliases[matched]
+                if _conflicting(aliases, self._data.get(canonical, {}), matched, link):
+                    # Judul/slug sama dengan komik lain (URL/ID berbeda): folder tetap
+                    # dipakai bersama seperti sebelumnya, entry tidak digabung
+                    return canonical
+                if title_folder and title_folder != canonical and f"title:{title_folder}" not in self._aliases:
+                    self.renamed += 1
+            entry = self._data.setdefault(canonical, {'aliases': []})
+            changed = False
+            for alias in aliases:
+                # Alias milik komik lain (mis. judul sama) tidak diambil alih
+                if self._aliases.setdefault(alias, canonical) == canonical and alias not in entry['aliases']:
+                    entry['aliases'].append(alias)
+                    changed = True
+            if changed or entry.get('link') != link:
+                entry.update(title=title or entry.get('title'), link=link or entry.get('link'),
+                             updated_at=datetime.now().strftime(_TIME_FORMAT))
+            return canonical
+
+    def summary(self):
+        """{'comics', 'aliases', 'renamed'} untuk laporan run."""
+        with self._lock:
+            return {'comics': len(self._data), 'aliases': len(self._aliases), 'renamed': self.renamed}
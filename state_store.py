@@ -0,0 +1,76 @@
+"""
+STATE STORE
+===========
+Penyimpanan state sederhana berbasis file JSON di STATE_DIR (di-cache antar
+run oleh workflow). Thread-safe, simpan secara atomic (tulis .tmp lalu rename).
+"""
+
+import json
+import os
+import tempfile
+import threading
+
+
+class JsonStateStore:
+    """Dict {key: value} yang dipersist ke satu file JSON."""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()  # Satu save dalam satu waktu: snapshot terbaru yang terakhir ditulis
+        self._data = {}
+        if path and os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                    if isinstance(data, dict):
+                        self._data = data
+            except (json.JSONDecodeError, OSError):
+                self._data = {}
+
+    def get(self, key, default=None):
+        with self._lock:
+            return self._data.get(key, default)
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = value
+
+    def pop(self, key, default=None):
+        with self._lock:
+            return self._data.pop(key, default)
+
+    def items(self):
+        with self._lock:
+            return list(self._data.items())
+
+    def save(self):
+        if not self.path:
+            return
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._save_lock:
+            with self._lock:
+                snapshot = dict(self._data)
+            # File .tmp unik di folder yang sama (rename tetap atomic, tidak bentrok antar proses)
+            fd, tmp_path = tempfile.mkstemp(prefix=os.path.basename(self.path) + '.', suffix='.tmp',
+                                            dir=directory or None)
+            try:
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    json.dump(snapshot, f, ensure_ascii=False)
+                os.replace(tmp_path, self.path)
+            except BaseException:
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+                raise
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._data
+
+    def __len__(self):
+        with self._lock:
+            return len(self._data)
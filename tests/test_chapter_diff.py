@@ -0,0 +1,82 @@
+import pytest
+
+from chapter_diff import (canonical_chapter_key, chapters_to_fetch, diff_chapter_lists, merge_chapter_lists,
+                          stored_chapter_key, website_chapter_key)
+
+
+@pytest.mark.parametrize('title, expected', [
+    ('Chapter 12', 'ch:12'),
+    ('Chapter 012', 'ch:12'),
+    ('ch-12.5', 'ch:12.5'),
+    ('Ch. 12.50', 'ch:12.5'),
+    ('chapter 12-1', 'ch:12.1'),  # '-' di antara angka = desimal (slug URL '12-5')
+    ('Chapter 12 - End', 'ch:12'),
+    ('CHAPTER_7', 'ch:7'),
+    ('Oneshot', 'title:oneshot'),
+    ('Special   Episode', 'title:special episode'),
+])
+def test_chapter_number_from_title(title, expected):
+    assert canonical_chapter_key(title) == expected
+
+
+def test_key_falls_back_to_url_then_stored_slug():
+    assert canonical_chapter_key('', 'https://komikindo.ch/solo-leveling-chapter-12-5/') == 'ch:12.5'
+    assert canonical_chapter_key('', '', 'chapter-3') == 'ch:3'
+    assert canonical_chapter_key('Extra', 'https://komikindo.ch/Solo-Leveling-Extra/') == 'url:solo-leveling-extra'
+    # Judul menang atas URL
+    assert canonical_chapter_key('Chapter 12', 'https://komikindo.ch/solo-leveling-chapter-13/') == 'ch:12'
+
+
+def test_website_and_stored_keys_match_for_same_chapter():
+    website = {'chapter': 'Chapter 12.5', 'link': 'https://komikindo.ch/solo-leveling-chapter-12-5/'}
+    stored = {'title': 'Chapter 12.5', 'slug': 'chapter-12-5',
+              'url': 'https://komikindo.ch/solo-leveling-chapter-12-5/'}
+    assert website_chapter_key(website) == stored_chapter_key(stored)
+
+
+def _web(number, link=None):
+    return {'chapter': f'Chapter {number}', 'link': link or f'https://komikindo.ch/solo-leveling-chapter-{number}/'}
+
+
+def _stored(number, url=None, images=3):
+    return {'title': f'Chapter {number}', 'slug': f'chapter-{number}',
+            'url': url or f'https://komikindo.ch/solo-leveling-chapter-{number}/', 'total_images': images}
+
+
+def test_diff_added_changed_removed_unchanged():
+    website = [_web(4), _web(3, 'https://komikindo.ch/solo-leveling-chapter-3-reupload/'), _web(2), _web(2)]
+    stored = [_stored(1), _stored(2), _stored(3)]
+
+    diff = diff_chapter_lists(website, stored)
+
+    assert diff['added'] == [_web(4)]
+    assert [ch['chapter'] for ch in diff['changed']] == ['Chapter 3']
+    assert diff['removed'] == [_stored(1)]
+    assert diff['unchanged'] == 1  # Chapter 2 (duplikat di website dihitung sekali)
+    assert chapters_to_fetch(diff) == diff['added'] + diff['changed']
+
+
+def test_shrinking_list_never_triggers_rescrape():
+    diff = diff_chapter_lists([_web(5)], [_stored(n) for n in range(1, 6)])
+    assert chapters_to_fetch(diff) == []
+    assert len(diff['removed']) == 4
+
+
+def test_stored_chapter_without_images_is_refetched():
+    diff = diff_chapter_lists([_web(1)], [_stored(1, images=0)])
+    assert diff['changed'] == [_web(1)]
+
+
+def test_url_comparison_ignores_case_and_trailing_slash():
+    diff = diff_chapter_lists([_web(1, 'https://komikindo.ch/Solo-Leveling-Chapter-1')], [_stored(1)])
+    assert diff['unchanged'] == 1
+
+
+def test_merge_replaces_same_key_in_place_and_keeps_removed():
+    stored = [_stored(1), _stored(2), _stored(3)]
+    reuploaded = _stored(2, url='https://komikindo.ch/solo-leveling-chapter-2-v2/', images=9)
+    # Re-upload chapter 2 (URL baru): key sama -> diganti di posisinya, tidak duplikat
+    merged = merge_chapter_lists(stored, [reuploaded, _stored(4)])
+    assert [ch['title'] for ch in merged] == ['Chapter 1', 'Chapter 2', 'Chapter 3', 'Chapter 4']
+    assert merged[1]['total_images'] == 9
+    assert merge_chapter_lists(None, [_stored(1)]) == [_stored(1)]
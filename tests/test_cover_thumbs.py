@@ -0,0 +1,138 @@
+import io
+import threading
+
+import pytest
+
+Image = pytest.importorskip('PIL.Image')
+
+import cover_thumbs
+from cover_thumbs import CoverHashStore, process_covers
+from state_store import JsonStateStore
+
+
+class _Response:
+    def __init__(self, content, status_code=200, headers=None):
+        self.content = content
+        self.status_code = status_code
+        self.headers = headers or {}
+
+
+class _Client:
+    """Server cover: ETag opsional, 304 jika If-None-Match cocok."""
+
+    def __init__(self, content, etag=None):
+        self.content = content
+        self.etag = etag
+        self.requests = []
+
+    def get(self, url, headers=None, timeout=None):
+        self.requests.append(dict(headers or {}))
+        if self.etag and (headers or {}).get('If-None-Match') == self.etag:
+            return _Response(b'', status_code=304)
+        return _Response(self.content, headers={'ETag': self.etag} if self.etag else {})
+
+
+class _Bucket:
+    def __init__(self):
+        self.uploaded = []
+        self._lock = threading.Lock()
+
+    def from_(self, bucket_name):
+        return self
+
+    def upload(self, path, data, options):
+        with self._lock:
+            self.uploaded.append(path)
+
+
+class _Supabase:
+    def __init__(self):
+        self.storage = _Bucket()
+
+
+def _png(width=600, height=900, color=(200, 40, 40)):
+    buffer = io.BytesIO()
+    Image.new('RGB', (width, height), color).save(buffer, format='PNG')
+    return buffer.getvalue()
+
+
+def test_process_covers_uses_spawn_pool_while_threads_are_running(tmp_path, monkeypatch):
+    contexts = []
+    real_pool = cover_thumbs.ProcessPoolExecutor
+
+    def recording_pool(*args, **kwargs):
+        contexts.append(kwargs['mp_context'].get_start_method())
+        return real_pool(*args, **kwargs)
+
+    monkeypatch.setattr(cover_thumbs, 'ProcessPoolExecutor', recording_pool)
+
+    # Thread lain yang sedang memegang lock, seperti pool HTTP saat scraper berjalan
+    held = threading.Lock()
+    held.acquire()
+    busy = threading.Thread(target=lambda: held.acquire(timeout=30), daemon=True)
+    busy.start()
+    try:
+        supabase = _Supabase()
+        store = CoverHashStore(str(tmp_path / 'cover_hashes.json'))
+        stats = process_covers([('solo-leveling', 'https://img.example/solo.png')], supabase, 'bucket',
+                               _Client(_png()), store, max_processes=1)
+    finally:
+        held.release()
+        busy.join()
+
+    assert contexts == ['spawn']
+    assert stats == {'processed': 1, 'unchanged': 0, 'failed': 0}
+    assert sorted(supabase.storage.uploaded) == [
+        f"solo-leveling/cover-{width}.webp" for width in sorted(cover_thumbs.COVER_THUMB_WIDTHS)]
+
+
+def _run(store, client):
+    supabase = _Supabase()
+    stats = process_covers([('solo-leveling', 'https://img.example/solo.png')], supabase, 'bucket',
+                           client, store, max_processes=1)
+    return stats, supabase.storage.uploaded
+
+
+def test_cover_replaced_at_same_url_is_reprocessed(tmp_path):
+    store = CoverHashStore(str(tmp_path / 'cover_hashes.json'))
+    first = _Client(_png(), etag='"v1"')
+    assert _run(store, first)[0]['processed'] == 1
+
+    # Validator sama -> 304, tanpa body / upload
+    stats, uploaded = _run(store, first)
+    assert stats == {'processed': 0, 'unchanged': 1, 'failed': 0}
+    assert first.requests[-1]['If-None-Match'] == '"v1"'
+    assert uploaded == []
+
+    # Gambar diganti di URL yang sama: ETag baru -> diproses ulang
+    replaced = _Client(_png(color=(10, 120, 200)), etag='"v2"')
+    stats, uploaded = _run(store, replaced)
+    assert stats['processed'] == 1
+    assert len(uploaded) == len(cover_thumbs.COVER_THUMB_WIDTHS)
+    assert store.get('solo-leveling')['etag'] == '"v2"'
+
+
+def expire(store):
+    JsonStateStore.put(store, 'solo-leveling', dict(store.get('solo-leveling'), checked_at='2020-01-01T00:00:00'))
+
+
+def test_cover_without_validators_is_rehashed_after_recheck_days(tmp_path):
+    store = CoverHashStore(str(tmp_path / 'cover_hashes.json'))
+    client = _Client(_png())
+    _run(store, client)
+
+    # Baru dicek: tidak ada request sama sekali
+    assert _run(store, client)[0]['unchanged'] == 1
+    assert len(client.requests) == 1
+
+    # checked_at kedaluwarsa: di-download + hash ulang, isi sama -> tidak di-upload
+    expire(store)
+    stats, uploaded = _run(store, client)
+    assert len(client.requests) == 2
+    assert stats == {'processed': 0, 'unchanged': 1, 'failed': 0}
+    assert uploaded == []
+
+    # checked_at kedaluwarsa + gambar diganti -> diproses ulang
+    expire(store)
+    client.content = _png(color=(0, 0, 0))
+    assert _run(store, client)[0]['processed'] == 1
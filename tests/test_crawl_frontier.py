@@ -0,0 +1,98 @@
+import time
+
+from crawl_frontier import PRIORITY_CARRIED, PRIORITY_DEFAULT, CrawlFrontier
+
+SOLO = 'https://komikindo.ch/komik/179384-solo-leveling/'
+NANO = 'https://komikindo.ch/komik/nano-machine/'
+READER = 'https://komikindo.ch/komik/omniscient-reader/'
+
+
+def _frontier(tmp_path):
+    return CrawlFrontier(str(tmp_path / 'frontier.sqlite3'))
+
+
+def test_take_leases_by_priority_and_insertion_order(tmp_path):
+    frontier = _frontier(tmp_path)
+    frontier.add_many('detail', [(SOLO, PRIORITY_DEFAULT, None), (NANO, PRIORITY_DEFAULT, {'title': 'Nano'})])
+    frontier.add('detail', READER, priority=PRIORITY_CARRIED)
+
+    leased = frontier.take('detail')
+    assert [item['url'] for item in leased] == [READER, SOLO, NANO]
+    assert leased[2]['payload'] == {'title': 'Nano'}
+    assert frontier.take('detail') == []  # Sudah di-lease semua
+    assert frontier.counts() == {'detail': {'leased': 3}}
+    frontier.close()
+
+
+def test_add_ignores_urls_seen_this_cycle(tmp_path):
+    frontier = _frontier(tmp_path)
+    assert frontier.add('comic', SOLO, payload={'new': 1})
+    frontier.take('comic')
+    frontier.done('comic', SOLO)
+    assert not frontier.add('comic', SOLO, payload={'new': 2})
+    assert frontier.add_many('comic', [(SOLO, PRIORITY_DEFAULT, None), (NANO, PRIORITY_DEFAULT, None)]) == 1
+    assert frontier.take('comic')[0]['url'] == NANO
+    frontier.close()
+
+
+def test_recover_returns_leases_of_crashed_run(tmp_path):
+    path = str(tmp_path / 'frontier.sqlite3')
+    crashed = CrawlFrontier(path)
+    crashed.add_many('detail', [(SOLO, PRIORITY_DEFAULT, None), (NANO, PRIORITY_DEFAULT, None)])
+    crashed.take('detail')
+    crashed.done('detail', SOLO)
+    crashed.close()  # Run berhenti dengan NANO masih leased
+
+    frontier = CrawlFrontier(path)
+    assert frontier.recover() == 1
+    assert [item['url'] for item in frontier.take('detail')] == [NANO]
+    frontier.close()
+
+
+def test_retry_backs_off_then_fails_after_budget(tmp_path):
+    frontier = _frontier(tmp_path)
+    frontier.add('comic', SOLO)
+    frontier.take('comic')
+
+    assert frontier.retry('comic', SOLO, base_delay=60, max_attempts=3, error='503')
+    assert frontier.take('comic') == []  # Belum eligible (backoff)
+
+    frontier.retry('comic', SOLO, base_delay=0, max_attempts=3)
+    item = frontier.take('comic')[0]
+    assert item['attempts'] == 2
+    assert not frontier.retry('comic', SOLO, base_delay=0, max_attempts=3, error='503')
+    assert frontier.counts() == {'comic': {'failed': 1}}
+    frontier.close()
+
+
+def test_release_puts_leased_items_back(tmp_path):
+    frontier = _frontier(tmp_path)
+    frontier.add_many('comic', [(SOLO, PRIORITY_DEFAULT, None), (NANO, PRIORITY_DEFAULT, None)])
+    frontier.take('comic')
+    frontier.release('comic', SOLO)
+    assert [item['url'] for item in frontier.take('comic')] == [SOLO]
+    frontier.release('comic')
+    assert len(frontier.take('comic')) == 2
+    frontier.close()
+
+
+def test_new_cycle_forgets_finished_items_and_carries_pending(tmp_path):
+    frontier = _frontier(tmp_path)
+    assert frontier.cycle_started() is None
+    frontier.add_many('detail', [(SOLO, PRIORITY_DEFAULT, None), (NANO, PRIORITY_DEFAULT, None),
+                                 (READER, PRIORITY_DEFAULT, None)])
+    frontier.take('detail', limit=2)
+    frontier.done('detail', SOLO)
+    frontier.retry('detail', NANO, base_delay=3600, max_attempts=5)  # Pending, backoff panjang
+
+    before = time.time()
+    assert frontier.new_cycle() == 2  # NANO + READER dibawa
+    assert frontier.cycle_started() >= before
+
+    # SOLO boleh ditambahkan lagi; item yang dibawa langsung eligible dengan prioritas tertinggi
+    assert frontier.add('detail', SOLO)
+    items = frontier.take('detail')
+    assert [item['url'] for item in items] == [NANO, READER, SOLO]
+    assert [item['priority'] for item in items] == [PRIORITY_CARRIED, PRIORITY_CARRIED, PRIORITY_DEFAULT]
+    assert items[0]['attempts'] == 0
+    frontier.close()
@@ -0,0 +1,43 @@
+import threading
+
+import pytest
+
+pytest.importorskip('requests')
+
+from http_pool import _HostPool
+
+
+class _Session:
+    def close(self):
+        pass
+
+
+def test_factory_failure_does_not_leak_slots():
+    attempts = []
+
+    def factory():
+        attempts.append(1)
+        if len(attempts) <= 5:
+            raise OSError('gagal membuat session')
+        return _Session()
+
+    pool = _HostPool('https://komikindo.ch', 2, factory)
+    failures = []
+    sessions = []
+
+    def run():
+        for _ in range(5):
+            try:
+                pool.acquire()
+            except OSError:
+                failures.append(1)
+        sessions.extend(pool.acquire() for _ in range(2))
+
+    # Slot yang bocor membuat acquire menunggu selamanya, jadi dijalankan di thread dengan timeout
+    worker = threading.Thread(target=run, daemon=True)
+    worker.start()
+    worker.join(timeout=5)
+
+    assert len(failures) == 5
+    assert len(sessions) == 2
+    assert pool.sessions_opened == 2
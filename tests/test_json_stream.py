@@ -0,0 +1,48 @@
+import json
+
+import pytest
+
+from compact_records import ChapterRecord, compact_comic, json_default
+from json_stream import iter_json, write_json_stream
+
+
+def _comic():
+    return {
+        'slug': 'solo-leveling',
+        'title': 'Solo Leveling',
+        'chapters': [
+            {'slug': 'chapter-1', 'title': 'Chapter 1', 'url': 'https://komikindo.ch/solo-leveling-chapter-1/',
+             'waktu_rilis': '2024-01-01T00:00:00+07:00', 'total_images': 2,
+             'images': ['https://cdn.example/uploads/2024/01/001.jpg', 'https://cdn.example/uploads/2024/01/002.jpg']},
+        ],
+    }
+
+
+def test_write_json_stream_uses_default_for_chapter_records(tmp_path):
+    path = tmp_path / 'output.json'
+    data = [compact_comic(_comic())]
+    assert isinstance(data[0]['chapters'][0], ChapterRecord)
+
+    write_json_stream(str(path), data, default=json_default)
+
+    assert path.read_text(encoding='utf-8') == json.dumps([_comic()], ensure_ascii=False, indent=2)
+
+
+def test_iter_json_without_indent_uses_default():
+    text = ''.join(iter_json([compact_comic(_comic())], indent=None, default=json_default))
+    assert json.loads(text) == [_comic()]
+
+
+def test_save_output_load_output_round_trip(tmp_path, monkeypatch):
+    # scrape_links_only butuh dependency scraper penuh (supabase, curl_cffi, ...)
+    pytest.importorskip('supabase')
+    import scrape_links_only as scraper
+
+    monkeypatch.setattr(scraper, 'OUTPUT_FILE', str(tmp_path / 'manga_local_image_links.json'))
+    data = [compact_comic(_comic())]
+
+    scraper.save_output(data)
+    loaded = scraper.load_output()
+
+    assert [ch.to_dict() for ch in loaded[0]['chapters']] == _comic()['chapters']
+    assert loaded[0]['title'] == 'Solo Leveling'
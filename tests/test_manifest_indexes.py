@@ -0,0 +1,115 @@
+import importlib
+import json
+
+import pytest
+
+from manifest_indexes import INDEX_META_PATH, build_indexes, changed_index_paths, index_paths, stale_index_paths
+
+
+def _catalog():
+    return [
+        {'slug': 'solo-leveling', 'title': 'Solo Leveling', 'genres': ['Action', 'Fantasy'], 'type': 'Manhwa',
+         'status': 'Completed', 'lastUpdateTime': '2026-01-03T00:00:00+07:00'},
+        {'slug': 'nano-machine', 'title': 'Nano Machine', 'genres': ['Action', 'Martial Arts'], 'type': 'Manhwa',
+         'status': 'Ongoing', 'lastUpdateTime': '2026-01-02T00:00:00+07:00'},
+        {'slug': 'omniscient-reader', 'title': 'Omniscient Reader', 'genres': ['Fantasy'], 'type': 'Manhwa',
+         'status': 'Ongoing', 'lastUpdateTime': '2026-01-01T00:00:00+07:00'},
+    ]
+
+
+def _published(items):
+    # meta.json dibaca ulang dari bucket sebagai JSON
+    return json.loads(json.dumps(build_indexes(items)[INDEX_META_PATH]))
+
+
+def test_meta_lists_hash_of_every_index_file():
+    indexes = build_indexes(_catalog())
+    files = indexes[INDEX_META_PATH]['files']
+    assert set(files) == set(indexes) - {INDEX_META_PATH}
+    assert index_paths(indexes[INDEX_META_PATH]) == set(files)
+
+
+def test_unchanged_catalog_uploads_nothing():
+    indexes = build_indexes(_catalog())
+    assert changed_index_paths(indexes, _published(_catalog())) == []
+    assert stale_index_paths(indexes, _published(_catalog())) == []
+
+
+def test_status_change_uploads_only_touched_files():
+    items = _catalog()
+    updated = [dict(item, status='Completed') if item['slug'] == 'nano-machine' else item for item in items]
+    changed = changed_index_paths(build_indexes(updated), _published(items))
+    assert sorted(changed) == ['_indexes/latest/page-1.json', '_indexes/status/completed.json',
+                               '_indexes/status/ongoing.json']
+
+
+def test_removed_genre_is_stale():
+    items = _catalog()
+    without_martial_arts = [dict(item, genres=['Action']) if item['slug'] == 'nano-machine' else item
+                            for item in items]
+    indexes = build_indexes(without_martial_arts)
+    assert stale_index_paths(indexes, _published(items)) == ['_indexes/genre/martial-arts.json']
+
+
+def test_stale_paths_from_meta_without_file_hashes():
+    old_meta = _published(_catalog())
+    del old_meta['files']  # meta.json versi lama
+    indexes = build_indexes(_catalog()[:1])
+    assert '_indexes/genre/martial-arts.json' in stale_index_paths(indexes, old_meta)
+    assert len(changed_index_paths(indexes, old_meta)) == len(indexes) - 1
+
+
+class _Bucket:
+    def __init__(self):
+        self.files = {}
+        self.removed = []
+
+    def from_(self, bucket_name):
+        return self
+
+    def upload(self, path, file, options):
+        with open(file, 'rb') as f:  # spooled_json memberi path file sementara
+            self.files[path] = f.read()
+
+    def download(self, path):
+        if path not in self.files:
+            raise FileNotFoundError(path)
+        return self.files[path]
+
+    def remove(self, paths):
+        self.removed.extend(paths)
+        for path in paths:
+            self.files.pop(path, None)
+
+
+class _Supabase:
+    def __init__(self):
+        self.storage = _Bucket()
+
+
+def test_upload_indexes_skips_unchanged_and_removes_stale(monkeypatch):
+    pytest.importorskip('bs4')
+    pytest.importorskip('supabase')
+    pytest.importorskip('dotenv')
+    manifest = importlib.import_module('all-manhwa')
+    supabase = _Supabase()
+    monkeypatch.setattr(manifest, 'supabase', supabase)
+    uploads = []
+    real_upload = manifest.upload_json
+    monkeypatch.setattr(manifest, 'upload_json', lambda path, data: uploads.append(path) or real_upload(path, data))
+
+    items = _catalog()
+    assert manifest.upload_indexes(items)
+    first = len(uploads)
+    assert first == len(build_indexes(items))
+
+    uploads.clear()
+    assert manifest.upload_indexes(items)
+    assert uploads == []
+
+    without_martial_arts = [dict(item, genres=['Action']) if item['slug'] == 'nano-machine' else item
+                            for item in items]
+    assert manifest.upload_indexes(without_martial_arts)
+    assert supabase.storage.removed == ['_indexes/genre/martial-arts.json']
+    assert '_indexes/genre/martial-arts.json' not in supabase.storage.files
+    assert INDEX_META_PATH in uploads
@@ -0,0 +1,58 @@
+import json
+
+from manifest_pages import build_manifest_pages, changed_page_paths
+
+
+def sort_key(item):
+    return item['lastUpdateTime']
+
+
+def _catalog(count=1000):
+    items = [{'slug': f'komik-{i}', 'title': f'Komik {i}', 'lastUpdateTime': f'2025-01-01T00:00:00+07:00#{i:05d}'}
+             for i in range(count)]
+    return sorted(items, key=sort_key, reverse=True)
+
+
+def _rebuild(items, previous_slots):
+    # Slots di-upload sebagai JSON, jadi lewati round-trip yang sama
+    slots = json.loads(json.dumps(previous_slots))
+    return build_manifest_pages(sorted(items, key=sort_key, reverse=True), sort_key, 100, slots)
+
+
+def _update(items, slug, stamp):
+    return [dict(item, lastUpdateTime=stamp) if item['slug'] == slug else item for item in items]
+
+
+def test_unchanged_catalog_keeps_every_page():
+    items = _catalog()
+    _, head, slots = build_manifest_pages(items, sort_key, 100)
+    _, next_head, _ = _rebuild(items, slots)
+    assert changed_page_paths(next_head, head) == []
+
+
+def test_single_update_changes_at_most_two_pages():
+    items = _catalog()
+    _, head, slots = build_manifest_pages(items, sort_key, 100)
+    for slug in ('komik-0', 'komik-450', 'komik-998'):
+        updated = _update(items, slug, '2026-01-01T00:00:00+07:00')
+        pages, next_head, _ = _rebuild(updated, slots)
+        assert len(changed_page_paths(next_head, head)) <= 2
+        assert next_head['total'] == len(items)
+        newest_page = pages[next_head['pages'][-1]['path']]
+        assert newest_page[0]['slug'] == slug
+
+
+def test_new_comic_and_daily_updates_stay_local():
+    items = _catalog()
+    _, head, slots = build_manifest_pages(items, sort_key, 100)
+    items = items + [{'slug': 'komik-baru', 'title': 'Baru', 'lastUpdateTime': '2026-02-01T00:00:00+07:00'}]
+    _, next_head, slots = _rebuild(items, slots)
+    assert len(changed_page_paths(next_head, head)) == 1
+
+    # Beberapa hari berturut-turut: setiap update tetap hanya menyentuh halaman asal + ekor
+    for day, slug in enumerate(('komik-10', 'komik-500', 'komik-900'), start=2):
+        head = next_head
+        items = _update(items, slug, f'2026-02-{day:02d}T00:00:00+07:00')
+        _, next_head, slots = _rebuild(items, slots)
+        assert len(changed_page_paths(next_head, head)) <= 2
+        assert all(page['count'] <= 100 for page in next_head['pages'])
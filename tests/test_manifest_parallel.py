@@ -0,0 +1,112 @@
+import importlib
+import json
+import threading
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip('bs4')
+pytest.importorskip('supabase')
+pytest.importorskip('dotenv')
+
+from bs4 import BeautifulSoup
+
+from retry_scheduler import RetryLater
+
+FIXTURES = Path(__file__).parent / 'fixtures' / 'manifest'
+FLAKY = {'179384-solo-leveling', 'omniscient-reader', 'the-greatest-estate-developer'}  # Gagal sekali lalu berhasil
+BROKEN = {'nano-machine'}  # Selalu gagal -> budget attempt habis, komik di-skip
+GATED = 'tales-of-the-moonlit-night'  # Mode paralel: baru selesai setelah semua komik lain selesai
+
+
+class FrozenDatetime(datetime):
+    @classmethod
+    def now(cls, tz=None):
+        return cls(2026, 1, 15, 12, 0, 0)
+
+
+@pytest.fixture
+def manifest(monkeypatch, tmp_path):
+    module = importlib.import_module('all-manhwa')
+    monkeypatch.setattr(module, 'datetime', FrozenDatetime)
+    monkeypatch.setattr(module, 'supabase', None)
+    monkeypatch.setattr(module, 'ENABLE_WP_API', False)
+    monkeypatch.setattr(module, 'MAX_COMICS', None)
+    monkeypatch.setattr(module, 'RETRY_MAX_DELAY', 0.02)
+    monkeypatch.setattr(module, 'SLUG_REGISTRY_FILE', str(tmp_path / 'slug_registry.json'))
+    monkeypatch.setattr(module, 'LISTING_PAGE_DELAY', 0)
+    return module
+
+
+def stub_fetch(manifest, monkeypatch, completed, gated):
+    """fetch_soup dari fixture: FLAKY gagal sekali; jika gated, GATED menunggu semua komik lain
+    selesai, jadi urutan selesai paralel pasti berbeda dari urutan daftar."""
+    detail_slugs = [path.stem[len('detail-'):] for path in sorted(FIXTURES.glob('detail-*.html'))]
+    others = set(detail_slugs) - BROKEN - {GATED}
+    others_done = threading.Event()
+    attempts = {}
+    lock = threading.Lock()
+
+    def fetch_soup(url):
+        if '/daftar-manga/' in url:
+            page = 'listing.html' if '/page/1/' in url else None
+            return BeautifulSoup((FIXTURES / page).read_text(encoding='utf-8') if page else '<html></html>',
+                                 'html.parser')
+        slug = url.rstrip('/').rsplit('/', 1)[-1]
+        with lock:
+            attempts[slug] = attempts.get(slug, 0) + 1
+            attempt = attempts[slug]
+        if gated and slug == GATED:
+            assert others_done.wait(timeout=10)
+        if slug in BROKEN or (slug in FLAKY and attempt == 1):
+            raise RetryLater(ConnectionError(f"503 {url}"), base_delay=0.001)
+        with lock:
+            completed.append(slug)
+            if others <= set(completed):
+                others_done.set()
+        return BeautifulSoup((FIXTURES / f'detail-{slug}.html').read_text(encoding='utf-8'), 'html.parser')
+
+    monkeypatch.setattr(manifest, 'fetch_soup', fetch_soup)
+
+
+def run_manifest(manifest, monkeypatch, tmp_path, workers):
+    completed = []
+    stub_fetch(manifest, monkeypatch, completed, gated=workers > 1)
+    output = tmp_path / f'all-manhwa-metadata.{workers}.json'
+    monkeypatch.setattr(manifest, 'OUTPUT_FILE', str(output))
+    monkeypatch.setattr(manifest, 'DETAIL_WORKERS', workers)
+    manifest.main()
+    return output.read_bytes(), completed
+
+
+def test_parallel_details_match_sequential_output(manifest, monkeypatch, tmp_path):
+    sequential, sequential_order = run_manifest(manifest, monkeypatch, tmp_path, 1)
+    parallel, parallel_order = run_manifest(manifest, monkeypatch, tmp_path, 6)
+
+    assert sequential_order[0] == GATED
+    assert parallel_order[-1] == GATED  # Worker benar-benar selesai tidak berurutan
+    assert parallel == sequential
+    comics = json.loads(parallel)
+    assert len(comics) == 7
+    assert 'nano-machine' not in {comic['slug'] for comic in comics}
+
+
+def test_wp_json_listing_uses_shared_client(manifest, monkeypatch):
+    requested = []
+
+    class Response:
+        headers = {'Content-Type': 'text/html'}
+        content = b'<html>challenge</html>'
+
+        def raise_for_status(self):
+            pass
+
+    class Client:
+        def get(self, url, headers=None, timeout=None):
+            requested.append(url)
+            return Response()
+
+    monkeypatch.setattr(manifest, 'get_http_client', lambda: Client())
+    assert manifest.get_comics_list_wp_api() is None  # HTML -> fallback ke daftar-manga
+    assert requested and '/wp-json/wp/v2/' in requested[0]
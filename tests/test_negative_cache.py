@@ -0,0 +1,36 @@
+from datetime import datetime, timedelta
+
+from fingerprints import FingerprintStore
+from negative_cache import NO_IMAGES, NegativeCache
+
+
+def test_record_doubles_interval_up_to_max(tmp_path):
+    cache = NegativeCache(str(tmp_path / 'negative_cache.json'), timedelta(days=1), timedelta(days=30))
+    now = datetime(2026, 1, 1)
+    intervals = [cache.record('https://komikindo.ch/a-chapter-2/', NO_IMAGES, now=now).days for _ in range(7)]
+    assert intervals == [1, 2, 4, 8, 16, 30, 30]
+
+
+def test_next_check_for_by_url_and_comic(tmp_path):
+    cache = NegativeCache(str(tmp_path / 'negative_cache.json'))
+    now = datetime(2026, 1, 1)
+    cache.record('https://komikindo.ch/a-chapter-2/', NO_IMAGES, now=now, comic_url='https://komikindo.ch/komik/a/')
+    cache.record('https://komikindo.ch/b-chapter-9/', NO_IMAGES, now=now)
+
+    assert cache.next_check_for(comic_url='https://komikindo.ch/komik/a/', now=now) == now + timedelta(hours=24)
+    assert cache.next_check_for(['https://komikindo.ch/b-chapter-9/'], now=now) == now + timedelta(hours=24)
+    assert cache.next_check_for(comic_url='https://komikindo.ch/komik/c/', now=now) is None
+    # Sudah jatuh tempo -> tidak lagi menahan fingerprint
+    assert cache.next_check_for(comic_url='https://komikindo.ch/komik/a/', now=now + timedelta(days=2)) is None
+
+
+def test_fingerprint_expires_at_negative_recheck(tmp_path):
+    store = FingerprintStore(str(tmp_path / 'fingerprints.json'))
+    store.record('a', 'abc', valid_until=datetime.now() - timedelta(seconds=1))
+    assert not store.matches('a', 'abc', max_age_days=7)
+
+    store.record('a', 'abc', valid_until=datetime.now() + timedelta(hours=24))
+    assert store.matches('a', 'abc', max_age_days=7)
+
+    store.record('b', 'def')
+    assert store.matches('b', 'def', max_age_days=7)
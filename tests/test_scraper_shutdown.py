@@ -0,0 +1,38 @@
+import pytest
+
+pytest.importorskip('bs4')
+pytest.importorskip('supabase')
+pytest.importorskip('dotenv')
+
+import scrape_links_only as scraper
+
+
+@pytest.fixture
+def started_pools(monkeypatch, tmp_path):
+    monkeypatch.setattr(scraper, 'ENABLE_SUPABASE_UPLOAD', False)
+    monkeypatch.setattr(scraper, 'PARSE_WORKERS', 2)
+    monkeypatch.setattr(scraper, 'JSON_FILE', str(tmp_path / 'tidak-ada.json'))
+    executor = scraper.get_work_executor()
+    pool = scraper.get_parse_pool()
+    yield executor, pool
+    scraper.shutdown_work_executor()
+    scraper.shutdown_parse_pool()
+
+
+def _assert_shut_down(executor):
+    assert scraper._work_executor is None
+    assert scraper._parse_pool is None
+    assert not executor._dispatcher.is_alive()
+
+
+def test_early_return_shuts_down_executor_and_parse_pool(started_pools):
+    executor, _ = started_pools
+    scraper.main(scraper.parse_args([]))  # Katalog tidak ada -> return lebih awal
+    _assert_shut_down(executor)
+
+
+def test_error_shuts_down_executor_and_parse_pool(started_pools):
+    executor, _ = started_pools
+    with pytest.raises(ValueError):
+        scraper.main(scraper.parse_args(['--shard', '5/4']))
+    _assert_shut_down(executor)
@@ -0,0 +1,62 @@
+import json
+
+from shards import merge_shard_outputs, shard_path
+
+
+def _chapter(number, comic='solo-leveling', images=2):
+    return {
+        'slug': f'chapter-{number}',
+        'title': f'Chapter {number}',
+        'url': f'https://komikindo.ch/{comic}-chapter-{number}/',
+        'images': [f'https://img.example/{comic}/{number}/{i}.jpg' for i in range(images)],
+        'total_images': images,
+    }
+
+
+def _comic(slug, chapters, title=None):
+    return {'slug': slug, 'title': title or slug, 'total_chapters': len(chapters), 'chapters': chapters}
+
+
+def _write(path, data):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f)
+
+
+def test_merge_keeps_existing_chapters_and_adds_shard_chapters(tmp_path):
+    output = str(tmp_path / 'manga_local_image_links.json')
+    _write(output, [
+        _comic('solo-leveling', [_chapter(1), _chapter(2)]),
+        _comic('nano-machine', [_chapter(1, 'nano-machine')]),
+    ])
+    # Shard hanya berisi chapter baru run ini (+ re-upload chapter 2 dengan gambar baru)
+    _write(shard_path(output, 1, 2), [
+        _comic('solo-leveling', [_chapter(2, images=5), _chapter(3)], title='Solo Leveling'),
+    ])
+    _write(shard_path(output, 2, 2), [
+        _comic('omniscient-reader', [_chapter(1, 'omniscient-reader')]),
+    ])
+
+    assert merge_shard_outputs(output, remove_parts=True) == 3
+
+    with open(output, encoding='utf-8') as f:
+        merged = {comic['slug']: comic for comic in json.load(f)}
+    solo = merged['solo-leveling']
+    assert [ch['title'] for ch in solo['chapters']] == ['Chapter 1', 'Chapter 2', 'Chapter 3']
+    assert solo['chapters'][1]['total_images'] == 5
+    assert solo['title'] == 'Solo Leveling'
+    assert [ch['title'] for ch in merged['nano-machine']['chapters']] == ['Chapter 1']
+    assert 'omniscient-reader' in merged
+    assert not (tmp_path / 'manga_local_image_links.shard-1-of-2.json').exists()
+
+
+def test_merge_is_idempotent(tmp_path):
+    output = str(tmp_path / 'out.json')
+    _write(output, [_comic('solo-leveling', [_chapter(1)])])
+    _write(shard_path(output, 1, 1), [_comic('solo-leveling', [_chapter(2)])])
+
+    merge_shard_outputs(output)
+    merge_shard_outputs(output)  # Part yang sama digabung lagi: tidak ada duplikat
+
+    with open(output, encoding='utf-8') as f:
+        comics = json.load(f)
+    assert [ch['title'] for ch in comics[0]['chapters']] == ['Chapter 1', 'Chapter 2']
@@ -0,0 +1,172 @@
+import os
+import threading
+import time
+
+import pytest
+
+from single_flight import MemoResponse, SingleFlight
+
+
+class _Response:
+    def __init__(self, url, content, encoding='utf-8'):
+        self.url = url
+        self.status_code = 200
+        self.encoding = encoding
+        self.headers = {'Content-Type': 'text/html'}
+        self.content = content
+
+
+def _wait_for_calls(flight, count):
+    deadline = time.monotonic() + 5
+    while flight.stats()['calls'] < count and time.monotonic() < deadline:
+        time.sleep(0.001)
+
+
+def _fetcher(content=b'<html>komik</html>'):
+    calls = []
+
+    def fetch(url):
+        calls.append(url)
+        return _Response(url, content)
+    return fetch, calls
+
+
+def test_concurrent_callers_share_one_fetch():
+    flight = SingleFlight()
+    release = threading.Event()
+    calls = []
+
+    def slow_fetch():
+        calls.append(1)
+        assert release.wait(timeout=5)
+        return _Response('https://komikindo.ch/komik/solo-leveling/', b'detail')
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(flight.do('solo', slow_fetch, memo=False)))
+               for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    _wait_for_calls(flight, 4)
+    release.set()
+    for thread in threads:
+        thread.join(timeout=5)
+
+    assert len(calls) == 1
+    assert len(results) == 4 and all(result is results[0] for result in results)
+    assert flight.stats()['coalesced'] == 3
+
+
+def test_memo_hit_returns_snapshot_without_refetch():
+    flight = SingleFlight()
+    fetch, calls = _fetcher('Bab satu – awal'.encode('utf-8'))
+    url = 'https://komikindo.ch/komik/nano-machine/'
+
+    flight.do(url, lambda: fetch(url))
+    cached = flight.do(url, lambda: fetch(url))
+
+    assert calls == [url]
+    assert isinstance(cached, MemoResponse)
+    assert cached.text == 'Bab satu – awal'
+    assert cached.headers == {'Content-Type': 'text/html'}
+    assert flight.stats()['memo_hits'] == 1
+
+
+def test_memo_false_is_not_stored():
+    flight = SingleFlight()
+    fetch, calls = _fetcher()
+    flight.do('chapter-1', lambda: fetch('chapter-1'), memo=False)
+    flight.do('chapter-1', lambda: fetch('chapter-1'), memo=False)
+    assert len(calls) == 2
+    assert flight.stats()['memo_entries'] == 0
+
+
+def test_eviction_by_entries_is_lru():
+    flight = SingleFlight(max_entries=2)
+    fetch, calls = _fetcher()
+    for key in ('a', 'b'):
+        flight.do(key, lambda key=key: fetch(key))
+    flight.do('a', lambda: fetch('a'))  # 'a' jadi paling baru dipakai
+    flight.do('c', lambda: fetch('c'))  # 'b' dibuang
+
+    flight.do('a', lambda: fetch('a'))
+    flight.do('b', lambda: fetch('b'))
+    assert calls == ['a', 'b', 'c', 'b']
+    assert flight.stats()['evictions'] >= 1
+    assert flight.stats()['memo_entries'] == 2
+
+
+def test_eviction_by_bytes():
+    page = os.urandom(4000)  # Tidak bisa dikompres: ukuran memo ~4000 byte per entry
+    flight = SingleFlight(max_entries=100, max_bytes=10000)
+    fetch, calls = _fetcher(page)
+    for key in ('a', 'b', 'c'):
+        flight.do(key, lambda key=key: fetch(key))
+
+    stats = flight.stats()
+    assert stats['memo_entries'] == 2
+    assert stats['memo_bytes'] <= 10000
+    assert stats['evictions'] == 1
+    flight.do('a', lambda: fetch('a'))
+    assert calls == ['a', 'b', 'c', 'a']
+
+
+def test_response_larger_than_budget_is_not_memoized():
+    flight = SingleFlight(max_bytes=1000)
+    fetch, calls = _fetcher(os.urandom(5000))
+    flight.do('besar', lambda: fetch('besar'))
+    assert flight.stats()['memo_entries'] == 0
+    assert flight.stats()['evictions'] == 0
+
+
+def test_errors_are_not_memoized():
+    flight = SingleFlight()
+    attempts = []
+
+    def flaky():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise ConnectionError('503')
+        return _Response('u', b'ok')
+
+    with pytest.raises(ConnectionError):
+        flight.do('u', flaky)
+    assert flight.do('u', flaky).content == b'ok'
+    assert len(attempts) == 2
+
+
+def test_error_is_shared_with_waiting_callers():
+    flight = SingleFlight()
+    release = threading.Event()
+
+    def failing():
+        assert release.wait(timeout=5)
+        raise ConnectionError('timeout')
+
+    errors = []
+
+    def caller():
+        try:
+            flight.do('u', failing)
+        except ConnectionError as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=caller) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    _wait_for_calls(flight, 3)
+    release.set()
+    for thread in threads:
+        thread.join(timeout=5)
+
+    assert len(errors) == 3
+    assert flight.stats()['fetches'] == 1
+
+
+def test_forget_drops_memo_entry():
+    flight = SingleFlight()
+    fetch, calls = _fetcher()
+    flight.do('a', lambda: fetch('a'))
+    flight.forget('a')
+    flight.do('a', lambda: fetch('a'))
+    assert calls == ['a', 'a']
+    assert flight.stats()['memo_bytes'] > 0
@@ -0,0 +1,63 @@
+from sitemap_discovery import catalog_slug, merge_catalog
+
+
+def _catalog():
+    return [
+        {'Title': 'Unbeatable Dungeons Lazy Boss Monster',
+         'Link': 'https://komikindo.ch/komik/124162-the-unbeatable-dungeons-lazy-boss-monster/',
+         'Slug': 'Unbeatable-Dungeons-Lazy-Boss-Monster', 'Image': '', 'Type': 'Manhwa'},
+        {'Title': 'Solo Leveling', 'Link': 'https://komikindo.ch/komik/179384-solo-leveling/',
+         'Slug': 'solo-leveling', 'Image': '', 'Type': 'Manhwa'},
+    ]
+
+
+def test_catalog_slug_uses_link():
+    assert catalog_slug(_catalog()[0]) == 'the-unbeatable-dungeons-lazy-boss-monster'
+    assert catalog_slug({'Slug': 'Manual-Entry'}) == 'manual-entry'
+
+
+def test_merge_catalog_matches_entries_by_link_slug():
+    discovered = {
+        'the-unbeatable-dungeons-lazy-boss-monster': {
+            'link': 'https://komikindo.ch/komik/124162-the-unbeatable-dungeons-lazy-boss-monster/',
+            'lastmod': '2026-01-01', 'image': ''},
+        'solo-leveling': {'link': 'https://komikindo.ch/komik/200000-solo-leveling/', 'lastmod': '2026-01-02',
+                          'image': ''},
+        'nano-machine': {'link': 'https://komikindo.ch/komik/nano-machine/', 'lastmod': '2026-01-03', 'image': ''},
+    }
+    resolved = []
+
+    def resolve_new(slug, info):
+        resolved.append(slug)
+        return {'Title': 'Nano Machine', 'Link': info['link'], 'Slug': slug, 'Image': '', 'Type': 'Manhwa'}
+
+    catalog, added = merge_catalog(_catalog(), discovered, resolve_new)
+
+    assert resolved == ['nano-machine']
+    assert [comic['Title'] for comic in catalog] == [
+        'Unbeatable Dungeons Lazy Boss Monster', 'Solo Leveling', 'Nano Machine']
+    assert catalog[1]['Link'] == 'https://komikindo.ch/komik/200000-solo-leveling/'
+    assert added == catalog[2:]
+
+
+def test_normalize_lastmod_matches_wp_json_and_sitemap_formats():
+    from sitemap_discovery import normalize_lastmod
+
+    assert normalize_lastmod('2026-01-15T05:00:00') == '2026-01-15T05:00:00Z'  # modified_gmt
+    assert normalize_lastmod('2026-01-15T12:00:00+07:00') == '2026-01-15T05:00:00Z'  # sitemap Yoast
+    assert normalize_lastmod('2026-01-15T05:00:00Z') == '2026-01-15T05:00:00Z'
+    assert normalize_lastmod('') == ''
+    assert normalize_lastmod('kemarin') == 'kemarin'
+
+
+def test_switching_lastmod_source_does_not_mark_comics_changed(tmp_path):
+    from sitemap_discovery import SitemapStateStore
+
+    store = SitemapStateStore(str(tmp_path / 'sitemap_lastmod.json'))
+    store.put('solo-leveling', {'lastmod': '2026-01-15T12:00:00+07:00', 'excluded': False})  # State lama
+    store.commit('nano-machine', '2026-01-10T03:00:00', excluded=True)
+
+    assert not store.is_changed('solo-leveling', '2026-01-15T05:00:00')
+    assert store.is_changed('solo-leveling', '2026-01-16T05:00:00')
+    assert store.is_excluded('nano-machine', '2026-01-10T10:00:00+07:00')
+    assert store.get('nano-machine')['lastmod'] == '2026-01-10T03:00:00Z'
@@ -0,0 +1,79 @@
+from slug_registry import SlugRegistry, comic_aliases, sanitize_filename
+
+UNBEATABLE = 'https://komikindo.ch/komik/124162-the-unbeatable-dungeons-lazy-boss-monster/'
+
+
+def _registry(tmp_path):
+    return SlugRegistry(str(tmp_path / 'slug_registry.json'))
+
+
+def test_aliases_ordered_from_strongest():
+    assert comic_aliases(UNBEATABLE, 'Unbeatable-Dungeons-Lazy-Boss-Monster',
+                         "Unbeatable Dungeons: Lazy Boss Monster") == [
+        'id:124162',
+        'url:124162-the-unbeatable-dungeons-lazy-boss-monster',
+        'slug:the-unbeatable-dungeons-lazy-boss-monster',
+        'listing:unbeatable-dungeons-lazy-boss-monster',
+        'title:unbeatable-dungeons-lazy-boss-monster',
+    ]
+    assert comic_aliases('https://komikindo.ch/komik/nano-machine/') == ['url:nano-machine', 'slug:nano-machine']
+    assert comic_aliases(title='') == []
+
+
+def test_sanitize_filename():
+    assert sanitize_filename("  Solo   Leveling: Ragnarok (Season 2)! ") == 'solo-leveling-ragnarok-season-2'
+    assert sanitize_filename('--A -- B--') == 'a-b'
+
+
+def test_new_comic_uses_title_folder_and_renamed_title_keeps_it(tmp_path):
+    registry = _registry(tmp_path)
+    folder = registry.canonical(UNBEATABLE, 'Unbeatable-Dungeons-Lazy-Boss-Monster', 'Unbeatable Dungeons')
+    assert folder == 'unbeatable-dungeons'
+
+    # Judul di listing berubah, ID URL sama -> folder lama
+    renamed = registry.canonical(UNBEATABLE, 'The-Unbeatable-Dungeon', 'The Unbeatable Dungeon')
+    assert renamed == 'unbeatable-dungeons'
+    assert registry.summary() == {'comics': 1, 'aliases': 7, 'renamed': 1}
+    assert registry.resolve('title:the-unbeatable-dungeon') == 'unbeatable-dungeons'
+
+
+def test_sitemap_url_without_id_maps_to_registered_comic(tmp_path):
+    registry = _registry(tmp_path)
+    registry.canonical('https://komikindo.ch/komik/179384-solo-leveling/', 'solo-leveling', 'Solo Leveling')
+    assert registry.canonical('https://komikindo.ch/komik/solo-leveling/') == 'solo-leveling'
+    assert registry.resolve(*comic_aliases('https://komikindo.ch/komik/solo-leveling/')) == 'solo-leveling'
+
+
+def test_same_title_different_urls_are_not_merged(tmp_path):
+    registry = _registry(tmp_path)
+    first = registry.canonical('https://komikindo.ch/komik/111-hero/', 'Hero', 'Hero')
+    # Komik lain dengan judul sama: alias 'slug:hero' sama, ID berbeda
+    second = registry.canonical('https://komikindo.ch/komik/222-hero/', 'Hero', 'Hero')
+    # Judul sama tanpa ID, URL lain
+    third = registry.canonical('https://komikindo.ch/komik/hero-remake/', 'Hero', 'Hero')
+
+    assert first == second == third == 'hero'  # Folder judul dipakai bersama seperti sebelum registry
+    entry = registry.get('hero')
+    assert entry['link'] == 'https://komikindo.ch/komik/111-hero/'
+    assert not {'id:222', 'url:222-hero', 'url:hero-remake'} & set(entry['aliases'])
+    assert registry.resolve(*comic_aliases('https://komikindo.ch/komik/222-hero/')) is None
+    assert registry.resolve(*comic_aliases('https://komikindo.ch/komik/111-hero/')) == 'hero'
+
+
+def test_alias_owned_by_other_comic_is_not_taken_over(tmp_path):
+    registry = _registry(tmp_path)
+    registry.canonical('https://komikindo.ch/komik/1-alpha/', 'alpha', 'Alpha')
+    registry.canonical('https://komikindo.ch/komik/2-beta/', 'beta', 'Beta')
+    # Beta ganti judul menjadi 'Alpha': title:alpha tetap milik komik pertama
+    assert registry.canonical('https://komikindo.ch/komik/2-beta/', 'beta', 'Alpha') == 'beta'
+    assert registry.resolve('title:alpha') == 'alpha'
+
+
+def test_registry_round_trip(tmp_path):
+    registry = _registry(tmp_path)
+    registry.canonical(UNBEATABLE, 'Unbeatable-Dungeons-Lazy-Boss-Monster', 'Unbeatable Dungeons')
+    registry.save()
+
+    reloaded = _registry(tmp_path)
+    assert reloaded.resolve('id:124162') == 'unbeatable-dungeons'
+    assert reloaded.canonical(UNBEATABLE, title='Renamed') == 'unbeatable-dungeons'
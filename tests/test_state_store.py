@@ -0,0 +1,40 @@
+import json
+import threading
+
+from dead_letter import CHAPTER, DeadLetterStore
+from state_store import JsonStateStore
+
+
+def test_concurrent_saves_do_not_race(tmp_path):
+    store = JsonStateStore(str(tmp_path / 'state.json'))
+    errors = []
+
+    def worker(n):
+        for i in range(200):
+            store.put(f"{n}-{i}", i)
+            try:
+                store.save()
+            except Exception as e:
+                errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert len(json.loads((tmp_path / 'state.json').read_text(encoding='utf-8'))) == 800
+    assert [p.name for p in tmp_path.iterdir()] == ['state.json']
+
+
+def test_dead_letters_survive_reload(tmp_path):
+    path = str(tmp_path / 'dead_letters.json')
+    store = DeadLetterStore(path)
+    store.record(CHAPTER, 'https://komikindo.ch/a-chapter-1/', TimeoutError('timeout'),
+                 comic_url='https://komikindo.ch/komik/a/', stage='chapter')
+    store.save()
+
+    reloaded = DeadLetterStore(path)
+    assert reloaded.comic_urls() == ['https://komikindo.ch/komik/a/']
+    assert reloaded.summary()['by_error'] == {'TimeoutError': 1}
@@ -0,0 +1,76 @@
+import threading
+import time
+
+from retry_scheduler import RetryLater, RetryPolicy
+from work_executor import SharedWorkExecutor
+
+
+def test_backoff_does_not_hold_a_worker():
+    executor = SharedWorkExecutor(max_workers=1, policy=RetryPolicy(max_attempts=3, max_delay=0.2))
+    order = []
+    attempts = []
+
+    def flaky():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise RetryLater(ConnectionError('503'), base_delay=0.1)
+        order.append('flaky')
+        return 'ok'
+
+    def fast():
+        order.append('fast')
+        return 'fast'
+
+    try:
+        results = executor.run('komik', [('flaky', flaky), ('fast', fast)])
+    finally:
+        executor.shutdown()
+
+    # Satu-satunya worker mengerjakan task lain selama 'flaky' menunggu backoff
+    assert order == ['fast', 'flaky']
+    assert results == {'flaky': (True, 'ok'), 'fast': (True, 'fast')}
+    assert executor.stats()['retries'] == 1
+
+
+def test_call_raises_cause_after_batch_budget():
+    executor = SharedWorkExecutor(max_workers=2, policy=RetryPolicy(max_attempts=5, max_delay=0.01))
+    attempts = []
+
+    def broken():
+        attempts.append(1)
+        raise RetryLater(ConnectionError('gagal'), base_delay=0.001)
+
+    try:
+        try:
+            executor.call('https://komikindo.ch/komik/nano-machine/', broken, max_attempts=2)
+        except ConnectionError as e:
+            error = e
+    finally:
+        executor.shutdown()
+
+    assert str(error) == 'gagal'
+    assert len(attempts) == 2
+    assert executor.stats()['exhausted'] == 1
+
+
+def test_call_from_many_threads():
+    executor = SharedWorkExecutor(max_workers=2)
+    results = []
+    lock = threading.Lock()
+
+    def caller(n):
+        value = executor.call(f'komik-{n}', lambda: (time.sleep(0.01), n)[1])
+        with lock:
+            results.append(value)
+
+    threads = [threading.Thread(target=caller, args=(n,)) for n in range(6)]
+    try:
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=5)
+    finally:
+        executor.shutdown()
+
+    assert sorted(results) == list(range(6))
+    assert executor.stats()['peak_inflight'] <= 2
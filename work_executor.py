@@ -0,0 +1,194 @@
+"""
+SHARED WORK EXECUTOR
+====================
+Satu thread pool global untuk semua task chapter dari semua komik, sebagai
+pengganti pool per komik/per window. Total task in-flight dibatasi satu
+angka (max_workers), berapa pun komik yang sedang diproses.
+
+- Koordinator komik (thread komik / langkah backfill) memanggil run(group, tasks)
+  dan menunggu sampai batch-nya selesai; task dikerjakan worker global.
+- Fairness: antrian per group (komik), dispatcher mengambil satu task dari
+  tiap group secara bergiliran (round-robin), jadi seri raksasa tidak
+  memonopoli worker.
+- Worker yang bebas langsung mengambil task group berikutnya; tidak ada
+  worker yang terikat ke satu komik.
+- Retry: task yang me-raise RetryLater masuk delay queue (backoff + jitter
+  dari RetryPolicy) dan kembali ke antrian group-nya saat jatuh tempo.
+
+    executor = SharedWorkExecutor(max_workers=8, policy=RetryPolicy(max_attempts=3))
+    results = executor.run('solo-leveling', [(key, fn), ...])  # {key: (ok, value_or_error)}
+    page = executor.call('solo-leveling', fn)  # Satu task: hasil atau raise error final
+    executor.shutdown()
+
+Ini satu-satunya delay queue retry di repo (chapter, detail komik, detail
+manifest); retry_scheduler hanya menyediakan RetryLater/RetryPolicy.
+"""
+
+import heapq
+import itertools
+import queue
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+
+from retry_scheduler import RetryLater, RetryPolicy
+
+
+class _Batch:
+    """Satu panggilan run(): hasil task dikirim ke thread pemanggil lewat queue."""
+
+    def __init__(self, size):
+        self.size = size
+        self.results = queue.Queue()
+
+
+class _Task:
+    __slots__ = ('group', 'key', 'fn', 'batch', 'attempts', 'max_attempts')
+
+    def __init__(self, group, key, fn, batch, max_attempts):
+        self.group = group
+        self.key = key
+        self.fn = fn
+        self.batch = batch
+        self.attempts = 0
+        self.max_attempts = max_attempts
+
+
+class SharedWorkExecutor:
+    """Thread pool global + antrian per group (round-robin) + delay queue retry."""
+
+    def __init__(self, max_workers=4, policy=None):
+        self.max_workers = max(1, max_workers)
+        self.policy = policy or RetryPolicy()
+        self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='work')
+        self._cond = threading.Condition()
+        self._queues = OrderedDict()  # group -> deque task; urutan = giliran round-robin
+        self._delayed = []  # heap (due, seq, task)
+        self._sequence = itertools.count()
+        self._inflight = 0
+        self._closed = False
+        self.submitted = 0
+        self.completed = 0
+        self.retries = 0
+        self.exhausted = 0
+        self.peak_inflight = 0
+        self.peak_groups = 0
+        self._dispatcher = threading.Thread(target=self._dispatch_loop, name='work-dispatcher', daemon=True)
+        self._dispatcher.start()
+
+    def run(self, group, tasks, on_result=None, max_attempts=None):
+        """Jalankan task [(key, fn), ...] milik satu group sampai sukses/gagal final.
+
+        on_result(key, ok, value) dipanggil dari thread pemanggil begitu task selesai.
+        max_attempts: budget attempt batch ini (default: policy executor).
+        Returns: dict {key: (ok, value_atau_exception)}
+        """
+        tasks = list(tasks)
+        batch = _Batch(len(tasks))
+        max_attempts = max(1, max_attempts) if max_attempts else self.policy.max_attempts
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("SharedWorkExecutor sudah di-shutdown")
+            for key, fn in tasks:
+                self._enqueue(_Task(group, key, fn, batch, max_attempts))
+            self.submitted += len(tasks)
+            self._cond.notify()
+
+        results = {}
+        while len(results) < batch.size:
+            key, ok, value = batch.results.get()
+            results[key] = (ok, value)
+            if on_result:
+                on_result(key, ok, value)
+        return results
+
+    def call(self, group, fn, max_attempts=None):
+        """Jalankan satu task dan tunggu hasilnya; error final di-raise di thread pemanggil.
+        Thread pemanggil menunggu di queue hasil, backoff-nya tidak memakai worker."""
+        ok, value = self.run(group, [(None, fn)], max_attempts=max_attempts)[None]
+        if not ok:
+            raise value
+        return value
+
+    def _enqueue(self, task):
+        """Masukkan task ke antrian group-nya (dipanggil dengan _cond terkunci)."""
+        pending = self._queues.get(task.group)
+        if pending is None:
+            pending = self._queues[task.group] = deque()
+            self.peak_groups = max(self.peak_groups, len(self._queues))
+        pending.append(task)
+
+    def _next_task(self):
+        """Ambil satu task dari group terdepan lalu pindahkan group ke belakang (round-robin)."""
+        group, pending = next(iter(self._queues.items()))
+        task = pending.popleft()
+        if pending:
+            self._queues.move_to_end(group)
+        else:
+            del self._queues[group]
+        return task
+
+    def _dispatch_loop(self):
+        while True:
+            with self._cond:
+                while True:
+                    now = time.monotonic()
+                    while self._delayed and self._delayed[0][0] <= now:
+                        self._enqueue(heapq.heappop(self._delayed)[2])
+                    if self._queues and self._inflight < self.max_workers:
+                        break
+                    if self._closed and not self._queues and not self._delayed and not self._inflight:
+                        return
+                    timeout = max(0.0, self._delayed[0][0] - now) if self._delayed else None
+                    self._cond.wait(timeout)
+                task = self._next_task()
+                task.attempts += 1
+                self._inflight += 1
+                self.peak_inflight = max(self.peak_inflight, self._inflight)
+            self._pool.submit(self._execute, task)
+
+    def _execute(self, task):
+        try:
+            outcome = (True, task.fn())
+        except RetryLater as e:
+            if task.attempts < task.max_attempts:
+                due = time.monotonic() + self.policy.delay(task.attempts, e.base_delay)
+                with self._cond:
+                    heapq.heappush(self._delayed, (due, next(self._sequence), task))
+                    self.retries += 1
+                    self._inflight -= 1
+                    self._cond.notify()
+                return
+            with self._cond:
+                self.exhausted += 1
+            outcome = (False, e.cause)
+        except Exception as e:
+            outcome = (False, e)
+
+        with self._cond:
+            self._inflight -= 1
+            self.completed += 1
+            self._cond.notify()
+        task.batch.results.put((task.key, *outcome))
+
+    def shutdown(self, wait=True):
+        """Tolak batch baru, selesaikan task yang tersisa lalu hentikan worker."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        if wait:
+            self._dispatcher.join()
+        self._pool.shutdown(wait=wait)
+
+    def stats(self):
+        with self._cond:
+            return {
+                'max_workers': self.max_workers,
+                'submitted': self.submitted,
+                'completed': self.completed,
+                'retries': self.retries,
+                'exhausted': self.exhausted,
+                'peak_inflight': self.peak_inflight,
+                'peak_groups': self.peak_groups,
+            }
@@ -0,0 +1,166 @@
+"""
+WORDPRESS REST API (wp-json)
+============================
+Backend JSON opsional untuk tahap listing/discovery. Endpoint
+/wp-json/wp/v2/... mengembalikan data komik dalam JSON ringkas (per_page=100,
+hanya field yang diminta lewat _fields) lengkap dengan `modified_gmt`, jadi
+satu request menggantikan satu halaman daftar-manga HTML + parse BeautifulSoup.
+
+- Post type komik dicari otomatis: type REST yang link item-nya di bawah /komik/
+- Taxonomy "Jenis Komik" dicari dari term Manga/Manhwa/Manhua
+- Semua kegagalan (endpoint dimatikan, challenge Cloudflare berupa HTML,
+  struktur tidak dikenali) -> WpApiUnavailable, caller fallback ke scraper HTML
+
+Daftar chapter dan meta tema (status, pengarang, rating) tidak diekspos oleh
+REST API standar, jadi halaman detail tetap di-scrape dari HTML.
+"""
+
+import html
+import json
+from urllib.parse import urlencode, urljoin
+
+from sitemap_discovery import comic_slug_from_url
+
+WP_API_PATH = '/wp-json/wp/v2/'
+PER_PAGE = 100
+COMIC_LINK_MARKER = '/komik/'
+KNOWN_COMIC_TYPES = ('Manga', 'Manhwa', 'Manhua')
+_SKIP_POST_TYPES = ('attachment', 'nav_menu_item', 'wp_block', 'wp_template', 'wp_template_part',
+                    'wp_navigation', 'wp_global_styles', 'wp_font_family', 'wp_font_face')
+
+
+class WpApiUnavailable(Exception):
+    """REST API tidak bisa dipakai untuk situs ini (fallback ke HTML)."""
+
+
+class WpApi:
+    """Client wp-json di atas client HTTP apa pun dengan .get(url, headers=, timeout=)
+    (PooledHttpClient, modul requests, ...)."""
+
+    def __init__(self, client, base_url, headers=None, timeout=30):
+        self.client = client
+        self.base_url = base_url
+        self.headers = dict(headers or {})
+        self.headers['Accept'] = 'application/json'
+        self.timeout = timeout
+        self.requests = 0
+        self._comic_type = None
+        self._type_taxonomy = None
+
+    def _get(self, path, params=None):
+        """GET satu endpoint. Returns: (data JSON, headers response)."""
+        url = urljoin(self.base_url, WP_API_PATH + path)
+        if params:
+            url += '?' + urlencode(params)
+        self.requests += 1
+        try:
+            response = self.client.get(url, headers=self.headers, timeout=self.timeout)
+            response.raise_for_status()
+        except Exception as e:
+            raise WpApiUnavailable(f"{url}: {e}")
+        content_type = response.headers.get('Content-Type', '')
+        if 'json' not in content_type:
+            # Challenge Cloudflare / halaman HTML biasa, bukan respons REST
+            raise WpApiUnavailable(f"{url}: bukan JSON ({content_type or 'tanpa content-type'})")
+        try:
+            return json.loads(response.content), response.headers
+        except ValueError as e:
+            raise WpApiUnavailable(f"{url}: JSON tidak valid ({e})")
+
+    def iter_collection(self, rest_base, params=None):
+        """Yield semua item collection, per halaman PER_PAGE (X-WP-TotalPages)."""
+        page = 1
+        while True:
+            query = dict(params or {}, per_page=PER_PAGE, page=page)
+            items, headers = self._get(rest_base, query)
+            if not isinstance(items, list):
+                raise WpApiUnavailable(f"{rest_base}: respons bukan list")
+            yield from items
+            total_pages = int(headers.get('X-WP-TotalPages') or 1)
+            if not items or page >= total_pages:
+                return
+            page += 1
+
+    def comic_type(self):
+        """rest_base post type komik (item-nya ber-link /komik/...)."""
+        if self._comic_type is None:
+            types, _ = self._get('types')
+            if not isinstance(types, dict):
+                raise WpApiUnavailable("types: respons bukan object")
+            for slug, info in types.items():
+                rest_base = (info or {}).get('rest_base')
+                if slug in _SKIP_POST_TYPES or not rest_base:
+                    continue
+                try:
+                    sample, _ = self._get(rest_base, {'per_page': 1, '_fields': 'link'})
+                except WpApiUnavailable:
+                    continue
+                if sample and COMIC_LINK_MARKER in (sample[0].get('link') or ''):
+                    self._comic_type = (slug, rest_base)
+                    break
+            else:
+                raise WpApiUnavailable("post type komik tidak ditemukan")
+        return self._comic_type
+
+    def type_taxonomy(self):
+        """(rest_base, {term_id: nama}) taxonomy jenis komik (Manga/Manhwa/Manhua)."""
+        if self._type_taxonomy is None:
+            post_type, _ = self.comic_type()
+            taxonomies, _ = self._get('taxonomies', {'type': post_type})
+            if not isinstance(taxonomies, dict):
+                raise WpApiUnavailable("taxonomies: respons bukan object")
+            for info in taxonomies.values():
+                rest_base = (info or {}).get('rest_base')
+                if not rest_base:
+                    continue
+                terms = {
+                    term['id']: html.unescape(term.get('name', ''))
+                    for term in self.iter_collection(rest_base, {'_fields': 'id,name'})
+                }
+                if any(name in KNOWN_COMIC_TYPES for name in terms.values()):
+                    self._type_taxonomy = (rest_base, terms)
+                    break
+            else:
+                raise WpApiUnavailable("taxonomy jenis komik tidak ditemukan")
+        return self._type_taxonomy
+
+    def list_comics(self, comic_type=None, with_image=False):
+        """Semua komik (opsional hanya satu jenis, mis. 'Manhwa'), urut judul A-Z.
+
+        Returns: list dict {'id', 'slug', 'link', 'title', 'type', 'modified', 'image'}
+        - slug mengikuti listing (angka di depan slug URL dibuang)
+        - image hanya diisi jika with_image (pakai _embed featured media, respons lebih besar)
+        """
+        _, rest_base = self.comic_type()
+        tax_base, type_terms = self.type_taxonomy()
+        fields = ['id', 'link', 'title', 'modified_gmt', tax_base]
+        params = {'orderby': 'title', 'order': 'asc'}
+        if comic_type:
+            term_ids = [term_id for term_id, name in type_terms.items() if name == comic_type]
+            if not term_ids:
+                raise WpApiUnavailable(f"jenis komik {comic_type!r} tidak ada di taxonomy {tax_base}")
+            params[tax_base] = ','.join(str(term_id) for term_id in term_ids)
+        if with_image:
+            params['_embed'] = 'wp:featuredmedia'
+            fields += ['_links', '_embedded']
+        params['_fields'] = ','.join(fields)
+
+        comics = []
+        for item in self.iter_collection(rest_base, params):
+            link = item.get('link') or ''
+            types = [type_terms.get(term_id) for term_id in item.get(tax_base) or []]
+            comics.append({
+                'id': item.get('id'),
+                'slug': comic_slug_from_url(link),
+                'link': link,
+                'title': html.unescape((item.get('title') or {}).get('rendered', '')),
+                'type': next((name for name in types if name), ''),
+                'modified': item.get('modified_gmt') or '',
+                'image': _featured_image(item) if with_image else '',
+            })
+        return comics
+
+
+def _featured_image(item):
+    media = (item.get('_embedded') or {}).get('wp:featuredmedia') or []
+    return (media[0] or {}).get('source_url', '') if media else ''